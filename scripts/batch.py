@@ -0,0 +1,225 @@
+import os
+import csv
+import sys
+import json
+import time
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from sonification.cli import parse_args
+from sonification.cost import MEMORY_BUDGET_MB
+from sonification.pipeline import resolve_workers
+from sonification.render_cache import render_key
+from sonification.variants import load_variants
+from worker import create_render_cache, run_job
+
+# Render por lotes para precalentar audios por la noche: un manifiesto de
+# ficheros × variantes × presets se renderiza en un pool de procesos que
+# importan las variantes una sola vez y comparten sus cachés entre trabajos.
+#
+# Uso: batch.py manifiesto.json|manifiesto.csv [--jobs=N|auto] [--force] [--report=ruta]
+#
+# El informe (por defecto <manifiesto>.report.json) guarda el estado, los
+# tiempos de cada fase y el pico de memoria de cada trabajo.
+#
+# Manifiesto JSON, como producto cartesiano:
+#   {"inputs": ["pages/a.html", "pages/b.html"],
+#    "variants": ["html_to_sound", "html_to_sound_trigrams"],
+#    "presets": {"html_to_sound_trigrams": ["default", "jazz"]},
+#    "output_dir": "audios/batch", "options": {"sample_rate": 22050}}
+# o como lista de trabajos: [{"input": "...", "variant": "...", "args": ["jazz"], "output": "..."}]
+# Manifiesto CSV: columnas input,variant[,preset][,output]
+#
+# Las rutas se resuelven respecto al directorio del manifiesto; sin "output"
+# el WAV se llama <entrada>_<variante>[_<preset>].wav. Un trabajo se salta si
+# su salida existe y el informe anterior la registra con la misma clave
+# (texto, variante, parámetros y versión del código, ver
+# sonification.render_cache.render_key); `--force` lo renderiza todo.
+
+DEFAULT_OUTPUT_DIR = 'audios/batch'
+
+# Los trabajos se reparten entre procesos: cada uno renderiza en streaming y en serie
+DEFAULT_OPTIONS = {'stream': True, 'workers': 1}
+
+
+def output_name(input_file, variant, args):
+    """Nombre del WAV de un trabajo: <entrada>_<variante>[_<preset>].wav."""
+    return '_'.join([Path(input_file).stem, variant, *map(str, args)]) + '.wav'
+
+
+def load_manifest(path):
+    """Lista de trabajos (en el formato del worker) de un manifiesto JSON o CSV."""
+    base = Path(path).resolve().parent
+    options = {}
+    output_dir = DEFAULT_OUTPUT_DIR
+
+    if Path(path).suffix.lower() == '.csv':
+        with open(path, newline='') as file:
+            entries = [
+                {'input': row['input'], 'variant': row['variant'],
+                 'args': [row['preset']] if row.get('preset') else [], 'output': row.get('output') or None}
+                for row in csv.DictReader(file)
+            ]
+    else:
+        with open(path) as file:
+            manifest = json.load(file)
+        if isinstance(manifest, list):
+            entries = manifest
+        else:
+            options = manifest.get('options', {})
+            output_dir = manifest.get('output_dir', output_dir)
+            presets = manifest.get('presets', {})
+            entries = [
+                {'input': input_file, 'variant': variant, 'args': [preset] if preset is not None else []}
+                for input_file in manifest['inputs']
+                for variant in manifest['variants']
+                for preset in presets.get(variant, [None])
+            ]
+
+    jobs = []
+    for entry in entries:
+        args = entry.get('args', [])
+        output = entry.get('output') or Path(output_dir) / output_name(entry['input'], entry['variant'], args)
+        jobs.append({
+            'variant': entry['variant'],
+            'input': str(base / entry['input']),
+            'output': str(base / output),
+            'args': args,
+            'options': {**DEFAULT_OPTIONS, **options, **entry.get('options', {})},
+        })
+    return jobs
+
+
+def previous_keys(report_path):
+    """Clave de cada salida renderizada con éxito según el informe anterior."""
+    try:
+        with open(report_path) as file:
+            results = json.load(file)['results']
+    except (FileNotFoundError, KeyError, ValueError):
+        return {}
+    return {result['output']: result['key'] for result in results if result['status'] != 'failed'}
+
+
+def job_key(variants, job):
+    """Clave del audio de un trabajo (None si no se puede calcular: el trabajo fallará al renderizar)."""
+    try:
+        with open(job['input'], 'r') as file:
+            html_content = file.read()
+        render = variants[job['variant']].render
+        return render_key(job['variant'], render, html_content, job['args'], job['options'])
+    except Exception:
+        return None
+
+
+def _input_size(job):
+    try:
+        return os.path.getsize(job['input'])
+    except OSError:
+        return 0
+
+
+_variants = None
+_render_cache = None
+_budget_mb = MEMORY_BUDGET_MB
+
+
+def _init_process(budget_mb=MEMORY_BUDGET_MB):
+    global _variants, _render_cache, _budget_mb
+    _variants = load_variants()
+    _render_cache = create_render_cache()
+    _budget_mb = budget_mb
+
+
+def _run(job):
+    """Ejecuta un trabajo en el proceso actual y devuelve su entrada del informe."""
+    result = {key: job[key] for key in ('input', 'variant', 'args', 'output', 'key')}
+    try:
+        Path(job['output']).parent.mkdir(parents=True, exist_ok=True)
+        response = run_job(_variants, job, _render_cache, _budget_mb)
+    except Exception as error:
+        return {**result, 'status': 'failed', 'error': f"{type(error).__name__}: {error}"}
+
+    cache = response['render_cache']
+    return {
+        **result,
+        'status': 'cached' if cache and cache['hit'] else 'rendered',
+        'timings': response['timings'],
+        'stages': response['stages'],
+        'peak_rss_mb': response['peak_rss_mb'],
+        'estimate': response['estimate'],
+    }
+
+
+def run_batch(jobs, processes=1):
+    """Ejecuta los trabajos en `processes` procesos; devuelve sus entradas del informe en orden."""
+    # Los más largos primero, para que ninguno quede solo al final
+    order = sorted(range(len(jobs)), key=lambda index: -_input_size(jobs[index]))
+    results = [None] * len(jobs)
+
+    if processes == 1 or 'fork' not in multiprocessing.get_all_start_methods():
+        _init_process()
+        for index in order:
+            results[index] = _run(jobs[index])
+        return results
+
+    # Con `fork` los procesos heredan los módulos ya importados por el principal.
+    # Los trabajos simultáneos se reparten el presupuesto de memoria de la máquina
+    context = multiprocessing.get_context('fork')
+    with ProcessPoolExecutor(processes, mp_context=context, initializer=_init_process,
+                             initargs=(MEMORY_BUDGET_MB // processes,)) as executor:
+        futures = {executor.submit(_run, jobs[index]): index for index in order}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    return results
+
+
+def main(argv=None):
+    positional, options = parse_args(sys.argv[1:] if argv is None else argv)
+    manifest_path, = positional
+    processes = resolve_workers(options.get('jobs', 'auto'))
+    jobs = load_manifest(manifest_path)
+    report_path = options.get('report') or f'{manifest_path}.report.json'
+
+    start = time.perf_counter()
+    variants = load_variants()
+    known = {} if options.get('force') else previous_keys(report_path)
+
+    pending, skipped = [], []
+    for job in jobs:
+        job['key'] = job_key(variants, job)
+        if job['key'] is not None and known.get(job['output']) == job['key'] and os.path.exists(job['output']):
+            skipped.append({key: job[key] for key in ('input', 'variant', 'args', 'output', 'key')})
+        else:
+            pending.append(job)
+
+    results = run_batch(pending, min(processes, max(len(pending), 1)))
+    results += [{**result, 'status': 'skipped'} for result in skipped]
+    wall_seconds = time.perf_counter() - start
+
+    statuses = [result['status'] for result in results]
+    report = {
+        'manifest': str(manifest_path),
+        'jobs': len(results),
+        'processes': processes,
+        'wall_s': round(wall_seconds, 3),
+        'render_s': round(sum(result['timings']['total_ms'] for result in results if 'timings' in result) / 1000, 3),
+        **{status: statuses.count(status) for status in ('rendered', 'cached', 'skipped', 'failed')},
+        'results': results,
+    }
+    Path(report_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(report_path, 'w') as file:
+        json.dump(report, file, indent=2)
+
+    for result in results:
+        detail = result.get('error') or (f"{result['timings']['total_ms']:.0f} ms" if 'timings' in result else '')
+        print(f"{result['status']:<9} {result['variant']:<36} {' '.join(result['args']):<10} "
+              f"{Path(result['input']).name:<24} {detail}")
+    print(f"{report['jobs']} jobs in {report['wall_s']:.2f}s ({report['rendered']} rendered, "
+          f"{report['cached']} cached, {report['skipped']} skipped, {report['failed']} failed); "
+          f"report in {report_path}")
+    return 1 if report['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""Compara la síntesis aditiva de `sonification.oscillators` con un seno por parcial.
+
+Uso: python scripts/benchmarks/oscillators.py [--sample-rate=44100] [--notes=64]
+
+Para cada timbre muestra el tiempo de cada implementación y su diferencia
+máxima frente a la referencia (un `np.sin` por parcial en float64). Sale
+con error si la síntesis aditiva se aleja de la referencia más de la
+tolerancia de su dtype; las tablas de ondas son una aproximación y solo
+se informa de su diferencia.
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+from sonification.cli import parse_args
+from sonification.oscillators import PIANO_RATIOS, additive_tone, harmonic_tone, piano_tone
+
+# Diferencia máxima admitida frente a la referencia
+TOLERANCE = {np.float64: 1e-9, np.float32: 1e-3}
+
+
+def per_partial(frequency, t, ratios, amplitudes):
+    """Implementación anterior: un `np.sin` completo por parcial, acumulado en un buffer auxiliar."""
+    wave = np.sin(np.multiply(2 * np.pi * frequency, t))
+    partial = np.empty_like(wave)
+    for ratio, amplitude in zip(ratios[1:], amplitudes[1:]):
+        np.multiply(2 * np.pi * (frequency * ratio), t, out=partial)
+        np.sin(partial, out=partial)
+        partial *= amplitude
+        wave += partial
+    return wave
+
+
+def best_time(function, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main(sample_rate=44100, notes=64):
+    sample_rate = int(sample_rate)
+    notes = int(notes)
+
+    def grid(duration, dtype=np.float64):
+        return np.linspace(0, duration, int(sample_rate * duration), endpoint=False, dtype=dtype)
+
+    piano = ((1, *PIANO_RATIOS), (1.0, 0.15, 0.1, 0.05, 0.05))
+    instrument = ((1, 2, 3, 4), (1.0, 0.5, 0.25, 0.125))
+    didgeridoo = ((1, 2, 3), (1.0, 0.5, 0.25))
+    inharmonic = ((1, 2 ** 0.5, np.pi, 4.2), (1.0, 0.3, 0.2, 0.1))
+    low_notes = np.linspace(50, 150, notes)[:, None]
+
+    cases = [
+        ('piano, 1 note', '1 s', 440.0, grid(1.0), piano, [
+            ('piano_tone', lambda f, t: piano_tone(f, t, piano[1][1:])),
+            ('piano_tone float32', lambda f, t: piano_tone(np.float32(f), t.astype(np.float32), piano[1][1:])),
+            ('piano_tone wavetable', lambda f, t: piano_tone(f, t, piano[1][1:], 'wavetable', sample_rate)),
+        ]),
+        ('piano, high note', '1 s', 4186.0, grid(1.0), piano, [
+            ('piano_tone', lambda f, t: piano_tone(f, t, piano[1][1:])),
+        ]),
+        ('instrument, 1 note', '0.5 s', 440.0, grid(0.5), instrument, [
+            ('harmonic_tone', lambda f, t: harmonic_tone(f, t, instrument[1][1:])),
+            ('harmonic_tone wavetable', lambda f, t: harmonic_tone(f, t, instrument[1][1:], 'wavetable', sample_rate)),
+        ]),
+        ('didgeridoo', f'{notes} x 0.3 s', low_notes, grid(0.3)[None, :], didgeridoo, [
+            ('harmonic_tone', lambda f, t: harmonic_tone(f, t, didgeridoo[1][1:])),
+            ('harmonic_tone float32', lambda f, t: harmonic_tone(f.astype(np.float32), t.astype(np.float32),
+                                                                didgeridoo[1][1:])),
+        ]),
+        ('inharmonic partials', '1 s', 440.0, grid(1.0), inharmonic, [
+            ('additive_tone (batched)', lambda f, t: additive_tone(f, t, *inharmonic)),
+        ]),
+    ]
+
+    failed = False
+    print(f"{'case':<20} {'signal':>11}  {'implementation':<26} {'time':>9} {'speedup':>8} {'max diff':>9}")
+    for case, duration, frequency, t, (ratios, amplitudes), implementations in cases:
+        reference, reference_time = best_time(lambda: per_partial(frequency, t, ratios, amplitudes))
+        print(f"{case:<20} {duration:>11}  {'np.sin per partial':<26} {reference_time * 1000:>7.2f}ms {'':>8} {0:>9.1e}")
+        for name, function in implementations:
+            result, elapsed = best_time(lambda: function(frequency, t))
+            difference = np.abs(result - reference).max()
+            # Las tablas de ondas son aproximadas: solo se comprueba la síntesis aditiva
+            tolerance = TOLERANCE[result.dtype.type] if 'wavetable' not in name else float('inf')
+            flag = '' if difference <= tolerance else '  <- exceeds tolerance'
+            failed = failed or bool(flag)
+            print(f"{case:<20} {duration:>11}  {name:<26} {elapsed * 1000:>7.2f}ms "
+                  f"{reference_time / elapsed:>7.1f}x {difference:>9.1e}{flag}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    _, options = parse_args(sys.argv[1:])
+    sys.exit(main(**options))
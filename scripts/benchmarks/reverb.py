@@ -0,0 +1,140 @@
+"""Compara las implementaciones de reverb actuales con las anteriores.
+
+Uso: python scripts/benchmarks/reverb.py [--seconds=60] [--sample-rate=44100]
+
+Para cada caso muestra el tiempo, el pico de memoria reservada por NumPy
+(tracemalloc) y la diferencia máxima frente a la referencia.
+"""
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+from scipy import signal
+
+from sonification.cli import parse_args
+from sonification.pipeline import Pipeline
+from sonification.reverb import ConvolutionMix, EchoReverb, SchroederReverb
+
+
+def legacy_add_reverb(audio, sample_rate):
+    """`add_reverb` original: un array completo de ceros por cada eco."""
+    reverb_audio = np.copy(audio)
+    for delay, amplitude in zip([0.03, 0.05, 0.07], [0.3, 0.2, 0.1]):
+        delay_samples = int(sample_rate * delay)
+        echo = np.zeros_like(audio)
+        echo[delay_samples:] = audio[:-delay_samples] * amplitude
+        reverb_audio += echo
+    return reverb_audio
+
+
+def dense_schroeder(audio, sample_rate):
+    """Los mismos filtros con `lfilter` y coeficientes densos de D+1 términos."""
+    stage = SchroederReverb(sample_rate=sample_rate)
+    reverb_input = audio * stage.FIXED_GAIN
+    reverb = np.zeros(len(audio))
+    for comb in stage.combs:
+        reverb += signal.lfilter(*dense_coefficients(comb), reverb_input)
+    reverb = signal.lfilter([1 - stage.damping], [1, -stage.damping], reverb)
+    for allpass in stage.allpasses:
+        reverb = signal.lfilter(*dense_coefficients(allpass), reverb)
+    return audio * stage.dry + reverb * stage.wet
+
+
+def dense_coefficients(delay_filter):
+    b = np.zeros(delay_filter.delay + 1)
+    a = np.zeros(delay_filter.delay + 1)
+    b[0], b[-1] = delay_filter.b
+    a[0], a[-1] = delay_filter.a
+    return b, a
+
+
+class ArraySource:
+    """Fuente de pipeline sobre un array ya calculado."""
+
+    def __init__(self, audio):
+        self.audio = audio
+        self.total_samples = len(audio)
+
+    def render_block(self, start, stop):
+        return self.audio[start:stop].copy()
+
+
+def streamed(stage, audio, sample_rate, block_samples=1 << 18):
+    pipeline = Pipeline(ArraySource(audio), [stage], sample_rate)
+    return np.concatenate(list(pipeline.blocks(block_samples)))
+
+
+def measure(function):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def test_signal(seconds, sample_rate):
+    """Notas sinusoidales con envolvente, parecidas a las de las variantes."""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    frequencies = rng.uniform(100, 1000, int(seconds / 0.25) + 1)
+    audio = np.sin(2 * np.pi * frequencies[(t / 0.25).astype(int)] * t)
+    audio *= np.exp(-(t % 0.25) * 8)
+    return audio
+
+
+def main(seconds=60, sample_rate=44100):
+    seconds = float(seconds)
+    sample_rate = int(sample_rate)
+    audio = test_signal(seconds, sample_rate)
+    short = audio[:int(min(seconds, 2) * sample_rate)]
+
+    impulse_response = np.random.default_rng(1).standard_normal(int(1.5 * sample_rate))
+    impulse_response *= np.exp(-np.arange(len(impulse_response)) / (0.3 * sample_rate))
+    impulse_response /= np.abs(impulse_response).sum()
+    moving_average = np.ones(500) / 500
+
+    cases = [
+        ('echo taps', f'{seconds:g} s', [
+            ('add_reverb original', lambda: legacy_add_reverb(audio, sample_rate)),
+            ('EchoReverb', lambda: EchoReverb(sample_rate=sample_rate).process(audio, 0)),
+            ('EchoReverb streaming', lambda: streamed(EchoReverb(sample_rate=sample_rate), audio, sample_rate)),
+        ]),
+        ('moving average (500)', f'{seconds:g} s', [
+            ('np.convolve', lambda: 0.6 * audio + 0.4 * np.convolve(audio, moving_average, mode='same')),
+            ('ConvolutionMix (FFT OLA)', lambda: ConvolutionMix(moving_average).process(audio.copy(), 0)),
+            ('ConvolutionMix streaming', lambda: streamed(ConvolutionMix(moving_average), audio, sample_rate)),
+        ]),
+        ('impulse response (1.5 s)', f'{len(short) / sample_rate:g} s', [
+            ('np.convolve', lambda: 0.6 * short + 0.4 * np.convolve(short, impulse_response, mode='same')),
+            ('ConvolutionMix (FFT OLA)', lambda: ConvolutionMix(impulse_response).process(short.copy(), 0)),
+        ]),
+        ('Schroeder/Freeverb IIR', f'{len(short) / sample_rate:g} s', [
+            ('lfilter, dense coefficients', lambda: dense_schroeder(short, sample_rate)),
+            ('SchroederReverb', lambda: SchroederReverb(sample_rate=sample_rate).process(short.copy(), 0)),
+        ]),
+        ('Schroeder/Freeverb IIR', f'{seconds:g} s', [
+            ('SchroederReverb', lambda: SchroederReverb(sample_rate=sample_rate).process(audio.copy(), 0)),
+            ('SchroederReverb streaming', lambda: streamed(SchroederReverb(sample_rate=sample_rate), audio, sample_rate)),
+        ]),
+    ]
+
+    print(f"{'case':<26} {'signal':>7}  {'implementation':<28} {'time':>9} {'peak MB':>8} {'max diff':>9}")
+    for case, duration, implementations in cases:
+        reference = None
+        for name, function in implementations:
+            result, elapsed, peak = measure(function)
+            if reference is None:
+                reference = result
+            difference = np.abs(result - reference).max()
+            print(f"{case:<26} {duration:>7}  {name:<28} {elapsed * 1000:>7.1f}ms {peak / 2 ** 20:>8.1f} {difference:>9.1e}")
+
+
+if __name__ == "__main__":
+    _, options = parse_args(sys.argv[1:])
+    main(**options)
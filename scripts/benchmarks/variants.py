@@ -0,0 +1,366 @@
+"""Benchmark y salidas de referencia de todas las variantes.
+
+Uso: python scripts/benchmarks/variants.py [--sizes=1k,10k] [--corpus=carpeta]
+         [--variants=html_to_sound,...] [--dtype=float32] [--oscillator=wavetable] [--allocations]
+         [--check-float32] [--save=resultados.json] [--compare=base.json]
+         [--update-golden] [--calibrate]
+
+Cada variante (y cada preset de `html_to_sound_trigrams` o de
+`VARIANT_OPTIONS`) se ejecuta sobre
+HTML sintético de los tamaños indicados y sobre los `.html` de `--corpus`,
+en un proceso nuevo por trabajo para medir su pico de memoria. Se guarda el
+tiempo, las muestras por segundo, el pico de RSS y, con `--allocations`, el
+pico de memoria reservada según tracemalloc (una pasada más, mucho más lenta).
+
+El hash SHA-256 del WAV de cada trabajo se compara con `golden.json`: si una
+optimización cambia el audio, el script termina con error. `--update-golden`
+reescribe las referencias con los resultados de esta ejecución. Las
+referencias son las del render por defecto (float64, oscilador exacto);
+`--oscillator=wavetable` mide los osciladores de tabla (ver
+`sonification/wavetable.py`) sin comprobarlas. Con `--check-float32` el
+script también falla si el render en float32 se aleja del de float64 más
+de `FLOAT32_TOLERANCE_LSB`.
+
+`--calibrate` mide además la memoria de la pipeline construida y la del
+render completo en memoria, y escribe los modelos de coste resultantes en
+el formato de `COST_MODELS` (ver `sonification/cost.py`).
+"""
+import sys
+import json
+import time
+import hashlib
+import platform
+import resource
+import subprocess
+import tracemalloc
+from pathlib import Path
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCHMARKS_DIR.parent))
+
+import numpy as np
+
+from sonification.cache import note_cache
+from sonification.cli import parse_args
+from sonification.pipeline import STREAM_BLOCK_SAMPLES, to_pcm16
+from sonification.variants import VARIANTS, get_variant
+from sonification.wavfile import write_wav
+
+GOLDEN_FILE = BENCHMARKS_DIR / 'golden.json'
+
+# Semillas fijas: el corpus sintético y el audio son siempre los mismos
+CORPUS_SEED = 0
+RENDER_SEED = 0
+
+# Diferencia máxima admitida entre float32 y float64 con `--check-float32`, en LSB de PCM de 16 bits
+FLOAT32_TOLERANCE_LSB = 16
+
+# Opciones de render que cambian el coste de una variante: cada una se mide como un preset más
+VARIANT_OPTIONS = {
+    'html_to_sound_piano_style': [{'reverb': 'schroeder'}],
+}
+
+# Regresión a partir de la cual `--compare` marca un trabajo
+SLOWDOWN_THRESHOLD = 1.10
+
+WORDS = (
+    'sonido', 'datos', 'página', 'música', 'the', 'of', 'and', 'web', 'audio', 'niño',
+    'café', 'señal', 'frequency', 'render', 'script', 'étude', 'naïve', '2024', '3.14', '100%',
+    '€20', 'über', 'wave', 'ritmo', 'nota', 'piano', 'HTML', 'JSON', 'CSS', 'API',
+)
+TAGS = ('div', 'p', 'span', 'a', 'h1', 'h2', 'li', 'section', 'article', 'td')
+PUNCTUATION = ('.', ',', ';', ':', '!', '?', '')
+
+
+def parse_size(size):
+    """'1k' -> 1024, '1m' -> 1048576 (caracteres)."""
+    units = {'k': 1 << 10, 'm': 1 << 20}
+    size = size.strip().lower()
+    if size[-1] in units:
+        return int(float(size[:-1]) * units[size[-1]])
+    return int(size)
+
+
+def synthetic_html(size, seed=CORPUS_SEED):
+    """HTML sintético de `size` caracteres: etiquetas, atributos, texto, cifras y acentos."""
+    rng = np.random.default_rng(seed)
+    parts = ['<!DOCTYPE html>\n<html lang="es">\n<head><title>Sonificafy</title></head>\n<body>\n']
+    length = len(parts[0])
+    while length < size:
+        tag = TAGS[rng.integers(len(TAGS))]
+        words = ' '.join(WORDS[index] for index in rng.integers(len(WORDS), size=rng.integers(3, 15)))
+        ending = PUNCTUATION[rng.integers(len(PUNCTUATION))]
+        element = (f'  <{tag} class="c{rng.integers(100)}" id="n{rng.integers(10000)}">'
+                   f'{words}{ending}</{tag}>\n')
+        parts.append(element)
+        length += len(element)
+    return ''.join(parts)[:size]
+
+
+def load_input(source):
+    """Texto de una entrada del corpus: 'synthetic:<tamaño>' o la ruta de un fichero."""
+    if source.startswith('synthetic:'):
+        return synthetic_html(parse_size(source.partition(':')[2]))
+    return Path(source).read_text()
+
+
+def input_name(source):
+    if source.startswith('synthetic:'):
+        return 'synthetic-' + source.partition(':')[2]
+    return Path(source).stem
+
+
+def variant_jobs(names):
+    """(variante, argumentos, opciones) de cada trabajo: los presets van por separado."""
+    jobs = []
+    for name in names:
+        if name == 'html_to_sound_trigrams':
+            jobs += [(name, [preset], {}) for preset in get_variant(name).configs]
+        else:
+            jobs.append((name, [], {}))
+            jobs += [(name, [], options) for options in VARIANT_OPTIONS.get(name, [])]
+    return jobs
+
+
+def preset_name(job):
+    """Nombre de la variante con su preset u opciones, como en `COST_MODELS`: `variante[preset]`."""
+    presets = job['args'][:1] + list(job['options'].values())
+    return job['variant'] + ''.join(f'[{preset}]' for preset in presets)
+
+
+def job_key(job):
+    return f"{preset_name(job)}@{input_name(job['input'])}"
+
+
+class HashSink:
+    """Destino del WAV que solo calcula su hash (no admite `seek`: se escribe por bloques)."""
+
+    def __init__(self):
+        self.digest = hashlib.sha256()
+        self.nbytes = 0
+
+    def write(self, data):
+        self.digest.update(data)
+        self.nbytes += len(data)
+
+    def flush(self):
+        pass
+
+
+def peak_rss_mb():
+    # ru_maxrss viene en KB en Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def render_once(job, text, dtype):
+    """Construye y escribe la pipeline del trabajo; devuelve (pipeline, sink)."""
+    note_cache.clear()
+    variant = get_variant(job['variant'])
+    pipeline = variant.build(text, *job['args'], dtype=dtype, seed=RENDER_SEED, oscillator=job['oscillator'],
+                             **job['options'])
+    sink = HashSink()
+    write_wav(sink, pipeline, stream=True)
+    return pipeline, sink
+
+
+def float32_error(job, text):
+    """Máxima diferencia (en unidades de PCM de 16 bits) entre float32 y float64."""
+    variant = get_variant(job['variant'])
+    reference = variant.build(text, *job['args'], dtype='float64', seed=RENDER_SEED, oscillator=job['oscillator'],
+                              **job['options'])
+    candidate = variant.build(text, *job['args'], dtype='float32', seed=RENDER_SEED, oscillator=job['oscillator'],
+                              **job['options'])
+    error = 0
+    for expected, actual in zip(reference.blocks(STREAM_BLOCK_SAMPLES), candidate.blocks(STREAM_BLOCK_SAMPLES)):
+        difference = to_pcm16(expected).astype(np.int32) - to_pcm16(actual.astype(np.float64))
+        error = max(error, int(np.abs(difference).max(initial=0)))
+    return error
+
+
+def run_job(job):
+    """Ejecuta un trabajo en este proceso y devuelve sus medidas."""
+    text = load_input(job['input'])
+    rss_before = peak_rss_mb()
+
+    start = time.perf_counter()
+    pipeline, sink = render_once(job, text, job['dtype'])
+    wall = time.perf_counter() - start
+
+    result = {
+        'input_chars': len(text),
+        'samples': pipeline.total_samples,
+        'audio_seconds': round(pipeline.total_samples / pipeline.sample_rate, 3),
+        'wall_s': round(wall, 4),
+        'samples_per_s': round(pipeline.total_samples / wall) if wall else None,
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'rss_growth_mb': round(peak_rss_mb() - rss_before, 1),
+        'wav_bytes': sink.nbytes,
+        'sha256': sink.digest.hexdigest(),
+    }
+
+    if job['allocations']:
+        tracemalloc.start()
+        render_once(job, text, job['dtype'])
+        result['alloc_peak_mb'] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 1)
+        tracemalloc.stop()
+
+    if job['check_float32']:
+        result['float32_max_lsb'] = float32_error(job, text)
+
+    if job.get('calibrate'):
+        result.update(calibrate(job, text))
+
+    return result
+
+
+def calibrate(job, text):
+    """Memoria por carácter de la pipeline y buffers de la duración del audio de un render en memoria."""
+    note_cache.clear()
+    variant = get_variant(job['variant'])
+    tracemalloc.start()
+    pipeline = variant.build(text, *job['args'], dtype=job['dtype'], seed=RENDER_SEED, oscillator=job['oscillator'],
+                             **job['options'])
+    built, build_peak = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    pipeline.render()
+    render_peak = tracemalloc.get_traced_memory()[1] - built
+    tracemalloc.stop()
+    itemsize = np.dtype(job['dtype']).itemsize
+    return {
+        'bytes_per_char': round(build_peak / len(text), 1),
+        'buffers': round(render_peak / (pipeline.total_samples * itemsize), 2),
+    }
+
+
+def cost_models(results, jobs):
+    """Modelos de coste por variante a partir de los resultados de `--calibrate`."""
+    models = {}
+    for job in jobs:
+        result = results[job_key(job)]
+        if 'error' in result:
+            continue
+        model = models.setdefault(preset_name(job), {'samples': 0, 'wall': 0.0, 'buffers': 0.0, 'bytes_per_char': 0.0,
+                                         'stream_mb': 0.0})
+        model['samples'] += result['samples']
+        model['wall'] += result['wall_s']
+        model['buffers'] = max(model['buffers'], result['buffers'])
+        model['bytes_per_char'] = max(model['bytes_per_char'], result['bytes_per_char'])
+        model['stream_mb'] = max(model['stream_mb'], result['peak_rss_mb'])
+    return {
+        name: {
+            'samples_per_s': int(float(f"{model['samples'] / model['wall']:.3g}")),
+            'buffers': model['buffers'],
+            'bytes_per_char': model['bytes_per_char'],
+            'stream_mb': model['stream_mb'],
+        }
+        for name, model in models.items()
+    }
+
+
+def run_in_subprocess(job):
+    completed = subprocess.run(
+        [sys.executable, __file__, f'--job={json.dumps(job)}'],
+        capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        return {'error': completed.stderr.strip().splitlines()[-1] if completed.stderr else 'failed'}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def compare(results, baseline):
+    """Diferencias con una ejecución anterior: tiempo, memoria y hash."""
+    regressions = 0
+    print(f"\n{'job':<58} {'wall':>8} {'rss':>8}  audio")
+    for key, result in results.items():
+        previous = baseline.get(key)
+        if previous is None or 'error' in result or 'error' in previous:
+            continue
+        slowdown = result['wall_s'] / previous['wall_s'] if previous['wall_s'] else 1.0
+        rss = result['peak_rss_mb'] - previous['peak_rss_mb']
+        audio = 'same' if result['sha256'] == previous['sha256'] else 'CHANGED'
+        flag = '  <- slower' if slowdown > SLOWDOWN_THRESHOLD else ''
+        regressions += bool(flag)
+        print(f"{key:<58} {slowdown:>7.2f}x {rss:>+7.1f}M  {audio}{flag}")
+    return regressions
+
+
+def main(sizes='1k,10k', corpus=None, variants=None, dtype='float64', oscillator='exact', allocations=False,
+         check_float32=False, save=None, compare_with=None, update_golden=False, calibrate=False):
+    names = variants.split(',') if variants else list(VARIANTS)
+    inputs = [f'synthetic:{size}' for size in sizes.split(',') if size]
+    if corpus:
+        inputs += [str(path) for path in sorted(Path(corpus).glob('*.html'))]
+
+    jobs = [
+        {'variant': name, 'args': args, 'options': options, 'input': source, 'dtype': dtype,
+         'oscillator': oscillator, 'allocations': allocations, 'check_float32': check_float32,
+         'calibrate': calibrate}
+        for source in inputs for name, args, options in variant_jobs(names)
+    ]
+
+    results = {}
+    print(f"{'job':<58} {'audio s':>9} {'wall s':>8} {'Msamples/s':>10} {'RSS MB':>7}")
+    for job in jobs:
+        key = job_key(job)
+        result = results[key] = run_in_subprocess(job)
+        if 'error' in result:
+            print(f"{key:<58} ERROR {result['error']}")
+            continue
+        extra = ''
+        if 'alloc_peak_mb' in result:
+            extra += f"  alloc {result['alloc_peak_mb']} MB"
+        if 'float32_max_lsb' in result:
+            extra += f"  float32 ±{result['float32_max_lsb']} LSB"
+            if result['float32_max_lsb'] > FLOAT32_TOLERANCE_LSB:
+                extra += '  <- exceeds tolerance'
+        print(f"{key:<58} {result['audio_seconds']:>9.1f} {result['wall_s']:>8.3f} "
+              f"{result['samples_per_s'] / 1e6:>10.2f} {result['peak_rss_mb']:>7.1f}{extra}")
+
+    if save:
+        report = {
+            'meta': {
+                'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'machine': platform.machine(),
+                'dtype': dtype,
+                'oscillator': oscillator,
+            },
+            'results': results,
+        }
+        Path(save).write_text(json.dumps(report, indent=2, ensure_ascii=False) + '\n')
+
+    if calibrate:
+        print("\nCOST_MODELS = {")
+        for name, model in cost_models(results, jobs).items():
+            print(f"    {name!r}: {model},")
+        print("}")
+
+    failed = any('error' in result for result in results.values())
+    failed = failed or any(result.get('float32_max_lsb', 0) > FLOAT32_TOLERANCE_LSB for result in results.values())
+    if compare_with:
+        compare(results, json.loads(Path(compare_with).read_text())['results'])
+
+    # Las referencias son del render por defecto: float64 y oscilador exacto
+    if dtype == 'float64' and oscillator == 'exact':
+        golden = json.loads(GOLDEN_FILE.read_text()) if GOLDEN_FILE.exists() else {}
+        if update_golden:
+            golden.update({key: result['sha256'] for key, result in results.items() if 'error' not in result})
+            GOLDEN_FILE.write_text(json.dumps(dict(sorted(golden.items())), indent=2) + '\n')
+        else:
+            changed = [key for key, result in results.items()
+                       if key in golden and result.get('sha256') != golden[key]]
+            for key in changed:
+                print(f"golden mismatch: {key}")
+            failed = failed or bool(changed)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    _, options = parse_args(sys.argv[1:])
+    if 'job' in options:
+        print(json.dumps(run_job(json.loads(options['job']))))
+    else:
+        options['compare_with'] = options.pop('compare', None)
+        sys.exit(main(**options))
@@ -0,0 +1 @@
+"""Componentes compartidos por los scripts de sonificación."""
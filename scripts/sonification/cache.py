@@ -0,0 +1,78 @@
+import os
+import inspect
+import functools
+from collections import OrderedDict
+
+
+class NoteCache:
+    """Caché LRU acotada de notas ya sintetizadas.
+
+    Las notas se guardan como arrays de solo lectura: quien las use debe
+    copiarlas (por ejemplo, sumándolas en el buffer de la línea temporal).
+    """
+
+    def __init__(self, maxsize=512, max_bytes=64 * 1024 * 1024):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self._notes = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, render):
+        """Devuelve la nota de `key`, sintetizándola con `render()` si no está."""
+        wave = self._notes.get(key)
+        if wave is not None:
+            self._notes.move_to_end(key)
+            self.hits += 1
+            return wave
+
+        self.misses += 1
+        wave = render()
+        wave.setflags(write=False)
+
+        self._notes[key] = wave
+        self.nbytes += wave.nbytes
+        while len(self._notes) > self.maxsize or (self.nbytes > self.max_bytes and len(self._notes) > 1):
+            _, evicted = self._notes.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+            self.evictions += 1
+
+        return wave
+
+    def memoize(self, instrument):
+        """Decorador: cachea una función de nota por (instrumento, argumentos)."""
+        def decorator(generate):
+            signature = inspect.signature(generate)
+
+            @functools.wraps(generate)
+            def wrapper(*args, **kwargs):
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                key = (instrument,) + tuple(bound.arguments.values())
+                return self.get(key, lambda: generate(*args, **kwargs))
+
+            return wrapper
+        return decorator
+
+    def stats(self):
+        """Contadores de uso de la caché."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._notes),
+            'bytes': self.nbytes,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def clear(self):
+        """Vacía la caché y reinicia los contadores."""
+        self._notes.clear()
+        self.nbytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+
+note_cache = NoteCache(maxsize=int(os.environ.get('NOTE_CACHE_SIZE', 512)))
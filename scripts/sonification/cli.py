@@ -0,0 +1,74 @@
+import sys
+import json
+
+from sonification.cost import RunningBudget, plan_job
+from sonification.incremental import INPUT_CHUNK_CHARS, read_chunks, render_incremental
+from sonification.profiling import stage_timings
+
+
+def parse_args(argv):
+    """Separa los argumentos posicionales de las opciones `--nombre[=valor]`."""
+    positional = []
+    options = {}
+    for arg in argv:
+        if arg.startswith('--'):
+            name, _, value = arg[2:].partition('=')
+            options[name.replace('-', '_')] = value if value else True
+        else:
+            positional.append(arg)
+    return positional, options
+
+
+def run(render, argv=None):
+    """Punto de entrada común de los scripts.
+
+    Uso: script.py entrada.html salida.wav [argumentos...] [--stream] [--dtype=float32]
+             [--sample-rate=22050] [--encoding=pcm16|pcm8|mulaw|ima_adpcm] [--seed=N]
+             [--workers=N|auto] [--timings] [--no-limits] [--incremental]
+
+    Con `-` como entrada se lee stdin; con `-` como salida el WAV se emite
+    por stdout a medida que se renderiza. Antes de renderizar se estima el
+    coste del trabajo (ver `sonification.cost.plan_job`), que puede pasar
+    a streaming, bajar la frecuencia de muestreo o rechazarlo; `--no-limits`
+    lo desactiva. Con `--timings` se escribe al final una línea JSON con el
+    tiempo de cada fase, el pico de memoria y la estimación (por stdout, o
+    por stderr si el audio sale por stdout).
+
+    Con `--incremental` la entrada se lee por trozos y cada trozo se
+    sintetiza en cuanto llega (ver `sonification.incremental`): con una
+    tubería, la síntesis se solapa con la descarga del HTML y la memoria no
+    depende de su tamaño. Como el texto no se conoce entero de antemano, el
+    coste se estima trozo a trozo (ver `sonification.cost.RunningBudget`):
+    el trabajo se corta con `JobTooLarge` en cuanto la estimación acumulada
+    pasa de los límites.
+    """
+    positional, options = parse_args(sys.argv[1:] if argv is None else argv)
+    timings = options.pop('timings', False)
+    no_limits = options.pop('no_limits', False)
+    incremental = options.pop('incremental', False)
+
+    input_file, output_file, *args = positional
+    variant = sys.modules[render.__module__]
+    estimate = None
+    if incremental:
+        budget = None
+        if not no_limits:
+            budget = RunningBudget(variant, args, options, INPUT_CHUNK_CHARS, output_file=output_file)
+        render_incremental(variant, read_chunks(input_file), output_file, *args, budget=budget, **options)
+        estimate = budget.estimate if budget else None
+    else:
+        with stage_timings.measure('read'):
+            if input_file == '-':
+                html_content = sys.stdin.read()
+            else:
+                with open(input_file, "r") as file:
+                    html_content = file.read()
+
+        if not no_limits:
+            options, estimate = plan_job(variant, html_content, args, options, output_file=output_file)
+
+        render(html_content, output_file, *args, **options)
+
+    if timings:
+        report_file = sys.stderr if output_file == '-' else sys.stdout
+        report_file.write(json.dumps({**stage_timings.report(), 'estimate': estimate}) + "\n")
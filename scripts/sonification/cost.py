@@ -0,0 +1,231 @@
+import os
+import shutil
+import inspect
+
+import numpy as np
+
+from sonification.encodings import make_encoder
+from sonification.pipeline import STREAM_BLOCK_SAMPLES, resolve_dtype, resolve_workers
+
+# Presupuesto de un trabajo: la VM tiene 1 GB y el tiempo de render está acotado
+MEMORY_BUDGET_MB = int(os.environ.get('RENDER_MEMORY_MB', 1024))
+MAX_RENDER_SECONDS = float(os.environ.get('MAX_RENDER_SECONDS', 300))
+
+# Los tamaños de un WAV son de 32 bits: el chunk RIFF no puede pasar de 0xFFFFFFFF bytes
+MAX_WAV_BYTES = 0xFFFFFFFF
+
+# Cota de la cabecera (chunks `fmt `, `fact` y cabecera de `data`)
+WAV_HEADER_BYTES = 64
+
+# Frecuencias de muestreo a las que se baja un trabajo demasiado largo, de mayor a menor
+FALLBACK_SAMPLE_RATES = (22050, 16000, 11025)
+
+# Coste de cada variante (y preset), calibrado con
+# `python scripts/benchmarks/variants.py --calibrate`:
+#   samples_per_s   muestras renderizadas por segundo (un proceso, float64)
+#   buffers         arrays del tamaño del audio (en elementos del dtype) que
+#                   conviven durante un render; en streaming, del tamaño del bloque
+#   bytes_per_char  memoria de la pipeline construida por carácter del texto
+#   stream_mb       pico de memoria del proceso en streaming con textos cortos:
+#                   intérprete, librerías, cachés y buffers de un bloque
+COST_MODELS = {
+    'didgeridoo': {'samples_per_s': 167_000_000, 'buffers': 1.22, 'bytes_per_char': 423.0, 'stream_mb': 53.2},
+    'html_to_sound': {'samples_per_s': 96_000_000, 'buffers': 1.38, 'bytes_per_char': 61.9, 'stream_mb': 49.4},
+    'html_to_sound_instrument_envelope': {'samples_per_s': 13_300_000, 'buffers': 1.01, 'bytes_per_char': 42.6, 'stream_mb': 106.3},
+    'html_to_sound_piano_style': {'samples_per_s': 13_900_000, 'buffers': 3.01, 'bytes_per_char': 42.6, 'stream_mb': 114.2},
+    'html_to_sound_piano_style[schroeder]': {'samples_per_s': 3_140_000, 'buffers': 1.19, 'bytes_per_char': 242.4, 'stream_mb': 131.0},
+    'html_to_sound_space': {'samples_per_s': 62_400_000, 'buffers': 1.16, 'bytes_per_char': 182.4, 'stream_mb': 57.8},
+    'html_to_sound_trigrams[default]': {'samples_per_s': 19_000_000, 'buffers': 1.35, 'bytes_per_char': 156.5, 'stream_mb': 63.4},
+    'html_to_sound_trigrams[variable]': {'samples_per_s': 17_700_000, 'buffers': 2.05, 'bytes_per_char': 103.5, 'stream_mb': 63.5},
+    'html_to_sound_trigrams[jazz]': {'samples_per_s': 26_600_000, 'buffers': 3.21, 'bytes_per_char': 103.9, 'stream_mb': 200.9},
+    'html_to_sound_trigrams[polyphony]': {'samples_per_s': 13_200_000, 'buffers': 2.32, 'bytes_per_char': 77.2, 'stream_mb': 47.6},
+    'html_to_sound_trigrams[orchestra]': {'samples_per_s': 16_400_000, 'buffers': 2.53, 'bytes_per_char': 80.3, 'stream_mb': 50.0},
+    'html_to_sound_trigrams[lofi]': {'samples_per_s': 18_600_000, 'buffers': 2.23, 'bytes_per_char': 77.0, 'stream_mb': 48.7},
+    'html_to_sound_with_silences': {'samples_per_s': 131_000_000, 'buffers': 1.02, 'bytes_per_char': 139.0, 'stream_mb': 42.6},
+    'john_frusciante_inspiration': {'samples_per_s': 6_640_000, 'buffers': 5.33, 'bytes_per_char': 76.8, 'stream_mb': 116.9},
+    'piano_with_rythm': {'samples_per_s': 82_700_000, 'buffers': 1.06, 'bytes_per_char': 132.0, 'stream_mb': 45.7},
+    'piano_with_silences': {'samples_per_s': 73_400_000, 'buffers': 1.04, 'bytes_per_char': 149.1, 'stream_mb': 44.5},
+}
+
+# Para variantes sin calibrar: el peor caso de las calibradas
+DEFAULT_MODEL = {'samples_per_s': 6_640_000, 'buffers': 5.33, 'bytes_per_char': 423.0, 'stream_mb': 201.0}
+
+
+class JobTooLarge(ValueError):
+    """El trabajo no cabe en el presupuesto de memoria o de tiempo ni ajustando su modo de render."""
+
+
+def cost_model(name, args=(), options=None):
+    """Modelo de coste de la variante `name` con su preset (el primero de `args`) o su reverb."""
+    for preset in (*args[:1], (options or {}).get('reverb')):
+        if preset is not None and f'{name}[{preset}]' in COST_MODELS:
+            return COST_MODELS[f'{name}[{preset}]']
+    return COST_MODELS.get(name, DEFAULT_MODEL)
+
+
+def output_bytes(samples, sample_rate, encoding='pcm16'):
+    """Bytes del WAV de `samples` muestras con la codificación `encoding`, cabecera incluida."""
+    encoder = make_encoder(encoding, sample_rate)
+    blocks = -(-int(samples) // encoder.samples_per_block)
+    return WAV_HEADER_BYTES + blocks * encoder.block_align
+
+
+def free_disk_bytes(output_file):
+    """Espacio libre en el disco de `output_file` (None si la salida no es un fichero)."""
+    if output_file is None or output_file == '-':
+        return None
+    directory = os.path.dirname(os.path.abspath(output_file))
+    # El directorio de salida puede no existir todavía: vale el del primer antecesor que exista
+    while not os.path.isdir(directory) and os.path.dirname(directory) != directory:
+        directory = os.path.dirname(directory)
+    return shutil.disk_usage(directory).free
+
+
+def estimate(model, samples, sample_rate, chars, dtype='float64', stream=False, workers=1,
+             block_samples=STREAM_BLOCK_SAMPLES, encoding='pcm16'):
+    """Muestras, duración, tiempo de render, pico de memoria y tamaño del WAV estimados de un trabajo."""
+    itemsize = np.dtype(resolve_dtype(dtype)).itemsize
+    workers = resolve_workers(workers)
+    pipeline_mb = chars * model['bytes_per_char'] / 2 ** 20
+
+    sample_mb = (model['buffers'] * itemsize + 2) / 2 ** 20
+    if workers == 1 and not stream:
+        # Señal completa en memoria más su copia en PCM de 16 bits
+        peak_mb = model['stream_mb'] + pipeline_mb + samples * sample_mb
+    else:
+        # Los procesos en paralelo comparten lo heredado por `fork`; cada uno suma sus bloques
+        peak_mb = model['stream_mb'] + pipeline_mb + (workers - 1) * min(samples, block_samples) * sample_mb
+
+    cpu_seconds = samples / model['samples_per_s']
+    return {
+        'samples': int(samples),
+        'sample_rate': int(sample_rate),
+        'audio_s': round(samples / sample_rate, 1),
+        'cpu_s': round(cpu_seconds, 2),
+        'wall_s': round(cpu_seconds / min(workers, os.cpu_count() or 1), 2),
+        'peak_mb': round(peak_mb, 1),
+        'output_bytes': output_bytes(samples, sample_rate, encoding),
+        'stream': bool(stream) or workers > 1,
+        'workers': workers,
+    }
+
+
+def plan_job(variant, html_content, args=(), options=None,
+             budget_mb=MEMORY_BUDGET_MB, max_seconds=MAX_RENDER_SECONDS, output_file=None):
+    """Estima el coste de un trabajo y ajusta sus opciones para que quepa en el presupuesto.
+
+    La pasada previa construye la pipeline (solo el mapeo del texto, sin
+    sintetizar) para conocer el número exacto de muestras. Si el render no
+    cabe en `max_seconds`, o el WAV no cabe en el límite de RIFF ni en el
+    disco libre de `output_file`, se baja la frecuencia de muestreo; si no
+    cabe en `budget_mb`, se pasa a streaming y, si hace falta, a menos
+    procesos. Devuelve (opciones, estimación); lanza `JobTooLarge` si no
+    hay forma.
+    """
+    options = dict(options or {})
+    name = variant.__name__.rsplit('.', 1)[-1]
+    model = cost_model(name, args, options)
+
+    accepted = inspect.signature(variant.build).parameters
+    build_options = {key: value for key, value in options.items() if key in accepted}
+    pipeline = variant.build(html_content, *args, **build_options)
+
+    def job_estimate(sample_rate=pipeline.sample_rate):
+        samples = pipeline.total_samples * sample_rate / pipeline.sample_rate
+        return estimate(model, samples, sample_rate, len(html_content), options.get('dtype', 'float64'),
+                        options.get('stream', False), options.get('workers', 1),
+                        encoding=options.get('encoding', 'pcm16'))
+
+    adjustments = []
+    result = job_estimate()
+    if result['wall_s'] > max_seconds:
+        for sample_rate in FALLBACK_SAMPLE_RATES:
+            if sample_rate < pipeline.sample_rate and job_estimate(sample_rate)['wall_s'] <= max_seconds:
+                options['sample_rate'] = sample_rate
+                adjustments.append(f'sample_rate={sample_rate}')
+                break
+        else:
+            raise JobTooLarge(
+                f"Estimated render time of {result['wall_s']:.0f}s ({result['audio_s']:.0f}s of audio) "
+                f"exceeds the {max_seconds:.0f}s limit"
+            )
+        result = job_estimate(options['sample_rate'])
+
+    disk_free = free_disk_bytes(output_file)
+    max_bytes = MAX_WAV_BYTES if disk_free is None else min(MAX_WAV_BYTES, disk_free)
+    if result['output_bytes'] > max_bytes:
+        limit = 'WAV size limit' if max_bytes == MAX_WAV_BYTES else 'free disk space'
+        for sample_rate in FALLBACK_SAMPLE_RATES:
+            if sample_rate < result['sample_rate'] and job_estimate(sample_rate)['output_bytes'] <= max_bytes:
+                options['sample_rate'] = sample_rate
+                adjustments.append(f'sample_rate={sample_rate}')
+                break
+        else:
+            raise JobTooLarge(
+                f"Estimated output of {result['output_bytes'] / 2 ** 20:.0f}MB exceeds the "
+                f"{max_bytes / 2 ** 20:.0f}MB {limit}"
+            )
+        result = job_estimate(options['sample_rate'])
+
+    if result['peak_mb'] > budget_mb and not result['stream']:
+        options['stream'] = True
+        adjustments.append('stream')
+        result = job_estimate(result['sample_rate'])
+
+    while result['peak_mb'] > budget_mb and result['workers'] > 1:
+        options['workers'] = result['workers'] // 2
+        result = job_estimate(result['sample_rate'])
+        adjustments.append(f"workers={result['workers']}")
+
+    if result['peak_mb'] > budget_mb:
+        raise JobTooLarge(f"Estimated peak memory of {result['peak_mb']:.0f}MB exceeds the {budget_mb}MB budget")
+
+    result['adjustments'] = adjustments
+    return options, result
+
+
+class RunningBudget:
+    """Presupuesto de un render incremental, comprobado trozo a trozo.
+
+    Con entrada incremental no se conoce el texto entero de antemano, así
+    que no hay pasada previa: cada pipeline suma sus muestras a las de los
+    trozos anteriores y, si la estimación acumulada pasa del tiempo máximo,
+    del límite de RIFF o del disco libre, o un trozo no cabe en memoria,
+    se lanza `JobTooLarge` antes de renderizarlo. `estimate` guarda la
+    última estimación.
+    """
+
+    def __init__(self, variant, args=(), options=None, chunk_chars=0,
+                 budget_mb=MEMORY_BUDGET_MB, max_seconds=MAX_RENDER_SECONDS, output_file=None):
+        options = options or {}
+        self.model = cost_model(variant.__name__.rsplit('.', 1)[-1], args, options)
+        self.chunk_chars = chunk_chars
+        self.dtype = options.get('dtype', 'float64')
+        self.encoding = options.get('encoding', 'pcm16')
+        self.budget_mb = budget_mb
+        self.max_seconds = max_seconds
+        disk_free = free_disk_bytes(output_file)
+        self.max_bytes = MAX_WAV_BYTES if disk_free is None else min(MAX_WAV_BYTES, disk_free)
+        self.samples = 0
+        self.estimate = None
+
+    def check(self, pipeline):
+        """Suma las muestras de `pipeline` y comprueba la estimación acumulada."""
+        self.samples += pipeline.total_samples
+        # El render incremental es siempre por bloques y en un solo proceso
+        result = estimate(self.model, self.samples, pipeline.sample_rate, self.chunk_chars, self.dtype,
+                          stream=True, workers=1, encoding=self.encoding)
+        self.estimate = result
+        if result['wall_s'] > self.max_seconds:
+            raise JobTooLarge(
+                f"Estimated render time of {result['wall_s']:.0f}s ({result['audio_s']:.0f}s of audio so far) "
+                f"exceeds the {self.max_seconds:.0f}s limit"
+            )
+        if result['output_bytes'] > self.max_bytes:
+            raise JobTooLarge(
+                f"Estimated output of {result['output_bytes'] / 2 ** 20:.0f}MB exceeds the "
+                f"{self.max_bytes / 2 ** 20:.0f}MB {'WAV size limit' if self.max_bytes == MAX_WAV_BYTES else 'free disk space'}"
+            )
+        if result['peak_mb'] > self.budget_mb:
+            raise JobTooLarge(f"Estimated peak memory of {result['peak_mb']:.0f}MB exceeds the {self.budget_mb}MB budget")
+        return pipeline
@@ -0,0 +1,219 @@
+import numpy as np
+
+from sonification.pipeline import to_pcm16
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_MULAW = 0x0007
+WAVE_FORMAT_IMA_ADPCM = 0x0011
+
+# Tablas estándar de IMA ADPCM (paso de cuantización e índice siguiente)
+IMA_STEP_TABLE = np.array([
+    7, 8, 9, 10, 11, 12, 13, 14, 16, 17, 19, 21, 23, 25, 28, 31, 34, 37, 41, 45,
+    50, 55, 60, 66, 73, 80, 88, 97, 107, 118, 130, 143, 157, 173, 190, 209, 230,
+    253, 279, 307, 337, 371, 408, 449, 494, 544, 598, 658, 724, 796, 876, 963,
+    1060, 1166, 1282, 1411, 1552, 1707, 1878, 2066, 2272, 2499, 2749, 3024, 3327,
+    3660, 4026, 4428, 4871, 5358, 5894, 6484, 7132, 7845, 8630, 9493, 10442,
+    11487, 12635, 13899, 15289, 16818, 18500, 20350, 22385, 24623, 27086, 29794,
+    32767,
+], dtype=np.int32)
+IMA_INDEX_TABLE = np.array([-1, -1, -1, -1, 2, 4, 6, 8], dtype=np.int32)
+
+
+def _ima_tables():
+    """Tablas (índice de paso, código de 3 bits) -> incremento decodificado e índice siguiente."""
+    step = IMA_STEP_TABLE[:, None]
+    code = np.arange(8)[None, :]
+    delta = (step >> 3) + np.where(code & 4, step, 0) + np.where(code & 2, step >> 1, 0) + np.where(code & 1, step >> 2, 0)
+    next_index = np.clip(np.arange(89)[:, None] + IMA_INDEX_TABLE[None, :], 0, 88)
+    return delta.ravel().astype(np.int32), next_index.ravel().astype(np.int32)
+
+
+IMA_DELTA, IMA_NEXT_INDEX = _ima_tables()
+IMA_QUARTER_RECIPROCAL = (4 / IMA_STEP_TABLE).astype(np.float32)
+
+# Muestras acumuladas antes de codificar en IMA ADPCM: el bucle por
+# posición dentro del bloque se paga una vez por lote, no por bloque
+IMA_BATCH_SAMPLES = 1 << 20
+
+
+class Encoder:
+    """Convierte bloques de muestras en [-1, 1] en los bytes del chunk `data`.
+
+    `format_tag`, `bits_per_sample` y `block_align` describen el formato en
+    el chunk `fmt `; `extra` son los bytes que siguen a los 16 comunes
+    y a `cbSize` (None para PCM, que no lleva `cbSize`; vacío si el formato
+    no tiene bytes propios, como µ-law). Los formatos comprimidos llevan
+    además un chunk `fact` con el número de muestras.
+    """
+
+    format_tag = WAVE_FORMAT_PCM
+    bits_per_sample = 16
+    block_align = 2
+    samples_per_block = 1
+    extra = None
+
+    def __init__(self, sample_rate):
+        self.sample_rate = sample_rate
+        self.samples = 0
+
+    @property
+    def has_fact(self):
+        return self.format_tag != WAVE_FORMAT_PCM
+
+    @property
+    def bytes_per_second(self):
+        return self.sample_rate * self.block_align // self.samples_per_block
+
+    def encode(self, block):
+        """Codifica un bloque; puede modificar `block` en el sitio."""
+        self.samples += len(block)
+        return self._encode(block)
+
+    def _encode(self, block):
+        raise NotImplementedError
+
+    def flush(self):
+        """Bytes pendientes al terminar la señal."""
+        return b''
+
+
+class Pcm16(Encoder):
+    """PCM lineal de 16 bits con signo (el formato de siempre)."""
+
+    def __init__(self, sample_rate):
+        super().__init__(sample_rate)
+        self._buffer = np.empty(0, dtype=np.int16)
+
+    def _encode(self, block):
+        # Un único buffer int16 reutilizado entre bloques
+        if len(self._buffer) < len(block):
+            self._buffer = np.empty(len(block), dtype=np.int16)
+        return to_pcm16(block, out=self._buffer[:len(block)])
+
+
+class Pcm8(Encoder):
+    """PCM lineal de 8 bits sin signo (silencio en 128)."""
+
+    bits_per_sample = 8
+    block_align = 1
+
+    def _encode(self, block):
+        np.multiply(block, 127, out=block)
+        np.rint(block, out=block)
+        block += 128
+        return block.astype(np.uint8)
+
+
+class MuLaw(Encoder):
+    """µ-law G.711 de 8 bits, a partir de PCM de 16 bits."""
+
+    format_tag = WAVE_FORMAT_MULAW
+    bits_per_sample = 8
+    block_align = 1
+    extra = b''
+
+    def _encode(self, block):
+        return mulaw_encode(to_pcm16(block))
+
+
+def mulaw_encode(pcm):
+    """Codifica PCM de 16 bits en µ-law (mismo resultado que G.711 de Sun)."""
+    value = pcm.astype(np.int32) >> 2
+    mask = np.where(value < 0, 0x7F, 0xFF)
+    magnitude = np.minimum(np.abs(value), 8159) + 33
+    # Segmento: posición del bit más alto por encima del bit 5
+    segment = np.minimum(np.frexp(magnitude)[1] - 6, 7)
+    mantissa = (magnitude >> (segment + 1)) & 0x0F
+    # Por encima del último segmento se satura al valor máximo
+    mantissa[magnitude > 0x1FFF] = 0x0F
+    return (((segment << 4) | mantissa) ^ mask).astype(np.uint8)
+
+
+class ImaAdpcm(Encoder):
+    """IMA ADPCM de 4 bits por muestra en bloques independientes.
+
+    Cada bloque empieza con la primera muestra en claro y su propio índice
+    de paso, así que todos los bloques se codifican a la vez: el bucle
+    recorre las posiciones dentro del bloque, no la señal entera.
+    """
+
+    format_tag = WAVE_FORMAT_IMA_ADPCM
+    bits_per_sample = 4
+
+    def __init__(self, sample_rate):
+        super().__init__(sample_rate)
+        # Tamaños de bloque habituales: 256 bytes a 11 kHz, 1024 a 44,1 kHz
+        self.block_align = 256 * max(1, sample_rate // 11025)
+        self.samples_per_block = (self.block_align - 4) * 2 + 1
+        self.extra = np.array([self.samples_per_block], dtype='<u2').tobytes()
+        self._pending = np.empty(0, dtype=np.int16)
+
+    def _encode(self, block):
+        self._pending = np.concatenate([self._pending, to_pcm16(block)])
+        if len(self._pending) < IMA_BATCH_SAMPLES:
+            return b''
+        complete = len(self._pending) - len(self._pending) % self.samples_per_block
+        pcm, self._pending = self._pending[:complete], self._pending[complete:]
+        return self._encode_blocks(pcm)
+
+    def flush(self):
+        if len(self._pending) == 0:
+            return b''
+        # El último bloque se completa repitiendo la última muestra;
+        # el chunk `fact` indica cuántas son reales
+        padding = -len(self._pending) % self.samples_per_block
+        pcm = np.pad(self._pending, (0, padding), mode='edge')
+        self._pending = self._pending[:0]
+        return self._encode_blocks(pcm)
+
+    def _encode_blocks(self, pcm):
+        # Una fila por posición dentro del bloque, contigua en memoria
+        samples = np.ascontiguousarray(pcm.reshape(-1, self.samples_per_block).T, dtype=np.int32)
+
+        predictor = samples[0].copy()
+        # Índice inicial según el primer salto de cada bloque
+        index = np.clip(np.searchsorted(IMA_STEP_TABLE, np.abs(samples[1] - predictor)) - 2, 0, 88)
+        header_index = index.copy()
+
+        nibbles = np.empty((self.samples_per_block - 1, samples.shape[1]), dtype=np.uint8)
+        for position in range(1, self.samples_per_block):
+            diff = samples[position] - predictor
+            sign = diff >> 31  # 0 si es positiva, -1 si es negativa
+            # Código de 3 bits: cuántos cuartos de paso caben en la diferencia
+            quarters = np.abs(diff).astype(np.float32)
+            quarters *= IMA_QUARTER_RECIPROCAL.take(index)
+            code = quarters.astype(np.int32)
+            np.minimum(code, 7, out=code)
+            cell = index << 3
+            cell += code
+            # Incremento que reconstruirá el decodificador, con el signo de la diferencia
+            delta = IMA_DELTA.take(cell)
+            delta ^= sign
+            delta -= sign
+            predictor += delta
+            np.minimum(predictor, 32767, out=predictor)
+            np.maximum(predictor, -32768, out=predictor)
+            index = IMA_NEXT_INDEX.take(cell)
+            nibbles[position - 1] = code | (sign & 8)
+
+        header = np.zeros((samples.shape[1], 4), dtype=np.uint8)
+        header[:, :2] = samples[0].astype('<i2').view(np.uint8).reshape(-1, 2)
+        header[:, 2] = header_index
+        # Dos muestras por byte, la primera en el nibble bajo
+        data = (nibbles[0::2] | (nibbles[1::2] << 4)).T
+        return np.hstack([header, data])
+
+
+ENCODINGS = {
+    'pcm16': Pcm16,
+    'pcm8': Pcm8,
+    'mulaw': MuLaw,
+    'ima_adpcm': ImaAdpcm,
+}
+
+
+def make_encoder(encoding, sample_rate):
+    """Crea el codificador indicado por su nombre."""
+    if encoding not in ENCODINGS:
+        raise ValueError(f"Unsupported encoding: {encoding}")
+    return ENCODINGS[encoding](sample_rate)
@@ -0,0 +1,175 @@
+import os
+import functools
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+class EnvelopeBank:
+    """Envolventes calculadas una sola vez y compartidas entre notas y variantes.
+
+    Una forma de envolvente es una función `shape(samples, sample_rate)` que
+    describe sus tramos como tuplas `(builder, *args)`. Cada tramo se
+    construye con `builder(*args)` y se guarda aparte, así que envolventes
+    que solo difieren en la duración del sustain comparten el resto de
+    tramos. La envolvente completa se guarda por (forma, muestras,
+    sample_rate). Los arrays son de solo lectura, en float64 como las
+    envolventes originales, y se aplican en el sitio con `apply`.
+    """
+
+    def __init__(self, maxsize=256, max_bytes=16 * 1024 * 1024):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self._arrays = OrderedDict()
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, key, build):
+        array = self._arrays.get(key)
+        if array is not None:
+            self._arrays.move_to_end(key)
+            self.hits += 1
+            return array
+
+        self.misses += 1
+        array = build()
+        array.setflags(write=False)
+        self._arrays[key] = array
+        self.nbytes += array.nbytes
+        while len(self._arrays) > self.maxsize or (self.nbytes > self.max_bytes and len(self._arrays) > 1):
+            _, evicted = self._arrays.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+        return array
+
+    def segment(self, builder, *args):
+        """Tramo `builder(*args)`, calculado la primera vez que se pide."""
+        with self._lock:
+            return self._get(('segment', builder, *args), lambda: builder(*args))
+
+    def get(self, shape, samples, sample_rate=44100):
+        """Envolvente de `samples` muestras con la forma `shape`."""
+        def build():
+            segments = [self._get(('segment', *spec), functools.partial(*spec)) for spec in shape(samples, sample_rate)]
+            return segments[0] if len(segments) == 1 else np.concatenate(segments)
+
+        with self._lock:
+            return self._get(('envelope', shape, samples, sample_rate), build)
+
+    def apply(self, wave, shape, sample_rate=44100):
+        """Multiplica `wave` en el sitio por su envolvente y la devuelve."""
+        wave *= self.get(shape, wave.shape[-1], sample_rate)
+        return wave
+
+    def stats(self):
+        """Contadores de uso del banco."""
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._arrays), 'bytes': self.nbytes}
+
+    def clear(self):
+        """Vacía el banco y reinicia los contadores."""
+        with self._lock:
+            self._arrays.clear()
+            self.nbytes = 0
+            self.hits = self.misses = 0
+
+
+envelope_bank = EnvelopeBank(maxsize=int(os.environ.get('ENVELOPE_BANK_SIZE', 256)))
+
+
+def ramp(start, stop, samples):
+    """Tramo lineal de `start` a `stop`."""
+    return np.linspace(start, stop, samples)
+
+
+def constant(level, samples):
+    """Tramo constante (sustain)."""
+    return np.full(samples, level, dtype=np.float64)
+
+
+def exponential_attack(samples):
+    """Attack: curva exponencial de 0 a 1."""
+    return 1 - np.exp(-5 * np.linspace(0, 1, samples))
+
+
+def exponential_decay(sustain_level, samples):
+    """Decay: curva exponencial de 1 hasta el nivel de sustain."""
+    return np.exp(-3 * np.linspace(0, 1, samples)) * (1 - sustain_level) + sustain_level
+
+
+def exponential_release(sustain_level, samples):
+    """Release: fade out exponencial desde el nivel de sustain."""
+    return np.exp(-5 * np.linspace(0, 1, samples)) * sustain_level
+
+
+def create_instrument_envelope(instrument_type, duration, sample_rate=44100):
+    """Crea diferentes tipos de envolventes según el instrumento"""
+    total_samples = int(duration * sample_rate)
+
+    if instrument_type == "piano":
+        # 20% del total para todas las fases excepto sustain
+        phase_samples = int(total_samples * 0.2)
+        return {
+            'attack': int(phase_samples * 0.1),    # 2% del total
+            'decay': int(phase_samples * 0.3),     # 6% del total
+            'sustain_level': 0.7,
+            'release': int(phase_samples * 0.6)    # 12% del total
+        }
+
+    elif instrument_type == "strings":
+        # 30% del total para todas las fases excepto sustain
+        phase_samples = int(total_samples * 0.3)
+        return {
+            'attack': int(phase_samples * 0.3),    # 9% del total
+            'decay': int(phase_samples * 0.2),     # 6% del total
+            'sustain_level': 0.8,
+            'release': int(phase_samples * 0.5)    # 15% del total
+        }
+
+    elif instrument_type == "organ":
+        # 30% del total para todas las fases excepto sustain
+        phase_samples = int(total_samples * 0.3)
+        return {
+            'attack': int(phase_samples * 0.3),    # 9% del total
+            'decay': int(phase_samples * 0.2),     # 6% del total
+            'sustain_level': 0.8,
+            'release': int(phase_samples * 0.5)    # 15% del total
+        }
+
+    elif instrument_type == "pluck":
+        # 40% del total para todas las fases excepto sustain
+        phase_samples = int(total_samples * 0.4)
+        return {
+            'attack': int(phase_samples * 0.1),    # 4% del total
+            'decay': int(phase_samples * 0.6),     # 24% del total
+            'sustain_level': 0.0,
+            'release': int(phase_samples * 0.3)    # 12% del total
+        }
+
+
+def instrument_shape(instrument_type, samples, sample_rate):
+    """Tramos de la envolvente exponencial de un instrumento (ver `create_instrument_envelope`)."""
+    env_params = create_instrument_envelope(instrument_type, samples / sample_rate, sample_rate)
+    sustain_level = env_params['sustain_level']
+    sustain = samples - env_params['attack'] - env_params['decay'] - env_params['release']
+    return [
+        (exponential_attack, env_params['attack']),
+        (exponential_decay, sustain_level, env_params['decay']),
+        (constant, sustain_level, sustain),
+        (exponential_release, sustain_level, env_params['release']),
+    ]
+
+
+# Una forma por instrumento (objetos fijos: son parte de la clave del banco)
+INSTRUMENT_SHAPES = {
+    instrument_type: functools.partial(instrument_shape, instrument_type)
+    for instrument_type in ('piano', 'strings', 'organ', 'pluck')
+}
+
+
+def apply_envelope(wave, envelope_type="piano", sample_rate=44100):
+    """Aplica diferentes tipos de envolventes al sonido"""
+    if envelope_type not in INSTRUMENT_SHAPES:
+        raise ValueError(f"Unknown instrument: {envelope_type}")
+    return envelope_bank.apply(wave, INSTRUMENT_SHAPES[envelope_type], sample_rate)
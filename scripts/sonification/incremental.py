@@ -0,0 +1,132 @@
+import sys
+import inspect
+
+import numpy as np
+
+from sonification.mappers import char_codes
+from sonification.ngrams import Ngrams
+from sonification.profiling import stage_timings
+from sonification.wavfile import write_wav_pipelines
+
+# Caracteres por trozo de entrada: acota la memoria del mapeo y de cada pipeline
+INPUT_CHUNK_CHARS = 1 << 16
+
+
+def read_chunks(source, chunk_chars=INPUT_CHUNK_CHARS):
+    """Lee el texto por trozos de un fichero, de un objeto fichero o de stdin (`-`).
+
+    Cada trozo se entrega en cuanto se ha leído, así que con una tubería
+    la síntesis avanza mientras el HTML sigue llegando. Siempre entrega al
+    menos un trozo (vacío si no hay texto).
+    """
+    if source == '-':
+        file, owns_file = sys.stdin, False
+    elif hasattr(source, 'read'):
+        file, owns_file = source, False
+    else:
+        file, owns_file = open(source, 'r'), True
+
+    try:
+        empty = True
+        while True:
+            with stage_timings.measure('read'):
+                chunk = file.read(chunk_chars)
+            if not chunk:
+                break
+            empty = False
+            yield chunk
+        if empty:
+            yield ''
+    finally:
+        if owns_file:
+            file.close()
+
+
+def stream_ngrams(chunks, n):
+    """Como `create_ngram`, pero sobre el texto por trozos: un lote `Ngrams` por trozo.
+
+    Los últimos n-1 caracteres de cada trozo se guardan para los n-gramas
+    que cruzan la frontera; el grupo final con los caracteres que sobran
+    se emite al acabar la entrada. El resultado concatenado es el mismo
+    que el de `create_ngram` sobre el texto entero.
+    """
+    carry = np.zeros(0, dtype=np.uint32)
+    total = 0
+    for chunk in chunks:
+        new_codes = char_codes(chunk)
+        total += len(new_codes)
+        codes = np.concatenate((carry, new_codes))
+        count = max(0, len(codes) - (n - 1))
+        yield Ngrams(codes, np.arange(count, dtype=np.int64), np.full(count, n, dtype=np.int64))
+        carry = codes[count:]
+
+    if total % n != 0:
+        # `carry` cubre las posiciones [total - len(carry), total) del texto
+        start = total - total % n - (total - len(carry))
+        yield Ngrams(carry, np.array([start], dtype=np.int64), np.array([total % n], dtype=np.int64))
+
+
+def stream_variable_ngrams(chunks, pattern):
+    """Como `create_variable_ngrams`, pero sobre el texto por trozos.
+
+    Solo se emiten los grupos completos de cada trozo; el grupo a medias
+    pasa al siguiente y, al acabar la entrada, se emite recortado.
+    """
+    if min(pattern) < 1:
+        raise ValueError(f"N-gram sizes must be positive: {pattern}")
+    pattern = np.asarray(pattern, dtype=np.int64)
+
+    carry = np.zeros(0, dtype=np.uint32)
+    phase = 0
+    for chunk in chunks:
+        codes = np.concatenate((carry, char_codes(chunk)))
+        # Patrón empezando por el tamaño que le toca al siguiente grupo
+        cycles = len(codes) // pattern.sum() + 1
+        sizes = np.tile(np.roll(pattern, -phase), cycles)
+        ends = np.cumsum(sizes)
+        complete = ends <= len(codes)
+        sizes, ends = sizes[complete], ends[complete]
+
+        yield Ngrams(codes, ends - sizes, sizes)
+        phase = (phase + len(sizes)) % len(pattern)
+        carry = codes[ends[-1] if len(ends) else 0:]
+
+    if len(carry):
+        yield Ngrams(carry, np.zeros(1, dtype=np.int64), np.array([len(carry)], dtype=np.int64))
+
+
+def whole_text(build):
+    """Adapta el `build` de una variante sin entrada incremental: lee todo el texto y construye."""
+    # El tiempo de mapeo lo mide quien consume las pipelines
+    build = inspect.unwrap(build)
+
+    def build_incremental(chunks, *args, **options):
+        yield build(''.join(chunks), *args, **options)
+    return build_incremental
+
+
+def render_incremental(variant, chunks, output_file, *args, encoding='pcm16', stream=None, workers=None,
+                       budget=None, **options):
+    """Sonifica el texto por trozos con la variante `variant` y lo guarda como WAV.
+
+    Las variantes que lo admiten exponen `build_incremental(chunks, ...)`,
+    que entrega una pipeline por trozo a medida que llega el texto; cada
+    una se renderiza y escribe por bloques antes de leer el siguiente
+    trozo. Las demás leen el texto entero y construyen su pipeline con
+    `build`. El render es siempre por bloques y en un solo proceso, así
+    que `stream` y `workers` se ignoran. Con `budget` (un
+    `sonification.cost.RunningBudget`) cada pipeline se comprueba antes de
+    renderizarla.
+    """
+    build = getattr(variant, 'build_incremental', None) or whole_text(variant.build)
+    pipelines = build(chunks, *args, **options)
+
+    def timed_pipelines():
+        while True:
+            with stage_timings.measure('map'):
+                pipeline = next(pipelines, None)
+            if pipeline is None:
+                return
+            yield pipeline if budget is None else budget.check(pipeline)
+
+    write_wav_pipelines(output_file, timed_pipelines(), encoding=encoding)
@@ -0,0 +1,59 @@
+import numpy as np
+
+# Escala cromática de la cuarta octava (Hz, redondeadas a centésimas)
+OCTAVE_4 = {
+    'C4': 261.63, 'C#4': 277.18, 'D4': 293.66, 'D#4': 311.13,
+    'E4': 329.63, 'F4': 349.23, 'F#4': 369.99, 'G4': 392.00,
+    'G#4': 415.30, 'A4': 440.00, 'A#4': 466.16, 'B4': 493.88
+}
+
+# La misma escala con algunas notas de la quinta octava
+OCTAVE_4_5 = {**OCTAVE_4, 'C5': 523.25, 'D5': 587.33, 'E5': 659.25}
+
+NOTE_NAMES = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
+
+
+def musical_frequencies(octaves=(3, 4, 5)):
+    """Frecuencias temperadas de las notas de `octaves` (la nota C de la octava 4 es 440 Hz)."""
+    frequencies = {}
+    for octave in octaves:
+        for index, note in enumerate(NOTE_NAMES):
+            frequencies[f"{note}{octave}"] = 440.0 * (2 ** ((index + (octave - 4) * 12) / 12.0))
+    return frequencies
+
+
+def char_notes(text, notes):
+    """Asigna una nota a cada carácter distinto, en orden de code point y repitiendo `notes`."""
+    return {char: notes[i % len(notes)] for i, char in enumerate(sorted(set(text)))}
+
+
+def char_codes(text):
+    """Convierte el texto en un array de code points (enteros sin signo de 32 bits)."""
+    return np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype='<u4').astype(np.uint32)
+
+
+def char_frequencies(text, min_freq, max_freq):
+    """Versión vectorizada de `text_to_frequencies`.
+
+    Cada carácter distinto (ordenado por code point, igual que
+    `sorted(set(text))`) se reparte linealmente entre min_freq y max_freq.
+    """
+    unique_codes, inverse = np.unique(char_codes(text), return_inverse=True)
+    char_freqs = np.interp(np.arange(len(unique_codes)), [0, len(unique_codes)], [min_freq, max_freq])
+    return char_freqs[inverse]
+
+
+# Tabla fija de code points para la entrada incremental: el ASCII ocupa sus
+# 128 posiciones y el resto de caracteres se reparte en otras 128
+FIXED_TABLE_SIZE = 256
+
+
+def fixed_char_frequencies(text, min_freq, max_freq):
+    """Como `char_frequencies`, pero con la tabla fija de code points.
+
+    La frecuencia de un carácter no depende del resto del texto, así que
+    se puede calcular trozo a trozo.
+    """
+    codes = char_codes(text)
+    positions = np.where(codes < 128, codes, 128 + codes % 128)
+    return np.interp(positions, [0, FIXED_TABLE_SIZE], [min_freq, max_freq])
@@ -0,0 +1,106 @@
+import functools
+
+import numpy as np
+
+from sonification.randomness import FNV_OFFSET, FNV_PRIME
+
+VOWELS = 'aeiou'
+
+# Las clases de carácter se tabulan para el plano multilingüe básico; el
+# resto de puntos de código (poco frecuentes) se clasifican uno a uno
+CLASS_TABLE_SIZE = 1 << 16
+
+
+@functools.lru_cache(maxsize=None)
+def class_table(classify):
+    """Tabla `classify(chr(code))` (entero de 8 bits) para los primeros puntos de código."""
+    return np.fromiter((classify(chr(code)) for code in range(CLASS_TABLE_SIZE)),
+                       dtype=np.uint8, count=CLASS_TABLE_SIZE)
+
+
+def char_classes(codes, classify):
+    """Clase de cada punto de código según `classify(char)`, por tabla de búsqueda."""
+    classes = class_table(classify)[np.minimum(codes, CLASS_TABLE_SIZE - 1)]
+    outside = np.flatnonzero(codes >= CLASS_TABLE_SIZE)
+    if len(outside):
+        distinct, inverse = np.unique(codes[outside], return_inverse=True)
+        distinct_classes = np.array([classify(chr(code)) for code in distinct.tolist()], dtype=np.uint8)
+        classes[outside] = distinct_classes[inverse.reshape(-1)]
+    return classes
+
+
+def count_vowels(char):
+    """Vocales de `char.lower()`: algunos caracteres, como 'İ', dan más de uno."""
+    return sum(1 for c in char.lower() if c in VOWELS)
+
+
+def vowel_counts(codes):
+    """Vocales de cada punto de código (ver `count_vowels`)."""
+    return char_classes(codes, count_vowels)
+
+
+def interp_range(values, upper, low, high):
+    """`np.interp(value, [0, upper], [low, high])` con un `upper` distinto por elemento.
+
+    Reproduce la misma aritmética que `np.interp`, así que el resultado es
+    idéntico al de llamarlo elemento a elemento.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    upper = np.broadcast_to(np.asarray(upper, dtype=np.float64), values.shape)
+    result = (high - low) / upper * values + low
+    result[values <= 0] = low
+    result[values >= upper] = high
+    return result
+
+
+class Ngrams:
+    """Lote de n-gramas como rangos sobre el array de puntos de código del texto.
+
+    El n-grama `i` son los `lengths[i]` puntos de código de `codes` que
+    empiezan en `starts[i]`; los rangos pueden solaparse. Todas las medidas
+    se calculan para el lote entero con NumPy, sin bucles por n-grama.
+    """
+
+    def __init__(self, codes, starts, lengths):
+        self.codes = codes
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.lengths = np.asarray(lengths, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def _flat(self):
+        """Índice de n-grama y posición en `codes` de cada uno de sus caracteres."""
+        ids = np.repeat(np.arange(len(self)), self.lengths)
+        first = np.zeros(len(self), dtype=np.int64)
+        np.cumsum(self.lengths[:-1], out=first[1:])
+        positions = np.arange(len(ids)) - first[ids] + self.starts[ids]
+        return ids, positions
+
+    def sums(self, values):
+        """Suma de `values` (uno por punto de código) en cada n-grama, por sumas prefijas."""
+        prefix = np.zeros(len(values) + 1, dtype=np.int64)
+        np.cumsum(values, out=prefix[1:])
+        return prefix[self.starts + self.lengths] - prefix[self.starts]
+
+    def hashes(self):
+        """Hash FNV-1a de 32 bits de cada n-grama; a diferencia de `hash()`, no depende de PYTHONHASHSEED."""
+        values = np.full(len(self), FNV_OFFSET, dtype=np.uint32)
+        # El hash es secuencial dentro de cada n-grama: se avanza una posición
+        # cada vez en todos los n-gramas que todavía tienen caracteres
+        for position in range(int(self.lengths.max(initial=0))):
+            active = np.flatnonzero(self.lengths > position)
+            mixed = values[active] ^ self.codes[self.starts[active] + position]
+            values[active] = mixed * np.uint32(FNV_PRIME)
+        return values
+
+    def unique_counts(self):
+        """Número de caracteres distintos de cada n-grama."""
+        ids, positions = self._flat()
+        codes = self.codes[positions]
+        order = np.lexsort((codes, ids))
+        ids, codes = ids[order], codes[order]
+        # Un carácter es nuevo si es el primero del n-grama o distinto del anterior
+        new = np.ones(len(ids), dtype=bool)
+        new[1:] = (ids[1:] != ids[:-1]) | (codes[1:] != codes[:-1])
+        return np.bincount(ids[new], minlength=len(self))
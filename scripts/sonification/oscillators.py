@@ -0,0 +1,129 @@
+import math
+from fractions import Fraction
+
+import numpy as np
+
+from sonification.wavetable import harmonic_wavetable
+
+# Armónico más alto que se obtiene por recurrencia; con más, cada parcial lleva su propio seno
+MAX_RECURRENCE_HARMONIC = 16
+
+# Muestras por bloque de fase (ver `additive_tone`)
+PHASE_BLOCK = 128
+
+# Elementos por trozo de síntesis: los buffers de la recurrencia caben en la caché
+ADDITIVE_CHUNK = 1 << 14
+
+
+def sine(omega, t):
+    """sin(omega * t) en un único array nuevo (sin temporales intermedios)."""
+    wave = np.multiply(omega, t)
+    return np.sin(wave, out=wave)
+
+
+def harmonic_numbers(ratios, max_harmonic=MAX_RECURRENCE_HARMONIC):
+    """Divisor común de las razones y número de armónico de cada una respecto a frequency / divisor.
+
+    Devuelve None si las razones no son múltiplos enteros (hasta
+    `max_harmonic`) de una fracción común de la fundamental.
+    """
+    fractions = [Fraction(ratio).limit_denominator(max_harmonic) for ratio in ratios]
+    if any(fraction != ratio for fraction, ratio in zip(fractions, ratios)):
+        return None
+    divisor = 1
+    for fraction in fractions:
+        divisor = divisor * fraction.denominator // math.gcd(divisor, fraction.denominator)
+    harmonics = [int(fraction * divisor) for fraction in fractions]
+    if min(harmonics) < 1 or max(harmonics) > max_harmonic:
+        return None
+    return divisor, harmonics
+
+
+def additive_tone(frequency, t, ratios, amplitudes):
+    """Suma de `amplitude * sin(2π * ratio * frequency * t)` para cada parcial.
+
+    `t` es una rejilla uniforme que empieza en 0, como la de
+    `np.linspace(0, duration, samples, endpoint=False)`; `frequency` admite
+    broadcasting con ella. Si las razones son armónicos de una fracción
+    común de la fundamental (las del piano lo son de frequency / 4), solo
+    se calculan senos y cosenos de esa fracción, y de forma dispersa: la
+    fase se separa en el inicio de cada bloque de `PHASE_BLOCK` muestras y
+    el desplazamiento dentro del bloque, y se recompone con la fórmula del
+    seno de la suma. Los armónicos salen de la recurrencia de Chebyshev
+    sin((k + 1)x) = 2 cos(x) sin(kx) - sin((k - 1)x). Si no, todos los
+    senos se calculan en una sola operación matricial.
+    """
+    series = harmonic_numbers(ratios)
+    if series is None:
+        phases = np.multiply.outer(2 * np.pi * np.asarray(ratios), np.multiply(frequency, t))
+        np.sin(phases, out=phases)
+        return np.tensordot(np.asarray(amplitudes, dtype=phases.dtype), phases, axes=1)
+
+    divisor, harmonics = series
+    weights = np.zeros(max(harmonics) + 1)
+    np.add.at(weights, harmonics, amplitudes)
+
+    dtype = np.result_type(frequency, t)
+    omega = 2 * np.pi * np.asarray(frequency, dtype=np.float64) / divisor
+    samples = t.shape[-1]
+    # Seno y coseno del desplazamiento dentro del bloque y del inicio de cada bloque
+    offset = omega * t[..., :PHASE_BLOCK]
+    offset_sin, offset_cos = np.sin(offset).astype(dtype)[..., None, :], np.cos(offset).astype(dtype)[..., None, :]
+    start = omega * t[..., ::PHASE_BLOCK]
+    start_sin, start_cos = np.sin(start).astype(dtype)[..., None], np.cos(start).astype(dtype)[..., None]
+
+    wave = np.empty(np.broadcast_shapes(offset.shape[:-1], t.shape[:-1]) + (samples,), dtype=dtype)
+    if wave.size == 0:
+        # Sin notas o sin muestras (texto vacío): no hay nada que sintetizar
+        return wave
+    rows = wave.size // samples
+    width = max(1, ADDITIVE_CHUNK // max(rows, 1) // PHASE_BLOCK) * PHASE_BLOCK
+    for begin in range(0, samples, width):
+        end = min(begin + width, samples)
+        blocks = slice(begin // PHASE_BLOCK, -(-end // PHASE_BLOCK))
+        shape = wave.shape[:-1] + (-1,)
+        current = (start_sin[..., blocks, :] * offset_cos).reshape(shape)[..., :end - begin]
+        current += (start_cos[..., blocks, :] * offset_sin).reshape(shape)[..., :end - begin]
+        two_cos = (start_cos[..., blocks, :] * offset_cos).reshape(shape)[..., :end - begin]
+        two_cos -= (start_sin[..., blocks, :] * offset_sin).reshape(shape)[..., :end - begin]
+        two_cos *= 2
+
+        out = wave[..., begin:end]
+        np.multiply(current, weights[1], out=out)
+        previous = np.zeros_like(current)
+        partial = np.empty_like(current)
+        for harmonic in range(2, len(weights)):
+            np.multiply(two_cos, current, out=partial)
+            np.subtract(partial, previous, out=previous)
+            current, previous = previous, current
+            if weights[harmonic]:
+                np.multiply(current, weights[harmonic], out=partial)
+                out += partial
+    return wave
+
+
+def harmonic_tone(frequency, t, amplitudes, oscillator='exact', sample_rate=None):
+    """Tono de `frequency` más sus armónicos 2, 3, ... con las amplitudes dadas.
+
+    Con `oscillator='wavetable'` todo el timbre se lee de una sola tabla
+    (ver `sonification.wavetable`), limitada en banda a `sample_rate`.
+    """
+    if oscillator == 'wavetable':
+        partials = ((1, 1.0),) + tuple(zip(range(2, 2 + len(amplitudes)), amplitudes))
+        return harmonic_wavetable(partials)(frequency, t, sample_rate)
+    return additive_tone(frequency, t, range(1, 2 + len(amplitudes)), (1.0, *amplitudes))
+
+
+# Resonancias de un piano: octava superior e inferior, quinta y tercera mayor
+PIANO_RATIOS = (2, 0.5, 1.5, 1.25)
+
+# Las mismas resonancias como armónicos enteros de frequency / 4 (el tono es el 4)
+PIANO_HARMONICS = tuple(int(ratio * 4) for ratio in PIANO_RATIOS)
+
+
+def piano_tone(frequency, t, amplitudes, oscillator='exact', sample_rate=None):
+    """Tono de `frequency` más sus resonancias `PIANO_RATIOS` con las amplitudes dadas."""
+    if oscillator == 'wavetable':
+        partials = ((4, 1.0),) + tuple(zip(PIANO_HARMONICS, amplitudes))
+        return harmonic_wavetable(partials)(frequency / 4, t, sample_rate)
+    return additive_tone(frequency, t, (1, *PIANO_RATIOS), (1.0, *amplitudes))
@@ -0,0 +1,281 @@
+import os
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from sonification.profiling import stage_timings
+from sonification.timeline import apply_crossfades
+
+# Tamaño de bloque del modo streaming (~6 s a 44,1 kHz)
+STREAM_BLOCK_SAMPLES = 1 << 18
+
+# Precisiones de cálculo admitidas
+DTYPES = {'float64': np.float64, 'float32': np.float32}
+
+
+def resolve_dtype(dtype):
+    """Convierte el nombre de la precisión ('float64'/'float32') en un dtype de NumPy."""
+    if isinstance(dtype, str):
+        if dtype not in DTYPES:
+            raise ValueError(f"Unsupported dtype: {dtype}")
+        return DTYPES[dtype]
+    return dtype
+
+
+def resolve_sample_rate(sample_rate):
+    """Valida la frecuencia de muestreo (admite el texto de la línea de comandos)."""
+    sample_rate = int(sample_rate)
+    if sample_rate <= 0:
+        raise ValueError(f"Unsupported sample rate: {sample_rate}")
+    return sample_rate
+
+
+def resolve_workers(workers):
+    """Número de procesos de render ('auto' = uno por CPU; admite el texto de la línea de comandos)."""
+    if workers == 'auto':
+        return os.cpu_count() or 1
+    workers = int(workers)
+    if workers < 1:
+        raise ValueError(f"Unsupported worker count: {workers}")
+    return workers
+
+
+def peak_amplitude(audio):
+    """Pico absoluto de la señal, sin crear el array temporal de np.abs."""
+    if len(audio) == 0:
+        return 0.0
+    return max(audio.max(), -audio.min())
+
+
+class Stage:
+    """Etapa de procesado sobre bloques de audio.
+
+    `lookback`/`lookahead` indican cuántas muestras de contexto necesita la
+    etapa antes y después del bloque para que el resultado sea idéntico al
+    de procesar la señal completa. Las etapas pueden modificar el bloque
+    recibido en el sitio y deben conservar su dtype. `sequential` marca las
+    etapas con estado que necesitan recibir los bloques en orden.
+    """
+
+    lookback = 0
+    lookahead = 0
+    sequential = False
+
+    def process(self, block, start):
+        """Procesa el bloque que empieza en la muestra `start`."""
+        return block
+
+
+class Normalize(Stage):
+    """Divide la señal por su pico absoluto (requiere conocer el pico global)."""
+
+    def __init__(self):
+        self.peak = None
+
+    def process(self, block, start):
+        # Una señal en silencio se deja tal cual
+        if not self.peak:
+            return block
+        return np.divide(block, self.peak, out=block)
+
+
+class Crossfades(Stage):
+    """Fundidos de salida/entrada en las fronteras entre notas."""
+
+    def __init__(self, offsets, lengths, fade_samples):
+        self.offsets = offsets
+        self.lengths = lengths
+        self.fade_samples = fade_samples
+
+    def process(self, block, start):
+        return apply_crossfades(block, self.offsets, self.lengths, self.fade_samples, start)
+
+
+class Pipeline:
+    """Fuente de notas seguida de una cadena de etapas de procesado.
+
+    La fuente expone `total_samples` y `render_block(start, stop)`. La señal
+    puede renderizarse completa (`render`) o por bloques (`blocks`) con
+    memoria acotada; en ese caso cada `Normalize` necesita una pasada previa
+    para conocer el pico global.
+    """
+
+    def __init__(self, source, stages=(), sample_rate=44100):
+        self.source = source
+        self.stages = list(stages)
+        self.sample_rate = sample_rate
+        self.total_samples = source.total_samples
+
+    def render(self):
+        """Renderiza la señal completa en un único buffer."""
+        with stage_timings.measure('synthesize'):
+            audio = self.source.render_block(0, self.total_samples)
+        for stage in self.stages:
+            if isinstance(stage, Normalize):
+                with stage_timings.measure('normalize'):
+                    stage.peak = peak_amplitude(audio)
+            audio = self._process(stage, audio, 0)
+        return audio
+
+    @staticmethod
+    def _process(stage, block, start):
+        with stage_timings.measure('normalize' if isinstance(stage, Normalize) else 'effects'):
+            return stage.process(block, start)
+
+    def _render_range(self, depth, start, stop):
+        """Salida de las primeras `depth` etapas para las muestras [start, stop)."""
+        if depth == 0:
+            with stage_timings.measure('synthesize'):
+                return self.source.render_block(start, stop)
+
+        stage = self.stages[depth - 1]
+        context_start = max(0, start - stage.lookback)
+        context_stop = min(self.total_samples, stop + stage.lookahead)
+        block = self._render_range(depth - 1, context_start, context_stop)
+        block = self._process(stage, block, context_start)
+        return block[start - context_start:stop - context_start]
+
+    def _range_peak(self, depth, start, stop):
+        block = self._render_range(depth, start, stop)
+        with stage_timings.measure('normalize'):
+            return peak_amplitude(block)
+
+    def _ranges(self, block_samples):
+        for start in range(0, self.total_samples, block_samples):
+            yield start, min(self.total_samples, start + block_samples)
+
+    def blocks(self, block_samples=STREAM_BLOCK_SAMPLES):
+        """Genera la señal procesada bloque a bloque."""
+        for depth, stage in enumerate(self.stages):
+            if isinstance(stage, Normalize):
+                stage.peak = max(
+                    (self._range_peak(depth, start, stop) for start, stop in self._ranges(block_samples)),
+                    default=0.0,
+                )
+
+        for start, stop in self._ranges(block_samples):
+            yield self._render_range(len(self.stages), start, stop)
+
+    def _parallel(self, workers):
+        """Si el render puede repartirse en `workers` procesos (con `fork` y sin etapas secuenciales)."""
+        return (workers > 1 and not any(stage.sequential for stage in self.stages)
+                and 'fork' in multiprocessing.get_all_start_methods())
+
+    def _parallel_peaks(self, workers, ranges):
+        """Pasada previa de `parallel_blocks`/`render_into`: fija el pico de cada `Normalize`."""
+        for depth, stage in enumerate(self.stages):
+            if isinstance(stage, Normalize):
+                # Los procesos se crean después de fijar cada pico para heredarlo
+                with _process_pool(workers) as executor:
+                    peaks = list(executor.map(_segment_peak, [depth] * len(ranges), *zip(*ranges)))
+                for _, totals in peaks:
+                    stage_timings.merge(totals)
+                stage.peak = max((peak for peak, _ in peaks), default=0.0)
+
+    def parallel_blocks(self, workers, block_samples=STREAM_BLOCK_SAMPLES):
+        """Como `blocks`, pero renderiza los segmentos en `workers` procesos.
+
+        Cada segmento se calcula con el mismo contexto que en `blocks`, así
+        que la salida es idéntica a la del render en serie. Los procesos
+        heredan la pipeline por `fork`; donde no existe, o si alguna etapa
+        es secuencial, se renderiza en serie.
+        """
+        if not self._parallel(workers):
+            yield from self.blocks(block_samples)
+            return
+
+        global _parallel_pipeline
+        ranges = list(self._ranges(block_samples))
+        _parallel_pipeline = self
+        try:
+            self._parallel_peaks(workers, ranges)
+
+            with _process_pool(workers) as executor:
+                # Como mucho dos segmentos por proceso en vuelo: memoria acotada
+                pending = deque()
+                for start, stop in ranges:
+                    pending.append(executor.submit(_segment, start, stop))
+                    if len(pending) >= 2 * workers:
+                        yield self._collect(pending.popleft())
+                while pending:
+                    yield self._collect(pending.popleft())
+        finally:
+            _parallel_pipeline = None
+
+    @staticmethod
+    def _collect(future):
+        # Los procesos devuelven con cada segmento los tiempos de sus fases
+        block, totals = future.result()
+        stage_timings.merge(totals)
+        return block
+
+    def render_into(self, out, workers=1, block_samples=STREAM_BLOCK_SAMPLES):
+        """Renderiza la señal como PCM de 16 bits directamente en `out`.
+
+        `out` es un array int16 de `total_samples` muestras, o un objeto que
+        devuelve uno con `out[start:stop]` (como `wavfile.MappedSamples`,
+        que mapea el fichero de salida). En paralelo cada proceso escribe
+        sus segmentos en `out` (heredado por `fork`), sin devolver el audio
+        al proceso principal.
+        """
+        if not self._parallel(workers):
+            for (start, stop), block in zip(self._ranges(block_samples), self.blocks(block_samples)):
+                with stage_timings.measure('encode'):
+                    to_pcm16(block, out=out[start:stop])
+            return
+
+        global _parallel_pipeline, _parallel_output
+        ranges = list(self._ranges(block_samples))
+        _parallel_pipeline = self
+        try:
+            self._parallel_peaks(workers, ranges)
+
+            _parallel_output = out
+            with _process_pool(workers) as executor:
+                for totals in executor.map(_segment_into, *zip(*ranges)):
+                    stage_timings.merge(totals)
+        finally:
+            _parallel_pipeline = _parallel_output = None
+
+
+# Pipeline (y destino de `render_into`) que heredan los procesos de render en paralelo
+_parallel_pipeline = None
+_parallel_output = None
+
+
+def _process_pool(workers):
+    return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('fork'))
+
+
+def _segment_peak(depth, start, stop):
+    stage_timings.clear()
+    return _parallel_pipeline._range_peak(depth, start, stop), stage_timings.totals()
+
+
+def _segment(start, stop):
+    stage_timings.clear()
+    block = _parallel_pipeline._render_range(len(_parallel_pipeline.stages), start, stop)
+    return block, stage_timings.totals()
+
+
+def _segment_into(start, stop):
+    stage_timings.clear()
+    block = _parallel_pipeline._render_range(len(_parallel_pipeline.stages), start, stop)
+    with stage_timings.measure('encode'):
+        to_pcm16(block, out=_parallel_output[start:stop])
+    return stage_timings.totals()
+
+
+def to_pcm16(audio, out=None):
+    """Escala una señal en [-1, 1] a enteros de 16 bits.
+
+    El escalado se hace en el sitio sobre `audio`; `out` permite reutilizar
+    un buffer int16 entre bloques.
+    """
+    np.multiply(audio, 32767, out=audio)
+    if out is None:
+        return audio.astype(np.int16)
+    np.copyto(out, audio, casting='unsafe')
+    return out
@@ -0,0 +1,83 @@
+import time
+import functools
+import contextlib
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Fases de un trabajo, en el orden en que se informan
+STAGES = ('read', 'map', 'synthesize', 'effects', 'normalize', 'encode', 'write')
+
+
+def peak_rss_mb():
+    """Pico de memoria residente del proceso en MB (None si no se puede medir)."""
+    if resource is None:
+        return None
+    # ru_maxrss viene en KB en Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+class StageTimings:
+    """Tiempo acumulado por fase del render (lectura, mapeo, síntesis, efectos...).
+
+    Las fases se miden en el proceso que hace el trabajo; los renders en
+    paralelo devuelven sus tiempos con cada segmento y se suman con `merge`.
+    """
+
+    def __init__(self):
+        self.seconds = {}
+        self.calls = {}
+
+    def add(self, stage, seconds, calls=1):
+        self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+        self.calls[stage] = self.calls.get(stage, 0) + calls
+
+    @contextlib.contextmanager
+    def measure(self, stage):
+        """Suma a `stage` el tiempo del bloque `with`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def timed(self, stage):
+        """Decorador: suma a `stage` el tiempo de cada llamada."""
+        def decorator(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.measure(stage):
+                    return function(*args, **kwargs)
+
+            return wrapper
+        return decorator
+
+    def totals(self):
+        """(segundos, llamadas) de cada fase, para sumarlos en otro proceso."""
+        return {stage: (self.seconds[stage], self.calls[stage]) for stage in self.seconds}
+
+    def merge(self, totals):
+        for stage, (seconds, calls) in totals.items():
+            self.add(stage, seconds, calls)
+
+    def report(self):
+        """Informe JSON: milisegundos y llamadas por fase, y pico de memoria."""
+        order = {stage: index for index, stage in enumerate(STAGES)}
+        stages = sorted(self.seconds, key=lambda stage: order.get(stage, len(STAGES)))
+        return {
+            'stages': {
+                stage: {'ms': round(self.seconds[stage] * 1000, 3), 'calls': self.calls[stage]}
+                for stage in stages
+            },
+            'peak_rss_mb': peak_rss_mb(),
+        }
+
+    def clear(self):
+        """Reinicia los tiempos."""
+        self.seconds.clear()
+        self.calls.clear()
+
+
+stage_timings = StageTimings()
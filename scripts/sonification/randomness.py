@@ -0,0 +1,29 @@
+import hashlib
+
+import numpy as np
+
+# Parámetros de FNV-1a de 32 bits
+FNV_OFFSET = 0x811C9DC5
+FNV_PRIME = 0x01000193
+
+
+def content_seed(text):
+    """Semilla de 64 bits derivada del contenido: misma entrada, mismo audio."""
+    digest = hashlib.sha256(text.encode('utf-8', 'surrogatepass')).digest()
+    return int.from_bytes(digest[:8], 'little')
+
+
+def resolve_seed(seed, text):
+    """Semilla indicada (admite el texto de la línea de comandos) o la del contenido."""
+    if seed is None:
+        return content_seed(text)
+    seed = int(seed)
+    if seed < 0:
+        raise ValueError(f"Seed must be non-negative: {seed}")
+    return seed
+
+
+def make_rng(seed, text):
+    """Generador de NumPy para un trabajo; toda la aleatoriedad sale de aquí."""
+    return np.random.default_rng(resolve_seed(seed, text))
+
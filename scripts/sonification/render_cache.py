@@ -0,0 +1,183 @@
+import os
+import json
+import shutil
+import hashlib
+import inspect
+import functools
+from pathlib import Path
+from contextlib import contextmanager, suppress
+from collections import OrderedDict
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+PACKAGE_DIR = Path(__file__).resolve().parent
+DEFAULT_CACHE_DIR = PACKAGE_DIR.parent.parent / 'audios' / 'render_cache'
+
+# Opciones que no cambian el audio resultante
+IGNORED_OPTIONS = {'stream', 'workers'}
+
+
+def source_digest(*paths):
+    """Huella del código fuente: cambia con cualquier edición del motor."""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(Path(path).read_bytes())
+    return digest.hexdigest()
+
+
+# Versión del motor: el paquete común; cada variante añade su propio script
+ENGINE_VERSION = source_digest(*sorted(PACKAGE_DIR.glob('*.py')))
+
+
+@functools.lru_cache(maxsize=None)
+def variant_version(source_file):
+    """Versión de una variante: motor común más su propio script."""
+    return source_digest(source_file) + ENGINE_VERSION
+
+
+def render_key(variant, render, html_content, args=(), options=None):
+    """Hash de todo lo que determina el audio de un trabajo."""
+    version = variant_version(inspect.getsourcefile(render))
+    bound = inspect.signature(render).bind(html_content, None, *args, **(options or {}))
+    bound.apply_defaults()
+    parameters = {
+        name: value for name, value in list(bound.arguments.items())[2:]
+        if name not in IGNORED_OPTIONS
+    }
+    digest = hashlib.sha256()
+    digest.update(json.dumps([variant, version, parameters], sort_keys=True, default=str).encode())
+    digest.update(html_content.encode('utf-8', 'surrogatepass'))
+    return digest.hexdigest()
+
+
+class RenderCache:
+    """Caché en disco de WAV ya renderizados, indexada por contenido.
+
+    La clave es un hash de (texto, variante, parámetros, versión del motor).
+    Los ficheros se guardan como `<hash>.wav`; al acertar se enlazan (o
+    copian) en la ruta de salida pedida. Se expulsan los menos usados
+    recientemente cuando el total supera `max_bytes`; el orden de uso se
+    guarda en el mtime para sobrevivir a reinicios.
+
+    Varios procesos pueden compartir el directorio (los workers del
+    servidor, el pool de batch.py): el propio directorio es el índice, y
+    cada escritura lo vuelve a leer bajo un cerrojo de fichero y expulsa
+    frente al total de todos ellos.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=512 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._load()
+
+    def _load(self):
+        """Relee el índice del directorio, del menos al más usado recientemente."""
+        files = []
+        for path in self.directory.glob('*.wav'):
+            with suppress(FileNotFoundError):
+                status = path.stat()
+                files.append((status.st_mtime, path.stem, status.st_size))
+        self._entries = OrderedDict((key, size) for _, key, size in sorted(files))
+        self.nbytes = sum(self._entries.values())
+
+    @contextmanager
+    def _locked(self):
+        """Exclusión mutua entre los procesos que comparten el directorio."""
+        with open(self.directory / '.lock', 'a') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+
+    def _path(self, key):
+        return self.directory / f'{key}.wav'
+
+    def key(self, variant, render, html_content, args=(), options=None):
+        """Hash de todo lo que determina el audio de un trabajo (ver `render_key`)."""
+        return render_key(variant, render, html_content, args, options)
+
+    def get(self, key, output_file, render):
+        """Deja en `output_file` el WAV de `key`, renderizándolo con `render()` si no está.
+
+        Devuelve True si se ha servido desde la caché.
+        """
+        if self._fetch(key, output_file):
+            self.hits += 1
+            return True
+
+        self.misses += 1
+        # La salida puede ser un enlace a otra entrada: no se sobrescribe en el sitio
+        Path(output_file).unlink(missing_ok=True)
+        render()
+        self._store(key, output_file)
+        return False
+
+    def _fetch(self, key, output_file):
+        # Se mira en disco: la entrada puede venir de otro proceso
+        path = self._path(key)
+        self.nbytes -= self._entries.pop(key, 0)
+        try:
+            _place(path, output_file)
+        except FileNotFoundError:
+            # Aún sin renderizar, o expulsada por otro proceso
+            return False
+
+        # Si otro proceso la expulsa ahora, la salida ya es un enlace propio
+        with suppress(FileNotFoundError):
+            os.utime(path)
+        self._entries[key] = Path(output_file).stat().st_size
+        self.nbytes += self._entries[key]
+        return True
+
+    def _store(self, key, output_file):
+        path = self._path(key)
+        temporary = path.with_suffix(f'.{os.getpid()}.tmp')
+        _place(output_file, temporary)
+        with self._locked():
+            os.replace(temporary, path)
+            os.utime(path)
+            self._load()
+            while self.nbytes > self.max_bytes and len(self._entries) > 1:
+                evicted, size = self._entries.popitem(last=False)
+                self._path(evicted).unlink(missing_ok=True)
+                self.nbytes -= size
+                self.evictions += 1
+
+    def stats(self):
+        """Contadores de uso de la caché."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._entries),
+            'bytes': self.nbytes,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def clear(self):
+        """Vacía la caché y reinicia los contadores."""
+        with self._locked():
+            for path in self.directory.glob('*.wav'):
+                path.unlink(missing_ok=True)
+        self._entries.clear()
+        self.nbytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+
+def _place(source, destination):
+    """Enlace duro de `source` en `destination` (copia si no es posible)."""
+    destination = Path(destination)
+    destination.unlink(missing_ok=True)
+    try:
+        os.link(source, destination)
+    except OSError:
+        if not Path(source).exists():
+            raise FileNotFoundError(source)
+        shutil.copyfile(source, destination)
@@ -0,0 +1,166 @@
+import numpy as np
+from scipy import signal
+
+from sonification.pipeline import Stage
+
+
+class EchoReverb(Stage):
+    """Reverberación simple: suma de ecos retardados (sin normalizar)."""
+
+    def __init__(self, delays=(0.03, 0.05, 0.07), amplitudes=(0.3, 0.2, 0.1), sample_rate=44100):
+        self.taps = [(int(sample_rate * delay), amplitude) for delay, amplitude in zip(delays, amplitudes)]
+        self.lookback = max(delay for delay, _ in self.taps)
+
+    def process(self, block, start):
+        reverb_audio = np.copy(block)
+        echo = np.empty_like(block)
+        for delay_samples, amplitude in self.taps:
+            if delay_samples < len(block):
+                tail = len(block) - delay_samples
+                np.multiply(block[:tail], amplitude, out=echo[:tail])
+                reverb_audio[delay_samples:] += echo[:tail]
+        return reverb_audio
+
+
+class ConvolutionMix(Stage):
+    """Mezcla la señal seca con su convolución (modo 'same') con `kernel`.
+
+    La convolución se hace por FFT con solapamiento y suma
+    (`scipy.signal.oaconvolve`), con coste O(n log m) en lugar del O(n·m)
+    de `np.convolve`: sirve tanto para suavizados cortos como para
+    respuestas al impulso de varios segundos.
+    """
+
+    def __init__(self, kernel, dry=0.6, wet=0.4):
+        self.kernel = kernel
+        self.dry = dry
+        self.wet = wet
+        self.lookback = len(kernel) // 2
+        self.lookahead = (len(kernel) - 1) // 2
+
+    def process(self, block, start):
+        reverb = signal.oaconvolve(block, self.kernel.astype(block.dtype, copy=False), mode='same')
+        np.multiply(reverb, self.wet, out=reverb)
+        np.multiply(block, self.dry, out=block)
+        return np.add(block, reverb, out=block)
+
+
+class DelayFilter:
+    """Filtro (b0 + b1·z^-D) / (1 + a1·z^-D) con estado entre bloques.
+
+    Es la forma de los peines y all-pass de Schroeder. Como solo depende de
+    muestras separadas D posiciones, equivale a D filtros de primer orden
+    independientes: se evalúa con `lfilter` a lo largo de la señal dispuesta
+    en filas de D muestras, con coste O(n) aunque D sea de miles de muestras.
+    """
+
+    def __init__(self, delay, b0, b1, a1):
+        self.delay = delay
+        self.b = [b0, b1]
+        self.a = [1.0, a1]
+        self.reset()
+
+    def reset(self):
+        self.x_tail = np.zeros(self.delay)
+        self.y_tail = np.zeros(self.delay)
+
+    def __call__(self, x):
+        rows = -(-len(x) // self.delay)
+        padded = np.zeros(rows * self.delay)
+        padded[:len(x)] = x
+        # Estado inicial de la forma directa II traspuesta: b1·x[n-D] - a1·y[n-D]
+        zi = self.b[1] * self.x_tail - self.a[1] * self.y_tail
+        y, _ = signal.lfilter(self.b, self.a, padded.reshape(rows, self.delay), axis=0, zi=zi[np.newaxis])
+        y = y.ravel()[:len(x)]
+
+        self.x_tail = np.concatenate([self.x_tail, x])[-self.delay:]
+        self.y_tail = np.concatenate([self.y_tail, y])[-self.delay:]
+        return y
+
+
+class SchroederReverb(Stage):
+    """Reverb algorítmica al estilo Freeverb: peines en paralelo y all-pass en serie.
+
+    Usa las longitudes de Freeverb, escaladas a la frecuencia de muestreo.
+    El amortiguamiento se aplica como un paso bajo de un polo a la salida de
+    los peines (no dentro de cada realimentación), lo que permite evaluar
+    cada peine de una vez con `DelayFilter`.
+
+    Es un filtro recursivo con estado: en streaming necesita los bloques en
+    orden y sin solapes (ninguna etapa posterior puede pedir contexto), y
+    se reinicia cuando vuelve a empezar por la muestra 0.
+    """
+
+    sequential = True
+
+    # Muestras por pasada de los filtros: la memoria no crece con el bloque
+    CHUNK_SAMPLES = 1 << 16
+
+    COMB_TUNING = (1116, 1188, 1277, 1356, 1422, 1491, 1557, 1617)
+    ALLPASS_TUNING = (556, 441, 341, 225)
+    ALLPASS_FEEDBACK = 0.5
+    FIXED_GAIN = 0.015
+    SCALE_WET = 3
+
+    def __init__(self, room_size=0.5, damping=0.5, wet=1 / 3, dry=1.0, sample_rate=44100):
+        scale = sample_rate / 44100
+        feedback = room_size * 0.28 + 0.7
+        self.damping = damping * 0.4
+        self.wet = wet * self.SCALE_WET
+        self.dry = dry
+        self.combs = [DelayFilter(max(1, round(length * scale)), 0.0, 1.0, -feedback)
+                      for length in self.COMB_TUNING]
+        self.allpasses = [DelayFilter(max(1, round(length * scale)), -1.0, 1.0 + self.ALLPASS_FEEDBACK,
+                                      -self.ALLPASS_FEEDBACK)
+                          for length in self.ALLPASS_TUNING]
+        self.reset()
+
+    def reset(self):
+        """Vacía las líneas de retardo."""
+        for delay_filter in self.combs + self.allpasses:
+            delay_filter.reset()
+        self._damping_state = np.zeros(1)
+        self._position = 0
+
+    def process(self, block, start):
+        if start == 0:
+            self.reset()
+        elif start != self._position:
+            raise ValueError("SchroederReverb needs contiguous, non-overlapping blocks")
+        self._position = start + len(block)
+
+        # Los filtros guardan su estado: procesar por trozos da lo mismo que de una vez
+        for offset in range(0, len(block), self.CHUNK_SAMPLES):
+            chunk = block[offset:offset + self.CHUNK_SAMPLES]
+            reverb = self._reverb(chunk)
+            np.multiply(chunk, self.dry, out=chunk)
+            chunk += reverb.astype(block.dtype, copy=False)
+        return block
+
+    def _reverb(self, chunk):
+        """Señal húmeda de un trozo (ya multiplicada por `wet`)."""
+        reverb_input = chunk * self.FIXED_GAIN
+        reverb = np.zeros(len(chunk))
+        for comb in self.combs:
+            reverb += comb(reverb_input)
+        reverb, self._damping_state = signal.lfilter(
+            [1 - self.damping], [1, -self.damping], reverb, zi=self._damping_state
+        )
+        for allpass in self.allpasses:
+            reverb = allpass(reverb)
+        reverb *= self.wet
+        return reverb
+
+
+# Reverbs que puede elegir una variante: ecos sencillos o la algorítmica de Schroeder
+REVERBS = {
+    'echo': EchoReverb,
+    'schroeder': SchroederReverb,
+}
+
+
+def reverb_stage(reverb, sample_rate=44100):
+    """Crea la etapa de reverb indicada por su nombre (ver `REVERBS`)."""
+    if reverb not in REVERBS:
+        raise ValueError(f"Unsupported reverb: {reverb}")
+    return REVERBS[reverb](sample_rate=sample_rate)
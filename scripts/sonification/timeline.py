@@ -0,0 +1,90 @@
+import numpy as np
+
+
+def note_offsets(lengths, overlap=0):
+    """Calcula la posición inicial de cada nota y el total de muestras."""
+    lengths = np.asarray(lengths, dtype=np.int64)
+    offsets = np.zeros(len(lengths), dtype=np.int64)
+    if len(lengths) == 0:
+        return offsets, 0
+
+    # Cada nota empieza donde acaba la anterior, menos el solapamiento
+    np.cumsum(lengths[:-1] - overlap, out=offsets[1:])
+    total_samples = int(max(offsets[-1] + lengths[-1], lengths.max()))
+    return offsets, total_samples
+
+
+class Timeline:
+    """Secuencia de notas colocadas en un único buffer preasignado.
+
+    `lengths` es el número de muestras que ocupa cada evento y
+    `render_event(event)` devuelve su onda (como mucho `length` muestras).
+    Con `overlap > 0` las notas consecutivas se solapan y se suman
+    (overlap-add) en la zona compartida. `dtype` es la precisión del buffer.
+    """
+
+    def __init__(self, events, lengths, render_event, overlap=0, dtype=np.float64):
+        self.events = events
+        self.lengths = np.asarray(lengths, dtype=np.int64)
+        self.render_event = render_event
+        self.overlap = overlap
+        self.dtype = dtype
+        self.offsets, self.total_samples = note_offsets(self.lengths, overlap)
+
+    def render(self):
+        """Sintetiza todas las notas en un buffer del tamaño total."""
+        return self.render_block(0, self.total_samples)
+
+    def render_block(self, start, stop):
+        """Sintetiza solo las muestras [start, stop) de la secuencia."""
+        audio = np.zeros(stop - start, dtype=self.dtype)
+
+        # Notas que se solapan con el bloque
+        first = np.searchsorted(self.offsets + self.lengths, start, side='right')
+        last = np.searchsorted(self.offsets, stop, side='left')
+
+        for index in range(first, last):
+            wave = self.render_event(self.events[index])
+            offset = self.offsets[index] - start
+            begin = max(0, -offset)
+            end = min(len(wave), stop - start - offset)
+            if end > begin:
+                audio[offset + begin:offset + end] += wave[begin:end]
+
+        return audio
+
+
+def apply_crossfades(audio, offsets, lengths, fade_samples, start=0):
+    """Aplica fundidos de salida/entrada en cada frontera entre notas.
+
+    Equivale a encadenar `apply_crossfade` nota a nota, pero sobre el buffer
+    ya renderizado: no se copia el audio acumulado en cada paso. `audio`
+    puede ser un bloque que empieza en la muestra `start` de la secuencia.
+    """
+    if fade_samples <= 0:
+        return audio
+
+    fade_out = np.linspace(1, 0, fade_samples)
+    fade_in = np.linspace(0, 1, fade_samples)
+    stop = start + len(audio)
+
+    # Solo las fronteras cuyos fundidos tocan el bloque
+    first = max(1, np.searchsorted(offsets, start - fade_samples, side='left'))
+    last = np.searchsorted(offsets, stop + fade_samples, side='right')
+
+    for offset, length in zip(offsets[first:last], lengths[first:last]):
+        # Si alguna de las dos partes es demasiado corta, no hay fundido
+        if offset < fade_samples or length < fade_samples:
+            continue
+        _apply_window(audio, offset - fade_samples - start, fade_out)
+        _apply_window(audio, offset - start, fade_in)
+
+    return audio
+
+
+def _apply_window(audio, position, window):
+    """Multiplica `window` sobre `audio` a partir de `position`, recortando a los bordes."""
+    begin = max(0, -position)
+    end = min(len(window), len(audio) - position)
+    if end > begin:
+        audio[position + begin:position + end] *= window[begin:end]
@@ -0,0 +1,33 @@
+"""Registro de variantes de sonificación.
+
+Cada variante es un módulo de este paquete con `build(html_content, ...)`,
+que declara su pipeline (fuente de notas y etapas), y `render(html_content,
+output_file, ...)`, que la escribe como WAV. Los scripts de `scripts/` son
+solo su punto de entrada por línea de comandos.
+"""
+import importlib
+
+VARIANTS = (
+    'didgeridoo',
+    'html_to_sound',
+    'html_to_sound_instrument_envelope',
+    'html_to_sound_piano_style',
+    'html_to_sound_space',
+    'html_to_sound_trigrams',
+    'html_to_sound_with_silences',
+    'john_frusciante_inspiration',
+    'piano_with_rythm',
+    'piano_with_silences',
+)
+
+
+def get_variant(name):
+    """Módulo de la variante `name`."""
+    if name not in VARIANTS:
+        raise ValueError(f"Unknown script variant: {name}")
+    return importlib.import_module(f'{__name__}.{name}')
+
+
+def load_variants():
+    """Importa todas las variantes: {nombre: módulo}."""
+    return {name: get_variant(name) for name in VARIANTS}
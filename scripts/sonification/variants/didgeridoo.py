@@ -0,0 +1,59 @@
+import numpy as np
+from sonification.mappers import char_frequencies, fixed_char_frequencies
+from sonification.pipeline import Pipeline, resolve_dtype, resolve_sample_rate, to_pcm16
+from sonification.profiling import stage_timings
+from sonification.vectorized import FixedNotes
+from sonification.oscillators import harmonic_tone
+from sonification.wavetable import resolve_oscillator
+from sonification.wavfile import write_wav
+
+def text_to_frequencies(text, min_freq=50, max_freq=150):
+    """Convierte caracteres en frecuencias dentro del rango típico de un didgeridoo."""
+    return char_frequencies(text, min_freq, max_freq)
+
+def didgeridoo_pipeline(frequencies, duration=0.3, sample_rate=44100, dtype=np.float64, oscillator='exact'):
+    """Construye la pipeline de renderizado del didgeridoo."""
+    t = np.linspace(0, duration, int(sample_rate * duration), endpoint=False, dtype=dtype)
+    
+    # Modulación suave (vibración de los labios) y envolvente exponencial,
+    # comunes a todas las notas
+    modulation = 1 + 0.1 * np.sin(2 * np.pi * 5 * t)
+    envelope = np.exp(-t / duration)
+
+    def render_notes(freqs, t):
+        # Tono fundamental con los armónicos característicos del didgeridoo (segundo y tercero)
+        wave = harmonic_tone(freqs, t, [0.5, 0.25], oscillator, sample_rate)
+        wave *= modulation
+        
+        # Normalizamos cada nota y aplicamos la envolvente
+        wave /= np.maximum(wave.max(axis=1, keepdims=True), -wave.min(axis=1, keepdims=True))
+        wave *= envelope
+        return wave
+    
+    return Pipeline(FixedNotes(frequencies, t, render_notes), sample_rate=sample_rate)
+
+def generate_didgeridoo_wave(frequencies, duration=0.3, sample_rate=44100):
+    """Genera una señal de audio simulando el sonido de un didgeridoo."""
+    audio = didgeridoo_pipeline(frequencies, duration, sample_rate).render()
+    return to_pcm16(audio)
+
+@stage_timings.timed('map')
+def build(html_content, sample_rate=44100, dtype='float64', seed=None, oscillator='exact'):
+    """Construye la pipeline de la variante para el contenido HTML."""
+    frequencies = text_to_frequencies(html_content)
+    return didgeridoo_pipeline(frequencies, sample_rate=resolve_sample_rate(sample_rate), dtype=resolve_dtype(dtype),
+                               oscillator=resolve_oscillator(oscillator))
+
+def build_incremental(chunks, sample_rate=44100, dtype='float64', seed=None, oscillator='exact'):
+    """Construye una pipeline por trozo de texto a medida que llega, con la tabla fija de code points."""
+    sample_rate, dtype = resolve_sample_rate(sample_rate), resolve_dtype(dtype)
+    oscillator = resolve_oscillator(oscillator)
+    for chunk in chunks:
+        yield didgeridoo_pipeline(fixed_char_frequencies(chunk, 50, 150), sample_rate=sample_rate, dtype=dtype,
+                                  oscillator=oscillator)
+
+def render(html_content, output_file, stream=False, dtype='float64', sample_rate=44100, encoding='pcm16',
+           seed=None, workers=1, oscillator='exact'):
+    """Sonifica el contenido HTML y lo guarda como WAV."""
+    pipeline = build(html_content, sample_rate, dtype, seed, oscillator)
+    write_wav(output_file, pipeline, stream, encoding=encoding, workers=workers)
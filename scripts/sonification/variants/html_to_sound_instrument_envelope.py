@@ -0,0 +1,55 @@
+import numpy as np
+from sonification.envelopes import apply_envelope
+from sonification.mappers import OCTAVE_4, char_notes
+from sonification.oscillators import harmonic_tone
+from sonification.pipeline import Normalize, Pipeline, resolve_dtype, resolve_sample_rate, to_pcm16
+from sonification.profiling import stage_timings
+from sonification.timeline import Timeline
+from sonification.wavetable import resolve_oscillator
+from sonification.wavfile import write_wav
+from sonification.cache import note_cache
+
+def text_to_frequencies(text):
+    """Convierte caracteres en frecuencias usando notas musicales reales."""
+    char_to_freq = char_notes(text, list(OCTAVE_4.values()))
+    return [char_to_freq[char] for char in text]
+
+@note_cache.memoize("instrument_envelope")
+def generate_piano_wave(frequency, duration=0.2, sample_rate=44100, instrument_type="strings", dtype=np.float64,
+                        oscillator='exact'):
+    """Genera un sonido con la envolvente especificada"""
+    t = np.linspace(0, duration, int(sample_rate * duration), endpoint=False, dtype=dtype)
+    
+    # Generar onda base con armónicos
+    wave = harmonic_tone(frequency, t, [0.5, 0.25, 0.125], oscillator, sample_rate)
+    
+    # Aplicar la envolvente seleccionada
+    wave = apply_envelope(wave, instrument_type, sample_rate)
+    
+    return wave
+
+def wave_pipeline(frequencies, duration=0.2, sample_rate=44100, dtype=np.float64, oscillator='exact'):
+    """Construye la pipeline: notas con envolvente y normalización."""
+    note_samples = int(sample_rate * duration)
+    timeline = Timeline(frequencies, [note_samples] * len(frequencies),
+                        lambda freq: generate_piano_wave(freq, duration, sample_rate, dtype=dtype, oscillator=oscillator),
+                        dtype=dtype)
+    return Pipeline(timeline, [Normalize()], sample_rate)
+
+def generate_wave(frequencies, duration=0.2, sample_rate=44100):
+    """Genera una señal de audio usando sonidos de piano."""
+    audio = wave_pipeline(frequencies, duration, sample_rate).render()
+    return to_pcm16(audio)
+
+@stage_timings.timed('map')
+def build(html_content, sample_rate=44100, dtype='float64', seed=None, oscillator='exact'):
+    """Construye la pipeline de la variante para el contenido HTML."""
+    frequencies = text_to_frequencies(html_content)
+    return wave_pipeline(frequencies, sample_rate=resolve_sample_rate(sample_rate), dtype=resolve_dtype(dtype),
+                         oscillator=resolve_oscillator(oscillator))
+
+def render(html_content, output_file, stream=False, dtype='float64', sample_rate=44100, encoding='pcm16',
+           seed=None, workers=1, oscillator='exact'):
+    """Sonifica el contenido HTML y lo guarda como WAV."""
+    pipeline = build(html_content, sample_rate, dtype, seed, oscillator)
+    write_wav(output_file, pipeline, stream, encoding=encoding, workers=workers)
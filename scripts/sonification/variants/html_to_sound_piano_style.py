@@ -0,0 +1,74 @@
+import numpy as np
+from sonification.envelopes import constant, envelope_bank, ramp
+from sonification.mappers import OCTAVE_4, char_notes
+from sonification.oscillators import piano_tone
+from sonification.pipeline import Normalize, Pipeline, resolve_dtype, resolve_sample_rate, to_pcm16
+from sonification.profiling import stage_timings
+from sonification.reverb import reverb_stage
+from sonification.timeline import Timeline
+from sonification.wavetable import resolve_oscillator
+from sonification.wavfile import write_wav
+from sonification.cache import note_cache
+
+def text_to_frequencies(text):
+    """Convierte caracteres en frecuencias usando notas musicales reales."""
+    char_to_freq = char_notes(text, list(OCTAVE_4.values()))
+    return [char_to_freq[char] for char in text]
+
+def piano_envelope(samples, sample_rate):
+    """Tramos de la envolvente ADSR del piano (attack, decay y release de duración fija)."""
+    attack_time = 0.005
+    decay_time = 0.05
+    release_time = 0.1
+    
+    attack_samples = int(sample_rate * attack_time)
+    decay_samples = int(sample_rate * decay_time)
+    release_samples = int(sample_rate * release_time)
+    sustain_samples = samples - attack_samples - decay_samples - release_samples
+    
+    return [
+        (ramp, 0, 1, attack_samples),
+        (ramp, 1, 0.7, decay_samples),
+        (constant, 0.7, sustain_samples),
+        (ramp, 0.7, 0, release_samples),
+    ]
+
+@note_cache.memoize("piano_style")
+def generate_piano_wave(frequency, duration=0.3, sample_rate=44100, dtype=np.float64, oscillator='exact'):
+    """Genera un sonido de piano con resonancia simpática."""
+    t = np.linspace(0, duration, int(sample_rate * duration), endpoint=False, dtype=dtype)
+    
+    # Onda principal con resonancias (octavas, quinta y tercera mayor)
+    wave = piano_tone(frequency, t, [0.1, 0.1, 0.05, 0.05], oscillator, sample_rate)
+    
+    # Envolvente ADSR
+    return envelope_bank.apply(wave, piano_envelope, sample_rate)
+
+def wave_pipeline(frequencies, duration=0.25, sample_rate=44100, dtype=np.float64, oscillator='exact', reverb='echo'):
+    """Construye la pipeline: notas de piano, normalización y reverb ('echo' o 'schroeder')."""
+    note_samples = int(sample_rate * duration)
+    timeline = Timeline(frequencies, [note_samples] * len(frequencies),
+                        lambda freq: generate_piano_wave(freq, duration, sample_rate, dtype, oscillator), dtype=dtype)
+    return Pipeline(timeline, [
+        Normalize(),
+        reverb_stage(reverb, sample_rate),  # Añadir reverb
+        Normalize(),
+    ], sample_rate)
+
+def generate_wave(frequencies, duration=0.25, sample_rate=44100):
+    """Genera una señal de audio usando sonidos de piano."""
+    audio = wave_pipeline(frequencies, duration, sample_rate).render()
+    return to_pcm16(audio)
+
+@stage_timings.timed('map')
+def build(html_content, sample_rate=44100, dtype='float64', seed=None, oscillator='exact', reverb='echo'):
+    """Construye la pipeline de la variante para el contenido HTML."""
+    frequencies = text_to_frequencies(html_content)
+    return wave_pipeline(frequencies, sample_rate=resolve_sample_rate(sample_rate), dtype=resolve_dtype(dtype),
+                         oscillator=resolve_oscillator(oscillator), reverb=reverb)
+
+def render(html_content, output_file, stream=False, dtype='float64', sample_rate=44100, encoding='pcm16',
+           seed=None, workers=1, oscillator='exact', reverb='echo'):
+    """Sonifica el contenido HTML y lo guarda como WAV."""
+    pipeline = build(html_content, sample_rate, dtype, seed, oscillator, reverb)
+    write_wav(output_file, pipeline, stream, encoding=encoding, workers=workers)
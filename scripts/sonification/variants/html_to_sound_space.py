@@ -0,0 +1,49 @@
+import numpy as np
+from sonification.mappers import char_frequencies, fixed_char_frequencies
+from sonification.pipeline import Pipeline, resolve_dtype, resolve_sample_rate, to_pcm16
+from sonification.profiling import stage_timings
+from sonification.vectorized import FixedNotes, sine_notes
+from sonification.wavetable import resolve_oscillator, wavetable
+from sonification.wavfile import write_wav
+
+def text_to_frequencies(text, min_freq=50, max_freq=200):
+    """Converts characters to frequencies within a given range."""
+    """The range between 50 and 200 Hz will produce deeper and more relaxing sounds"""
+    return char_frequencies(text, min_freq, max_freq)
+
+def wave_pipeline(frequencies, duration=0.5, sample_rate=44100, dtype=np.float64, oscillator='exact'):
+    """Builds the rendering pipeline: one sine wave per character."""
+    total_samples = int(sample_rate * duration)
+    if total_samples <= 0:
+        raise ValueError("Duration must result in at least 1 sample")
+        
+    t = np.linspace(0, duration, total_samples, endpoint=False, dtype=dtype)
+    notes = FixedNotes(frequencies, t, sine_notes if oscillator == 'exact' else wavetable('sine'))
+    return Pipeline(notes, sample_rate=sample_rate)
+
+def generate_wave(frequencies, duration=0.5, sample_rate=44100):
+    """Generates an audio signal by concatenating sine waves."""
+    """Increasing duration makes each character have a longer duration, like making the wave longer"""
+    audio = wave_pipeline(frequencies, duration, sample_rate).render()
+    return to_pcm16(audio)  # Scale to 16 bits
+
+@stage_timings.timed('map')
+def build(html_content, sample_rate=44100, dtype='float64', seed=None, oscillator='exact'):
+    """Builds the variant's pipeline for the HTML content."""
+    frequencies = text_to_frequencies(html_content)
+    return wave_pipeline(frequencies, sample_rate=resolve_sample_rate(sample_rate), dtype=resolve_dtype(dtype),
+                         oscillator=resolve_oscillator(oscillator))
+
+def build_incremental(chunks, sample_rate=44100, dtype='float64', seed=None, oscillator='exact'):
+    """Builds one pipeline per chunk of text as it arrives, with the fixed code-point table."""
+    sample_rate, dtype = resolve_sample_rate(sample_rate), resolve_dtype(dtype)
+    oscillator = resolve_oscillator(oscillator)
+    for chunk in chunks:
+        yield wave_pipeline(fixed_char_frequencies(chunk, 50, 200), sample_rate=sample_rate, dtype=dtype,
+                            oscillator=oscillator)
+
+def render(html_content, output_file, stream=False, dtype='float64', sample_rate=44100, encoding='pcm16',
+           seed=None, workers=1, oscillator='exact'):
+    """Sonifies the HTML content and saves it as a WAV file."""
+    pipeline = build(html_content, sample_rate, dtype, seed, oscillator)
+    write_wav(output_file, pipeline, stream, encoding=encoding, workers=workers)
@@ -0,0 +1,527 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from sonification.envelopes import constant, envelope_bank, ramp
+from sonification.incremental import stream_ngrams, stream_variable_ngrams
+from sonification.mappers import char_codes
+from sonification.ngrams import Ngrams, char_classes, interp_range, vowel_counts
+from sonification.pipeline import Normalize, Pipeline, resolve_dtype, resolve_sample_rate, to_pcm16
+from sonification.profiling import stage_timings
+from sonification.randomness import resolve_seed
+from sonification.timeline import Timeline
+from sonification.vectorized import VariableNotes
+from sonification.wavetable import WAVEFORMS, noise, resolve_oscillator, wavetable
+from sonification.wavfile import write_wav
+
+def create_variable_ngrams(codes, pattern=[3, 2, 4]):
+    """Crea grupos de tamaño variable siguiendo un patrón.
+
+    `codes` son los puntos de código del texto; los grupos se devuelven
+    como rangos sobre ellos (un lote `Ngrams`), sin crear subcadenas.
+    """
+    if min(pattern) < 1:
+        raise ValueError(f"N-gram sizes must be positive: {pattern}")
+    
+    # Repetir el patrón hasta cubrir el texto
+    cycles = -(-len(codes) // sum(pattern))
+    sizes = np.tile(np.asarray(pattern, dtype=np.int64), cycles)
+    starts = np.cumsum(sizes) - sizes
+    starts, sizes = starts[starts < len(codes)], sizes[starts < len(codes)]
+    
+    # Asegurarse de no sobrepasar el texto
+    lengths = np.minimum(sizes, len(codes) - starts)
+    return Ngrams(codes, starts, lengths)
+
+def create_ngram(codes, n):
+    """Crea grupos de n caracteres (solapados, como rangos sobre `codes`)."""
+    starts = np.arange(max(0, len(codes) - (n - 1)), dtype=np.int64)
+    lengths = np.full(len(starts), n, dtype=np.int64)
+    if len(codes) % n != 0:
+        # Grupo final con los caracteres que sobran
+        starts = np.append(starts, len(codes) - len(codes) % n)
+        lengths = np.append(lengths, len(codes) % n)
+    return Ngrams(codes, starts, lengths)
+
+def calculate_frequencies(ngrams, min_freq=50, max_freq=200, method='hash'):
+    """Calcula la frecuencia de todos los ngrams (un lote `Ngrams`) a la vez."""
+    if method == 'hash':
+        # Hash estable: el hash() de Python cambia en cada proceso
+        return interp_range(ngrams.hashes() % 1000, 1000, min_freq, max_freq)
+    
+    elif method == 'ascii_sum':
+        # Suma los valores ASCII de los caracteres
+        ascii_sums = ngrams.sums(ngrams.codes)
+        return interp_range(ascii_sums, 255 * ngrams.lengths, min_freq, max_freq)
+    
+    elif method == 'vowel_weight':
+        # Da más peso a las vocales
+        vowels = ngrams.sums(vowel_counts(ngrams.codes))
+        values = ngrams.sums(ngrams.codes) + vowels * 50
+        return interp_range(values, 255 * ngrams.lengths, min_freq, max_freq)
+    
+    raise ValueError(f"Unknown frequency method: {method}")
+
+def calculate_durations(ngrams, base_duration=1.0, method='fixed'):
+    """Calcula la duración de todos los ngrams (un lote `Ngrams`) a la vez."""
+    if method == 'fixed':
+        return np.full(len(ngrams), base_duration, dtype=np.float64)
+    
+    elif method == 'length':
+        # Duración basada en la longitud del ngram
+        return base_duration * (ngrams.lengths / 3)
+    
+    elif method == 'complexity':
+        # Duración basada en la complejidad del ngram
+        return base_duration * (0.5 + ngrams.unique_counts() / ngrams.lengths)
+    
+    raise ValueError(f"Unknown duration method: {method}")
+
+def generate_waveform(frequency, time, waveform_type='sine', rng=None, oscillator='exact', sample_rate=None):
+    """Genera diferentes tipos de forma de onda.
+
+    Con `oscillator='wavetable'` la onda se lee de su tabla limitada en
+    banda y el ruido de una tabla generada una sola vez.
+    """
+    if oscillator == 'wavetable':
+        if waveform_type == 'noise':
+            rng = np.random.default_rng() if rng is None else rng
+            return noise(len(time), rng, time.dtype)
+        return wavetable(waveform_type if waveform_type in WAVEFORMS else 'sine')(frequency, time, sample_rate)
+
+    if waveform_type == 'sine':
+        # Onda sinusoidal (suave y redonda)
+        return np.sin(2 * np.pi * frequency * time)
+    
+    elif waveform_type == 'square':
+        # Onda cuadrada (más áspera, como un bajo sintético)
+        return np.sign(np.sin(2 * np.pi * frequency * time))
+    
+    elif waveform_type == 'sawtooth':
+        # Onda sierra (rica en armónicos, brillante)
+        return 2 * (frequency * time - np.floor(0.5 + frequency * time))
+    
+    elif waveform_type == 'triangle':
+        # Onda triangular (suave pero con más carácter que la sinusoidal)
+        return 2 * np.abs(2 * (frequency * time - np.floor(0.5 + frequency * time))) - 1
+    
+    elif waveform_type == 'noise':
+        # Ruido blanco (percusivo, textura)
+        rng = np.random.default_rng() if rng is None else rng
+        return rng.uniform(-1, 1, len(time))
+    
+    # Por defecto, usamos sinusoidal
+    return np.sin(2 * np.pi * frequency * time)
+
+def wave_source(frequencies, durations, sample_rate=44100, dtype=np.float64, oscillator='exact'):
+    """Fuente de notas con duraciones variables (sin bucle por nota)."""
+    durations = np.asarray(durations, dtype=np.float64)
+    lengths = (sample_rate * durations).astype(np.int64)
+    # Paso temporal de cada nota, igual que np.linspace(0, duration, samples, endpoint=False)
+    steps = (durations / np.maximum(lengths, 1)).astype(dtype)
+    frequencies = np.asarray(frequencies, dtype=dtype)
+    
+    # Crear envolvente
+    fade_samples = int(sample_rate * 0.1)
+    fade_in = np.linspace(0, 1, fade_samples, dtype=dtype)
+    fade_out = np.linspace(1, 0, fade_samples, dtype=dtype)
+    
+    def render_notes(notes, position):
+        t = position * steps[notes]
+        note_lengths = lengths[notes]
+        
+        envelope = np.ones(len(position), dtype=dtype)
+        head = position < fade_samples
+        envelope[head] = fade_in[position[head]]
+        tail_position = position - (note_lengths - fade_samples)
+        tail = tail_position >= 0
+        envelope[tail] = fade_out[tail_position[tail]]
+        
+        # Generar y procesar la onda (la fase se calcula en el buffer de `t`)
+        if oscillator == 'wavetable':
+            wave = wavetable('sine')(frequencies[notes], t)
+        else:
+            wave = np.multiply(2 * np.pi * frequencies[notes], t, out=t)
+            np.sin(wave, out=wave)
+        wave *= envelope
+        wave[(position == 0) | (position == note_lengths - 1)] = 0
+        return wave
+    
+    # Las notas con la misma frecuencia y duración se sintetizan una sola vez
+    return VariableNotes(lengths, render_notes, keys=np.column_stack((frequencies, durations)), dtype=dtype)
+
+def generate_wave(frequencies, durations, sample_rate=44100):
+    """Genera una señal de audio con duraciones variables por nota."""
+    source = wave_source(frequencies, durations, sample_rate)
+    return to_pcm16(source.render_block(0, source.total_samples))
+
+def text_pipeline(text, config, dtype=np.float64, oscillator='exact'):
+    """Construye la pipeline de una sola voz según la configuración."""
+    # Usar ngrams de tamaño variable o fijo
+    codes = char_codes(text)
+    if config.get('variable_ngrams', False):
+        ngrams = create_variable_ngrams(codes, config.get('ngram_pattern', [3, 2, 4]))
+    else:
+        ngrams = create_ngram(codes, config['ngram_size'])
+    return ngram_pipeline(ngrams, config, dtype, oscillator)
+
+def ngram_pipeline(ngrams, config, dtype=np.float64, oscillator='exact'):
+    """Construye la pipeline de una sola voz para un lote de ngrams."""
+    # Frecuencias y duraciones de todos los ngrams de una vez
+    frequencies = calculate_frequencies(ngrams, config['min_freq'], config['max_freq'], config['freq_method'])
+    durations = calculate_durations(ngrams, config['base_duration'], config['duration_method'])
+    
+    return Pipeline(wave_source(frequencies, durations, config['sample_rate'], dtype, oscillator),
+                    sample_rate=config['sample_rate'])
+
+def sonify_text(text, config):
+    """Función principal que procesa el texto según la configuración."""
+    return to_pcm16(text_pipeline(text, config).render())
+
+def voice_envelope(samples, sample_rate):
+    """Tramos de la envolvente de una nota de voz: fundidos de 0,1 s (hasta media nota) y sustain."""
+    fade_samples = min(int(sample_rate * 0.1), samples // 2)
+    return [(ramp, 0, 1, fade_samples), (constant, 1.0, samples - 2 * fade_samples), (ramp, 1, 0, fade_samples)]
+
+def voice_timeline(voice, sample_rate=44100, dtype=np.float64, seed=None, oscillator='exact'):
+    """Línea temporal de una voz: sus notas una detrás de otra.
+
+    `seed` es una `np.random.SeedSequence`; cada nota deriva de ella su
+    propio generador, de modo que sintetizarla de nuevo (por bloques, en
+    otro orden) da siempre las mismas muestras.
+    """
+    volume = voice.get('volume', 1.0)  # Volumen relativo de la voz
+    waveform_type = voice.get('waveform', 'sine')  # Tipo de forma de onda
+    seed = np.random.SeedSequence() if seed is None else seed
+    
+    def render_note(note):
+        index, freq, duration = note
+        # Número de muestras para esta nota
+        samples = int(sample_rate * duration)
+        
+        # Crear el tiempo para esta nota; las formas con saltos (cuadrada, sierra) van en float64:
+        # en float32 un salto puede moverse una muestra y dar un error de media escala
+        t = np.linspace(0, duration, samples, endpoint=False,
+                        dtype=np.float64 if waveform_type in ('square', 'sawtooth') else dtype)
+        
+        # Generar onda con la forma de onda seleccionada
+        rng = None
+        if waveform_type == 'noise':
+            note_seed = np.random.SeedSequence(seed.entropy, spawn_key=seed.spawn_key + (index,))
+            rng = np.random.default_rng(note_seed)
+        wave = generate_waveform(freq, t, waveform_type, rng, oscillator, sample_rate).astype(dtype, copy=False)
+        envelope_bank.apply(wave, voice_envelope, sample_rate)
+        wave *= volume
+        return wave
+    
+    notes = list(zip(range(len(voice['durations'])), voice['frequencies'], voice['durations']))
+    lengths = [int(sample_rate * duration) for duration in voice['durations']]
+    return Timeline(notes, lengths, render_note, dtype=dtype)
+
+class MultiVoiceMix:
+    """Mezcla de varias voces sobre la duración de la voz más larga.
+
+    Cada voz se sintetiza en su propio buffer y en su propio hilo (NumPy
+    libera el GIL en las operaciones sobre arrays); después se suman en el
+    orden de las voces, así que el resultado no depende de `workers`.
+    """
+
+    def __init__(self, voice_data, sample_rate=44100, dtype=np.float64, seed=None, workers=None, oscillator='exact'):
+        # Determinar la duración total necesaria
+        total_duration = max(sum(voice['durations']) for voice in voice_data)
+        self.total_samples = int(sample_rate * total_duration)
+        self.dtype = dtype
+        # Cada voz recibe una semilla hija de la del trabajo
+        seed = np.random.SeedSequence(seed)
+        self.voices = [voice_timeline(voice, sample_rate, dtype, voice_seed, oscillator)
+                       for voice, voice_seed in zip(voice_data, seed.spawn(len(voice_data)))]
+        self.workers = min(len(self.voices), os.cpu_count() or 1) if workers is None else workers
+
+    def _render_voice(self, voice, start, stop):
+        # Recortar las voces que sobrepasen la duración total
+        voice_stop = min(stop, voice.total_samples)
+        if voice_stop <= start:
+            return None
+        return voice.render_block(start, voice_stop)
+
+    def render_block(self, start, stop):
+        """Suma las voces en las muestras [start, stop)."""
+        if self.workers > 1:
+            with ThreadPoolExecutor(self.workers) as executor:
+                buffers = list(executor.map(lambda voice: self._render_voice(voice, start, stop), self.voices))
+        else:
+            buffers = [self._render_voice(voice, start, stop) for voice in self.voices]
+
+        mixed_audio = np.zeros(stop - start, dtype=self.dtype)
+        for buffer in buffers:
+            if buffer is not None:
+                mixed_audio[:len(buffer)] += buffer
+        return mixed_audio
+
+def multi_voice_pipeline(voice_data, sample_rate=44100, dtype=np.float64, seed=None, oscillator='exact'):
+    """Construye la pipeline multivoz: mezcla y normalización."""
+    # Normalizar para evitar clipping
+    mix = MultiVoiceMix(voice_data, sample_rate, dtype, seed, oscillator=oscillator)
+    return Pipeline(mix, [Normalize()], sample_rate)
+
+def generate_multi_voice_wave(voice_data, sample_rate=44100):
+    """Genera múltiples voces de audio en paralelo y las mezcla."""
+    return to_pcm16(multi_voice_pipeline(voice_data, sample_rate).render())
+
+# Clases de carácter de cada voz (bits combinables)
+BASS = 1
+MELODY = 2
+ATMOSPHERE = 4
+BASS_SYMBOLS = '<>/="{}[]()!@#$%^&*'
+
+def voice_classes(char):
+    """Voces a las que va un carácter."""
+    classes = 0
+    if char in BASS_SYMBOLS:
+        classes |= BASS
+    if char.isalnum() and char not in BASS_SYMBOLS:
+        classes |= MELODY
+    if char.isdigit() or char in '.,;:?!':
+        classes |= ATMOSPHERE
+    return classes
+
+def multi_voice_text_pipeline(text, config, dtype=np.float64, seed=None, oscillator='exact'):
+    """Construye la pipeline del texto generando múltiples voces."""
+    # Dividir el texto para diferentes voces
+    if config.get('multi_voice', False):
+        voices = []
+        
+        # Clasificar el texto una sola vez para repartirlo entre las voces
+        codes = char_codes(text)
+        classes = char_classes(codes, voice_classes)
+        
+        # Voz 1: Bajo - usando etiquetas HTML y símbolos
+        bass_codes = codes[(classes & BASS) != 0]
+        bass_ngrams = create_variable_ngrams(bass_codes, config.get('bass_pattern', [2, 3]))
+        
+        bass_voice = {
+            'frequencies': calculate_frequencies(
+                bass_ngrams,
+                config.get('bass_min_freq', 30),
+                config.get('bass_max_freq', 150),
+                config.get('bass_freq_method', 'hash')
+            ),
+            'durations': calculate_durations(
+                bass_ngrams,
+                config.get('bass_duration', 1.5),
+                config.get('bass_duration_method', 'fixed')
+            ),
+            'volume': config.get('bass_volume', 0.8),
+            'waveform': config.get('bass_waveform', 'square')  # Forma de onda para el bajo
+        }
+        voices.append(bass_voice)
+        
+        # Voz 2: Melodía - usando texto y números
+        melody_codes = codes[(classes & MELODY) != 0]
+        melody_ngrams = create_variable_ngrams(melody_codes, config.get('melody_pattern', [3, 2, 4]))
+        
+        melody_voice = {
+            'frequencies': calculate_frequencies(
+                melody_ngrams,
+                config.get('melody_min_freq', 150),
+                config.get('melody_max_freq', 400),
+                config.get('melody_freq_method', 'vowel_weight')
+            ),
+            'durations': calculate_durations(
+                melody_ngrams,
+                config.get('melody_duration', 0.8),
+                config.get('melody_duration_method', 'complexity')
+            ),
+            'volume': config.get('melody_volume', 1.0),
+            'waveform': config.get('melody_waveform', 'sine')  # Forma de onda para la melodía
+        }
+        voices.append(melody_voice)
+        
+        # Opcionalmente, añadir una tercera voz para atmósfera
+        if config.get('use_atmosphere', False):
+            # Filtrar números y algunos caracteres especiales
+            atmosphere_codes = codes[(classes & ATMOSPHERE) != 0]
+            atmosphere_ngrams = create_variable_ngrams(atmosphere_codes, config.get('atmosphere_pattern', [4, 2]))
+            
+            atmosphere_voice = {
+                'frequencies': calculate_frequencies(
+                    atmosphere_ngrams,
+                    config.get('atmosphere_min_freq', 200),
+                    config.get('atmosphere_max_freq', 500),
+                    config.get('atmosphere_freq_method', 'ascii_sum')
+                ),
+                'durations': calculate_durations(
+                    atmosphere_ngrams,
+                    config.get('atmosphere_duration', 0.5),
+                    config.get('atmosphere_duration_method', 'length')
+                ),
+                'volume': config.get('atmosphere_volume', 0.6),
+                'waveform': config.get('atmosphere_waveform', 'sawtooth')
+            }
+            voices.append(atmosphere_voice)
+        
+        return multi_voice_pipeline(voices, config['sample_rate'], dtype, resolve_seed(seed, text), oscillator)
+    
+    else:
+        # Código original para una sola voz
+        return text_pipeline(text, config, dtype, oscillator)
+
+def sonify_text_multi_voice(text, config):
+    """Procesa el texto generando múltiples voces."""
+    return to_pcm16(multi_voice_text_pipeline(text, config).render())
+
+configs = {
+    'default': {
+        'ngram_size': 3,
+        'min_freq': 50,
+        'max_freq': 200,
+        'freq_method': 'hash',
+        'base_duration': 1.0,
+        'duration_method': 'fixed',
+        'sample_rate': 44100,
+        'variable_ngrams': False
+    },
+    'variable': {
+        'min_freq': 50,
+        'max_freq': 200,
+        'freq_method': 'hash',
+        'base_duration': 1.0,
+        'duration_method': 'fixed',
+        'sample_rate': 44100,
+        'variable_ngrams': True,
+        'ngram_pattern': [3, 2, 4]  # Patrón: trigram, bigram, tetragrama, repetir...
+    },
+    'jazz': {
+        'min_freq': 40,
+        'max_freq': 300,
+        'freq_method': 'vowel_weight',
+        'base_duration': 0.28,
+        'duration_method': 'complexity',
+        'sample_rate': 44100,
+        'variable_ngrams': True,
+        'ngram_pattern': [2, 3, 5, 1, 4]  # Patrón más complejo para variación rítmica
+    },
+    'polyphony': {
+        'sample_rate': 44100,
+        'multi_voice': True,
+        # Bajo
+        'bass_pattern': [2, 3],
+        'bass_min_freq': 30,
+        'bass_max_freq': 150,
+        'bass_freq_method': 'hash',
+        'bass_duration': 1.5,
+        'bass_duration_method': 'fixed',
+        'bass_volume': 0.8,
+        'bass_waveform': 'square',  # Onda cuadrada para bajo (más potente)
+        # Melodía
+        'melody_pattern': [3, 2, 4],
+        'melody_min_freq': 150,
+        'melody_max_freq': 400,
+        'melody_freq_method': 'vowel_weight',
+        'melody_duration': 0.8,
+        'melody_duration_method': 'complexity',
+        'melody_volume': 1.0,
+        'melody_waveform': 'sine'  # Onda sinusoidal para melodía (más suave)
+    },
+    'orchestra': {
+        'sample_rate': 44100,
+        'multi_voice': True,
+        'use_atmosphere': True,
+        # Bajo (estructura HTML con onda cuadrada)
+        'bass_pattern': [2, 3],
+        'bass_min_freq': 30,
+        'bass_max_freq': 120,
+        'bass_freq_method': 'hash',
+        'bass_duration': 1.8,
+        'bass_duration_method': 'fixed',
+        'bass_volume': 0.7,
+        'bass_waveform': 'square',
+        # Melodía (texto con onda triangular)
+        'melody_pattern': [3, 2, 4],
+        'melody_min_freq': 150,
+        'melody_max_freq': 350,
+        'melody_freq_method': 'vowel_weight',
+        'melody_duration': 0.7,
+        'melody_duration_method': 'complexity',
+        'melody_volume': 0.9,
+        'melody_waveform': 'triangle',
+        # Atmósfera (números con onda sierra)
+        'atmosphere_pattern': [4, 2],
+        'atmosphere_min_freq': 200,
+        'atmosphere_max_freq': 500,
+        'atmosphere_freq_method': 'ascii_sum',
+        'atmosphere_duration': 0.5,
+        'atmosphere_duration_method': 'length',
+        'atmosphere_volume': 0.6,
+        'atmosphere_waveform': 'sawtooth'
+    },
+    'lofi': {
+        'sample_rate': 44100,
+        'multi_voice': True,
+        # Bajo con onda triangular suave
+        'bass_pattern': [3, 2],
+        'bass_min_freq': 40,
+        'bass_max_freq': 120,
+        'bass_freq_method': 'hash',
+        'bass_duration': 1.2,
+        'bass_duration_method': 'fixed',
+        'bass_volume': 0.7,
+        'bass_waveform': 'triangle',
+        # Melodía con onda sinusoidal
+        'melody_pattern': [2, 4, 3],
+        'melody_min_freq': 120,
+        'melody_max_freq': 320,
+        'melody_freq_method': 'vowel_weight',
+        'melody_duration': 0.9,
+        'melody_duration_method': 'complexity',
+        'melody_volume': 0.8,
+        'melody_waveform': 'sine'
+    }
+}
+
+def select_config(config_name='default', sample_rate=None):
+    """Configuración `config_name`; la frecuencia de muestreo indicada sustituye a la suya."""
+    selected_config = configs.get(config_name, configs['default'])
+    if sample_rate is not None:
+        selected_config = {**selected_config, 'sample_rate': resolve_sample_rate(sample_rate)}
+    return selected_config
+
+@stage_timings.timed('map')
+def build(html_content, config_name='default', sample_rate=None, dtype='float64', seed=None,
+          oscillator='exact'):
+    """Construye la pipeline de la variante con la configuración indicada."""
+    selected_config = select_config(config_name, sample_rate)
+    dtype, oscillator = resolve_dtype(dtype), resolve_oscillator(oscillator)
+
+    # Generar el audio con la configuración seleccionada
+    if selected_config.get('multi_voice', False):
+        return multi_voice_text_pipeline(html_content, selected_config, dtype, seed, oscillator)
+    return text_pipeline(html_content, selected_config, dtype, oscillator)
+
+def build_incremental(chunks, config_name='default', sample_rate=None, dtype='float64', seed=None,
+                      oscillator='exact'):
+    """Como `build`, pero sobre el texto por trozos: una pipeline por trozo a medida que llega.
+
+    Los ngrams que cruzan la frontera entre trozos se completan con el
+    siguiente, así que el audio es idéntico al de `build`. Las
+    configuraciones multivoz mezclan y normalizan el texto entero (y
+    derivan la semilla de él), así que lo leen completo antes de construir.
+    """
+    selected_config = select_config(config_name, sample_rate)
+    dtype, oscillator = resolve_dtype(dtype), resolve_oscillator(oscillator)
+
+    if selected_config.get('multi_voice', False):
+        yield multi_voice_text_pipeline(''.join(chunks), selected_config, dtype, seed, oscillator)
+        return
+    if selected_config.get('variable_ngrams', False):
+        batches = stream_variable_ngrams(chunks, selected_config.get('ngram_pattern', [3, 2, 4]))
+    else:
+        batches = stream_ngrams(chunks, selected_config['ngram_size'])
+    for ngrams in batches:
+        yield ngram_pipeline(ngrams, selected_config, dtype, oscillator)
+
+def render(html_content, output_file, config_name='default', stream=False, dtype='float64',
+           sample_rate=None, encoding='pcm16', seed=None, workers=1, oscillator='exact'):
+    """Sonifica el contenido HTML con la configuración indicada y lo guarda como WAV."""
+    pipeline = build(html_content, config_name, sample_rate, dtype, seed, oscillator)
+    write_wav(output_file, pipeline, stream, encoding=encoding, workers=workers)
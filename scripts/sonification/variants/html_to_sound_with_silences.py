@@ -0,0 +1,81 @@
+import numpy as np
+from sonification.envelopes import apply_envelope
+from sonification.mappers import OCTAVE_4, char_notes
+from sonification.oscillators import harmonic_tone
+from sonification.pipeline import Normalize, Pipeline, resolve_dtype, resolve_sample_rate, to_pcm16
+from sonification.profiling import stage_timings
+from sonification.timeline import Timeline
+from sonification.wavetable import resolve_oscillator
+from sonification.wavfile import write_wav
+from sonification.cache import note_cache
+
+def text_to_frequencies_with_rhythm(text):
+    """Convierte texto a frecuencias y duraciones"""
+    char_to_freq = char_notes(text, list(OCTAVE_4.values()))
+    
+    # Lista de tuplas (frecuencia, duración, silencio)
+    musical_sequence = []
+    
+    for char in text:
+        freq = char_to_freq[char]
+        
+        # Diferentes duraciones según el tipo de carácter
+        if char in '.,;!?':  # Puntuación
+            duration = 0.1    # Nota corta
+            silence = 0.2     # Silencio largo
+        elif char.isspace():  # Espacios
+            duration = 0.05   # Nota muy corta
+            silence = 0.15    # Silencio medio
+        elif char in '<>/:':  # Caracteres HTML
+            duration = 0.15   # Nota media
+            silence = 0.05    # Silencio corto
+        else:                 # Otros caracteres
+            duration = 0.2    # Nota normal
+            silence = 0.05    # Silencio corto
+            
+        musical_sequence.append((freq, duration, silence))
+    
+    return musical_sequence
+
+@note_cache.memoize("with_silences")
+def generate_piano_wave(frequency, duration=0.1, sample_rate=44100, instrument_type="piano", dtype=np.float64,
+                        oscillator='exact'):
+    """Genera un sonido con la envolvente especificada"""
+    t = np.linspace(0, duration, int(sample_rate * duration), endpoint=False, dtype=dtype)
+    
+    # Generar onda base con armónicos
+    wave = harmonic_tone(frequency, t, [0.5, 0.25, 0.125], oscillator, sample_rate)
+    
+    # Aplicar la envolvente seleccionada
+    wave = apply_envelope(wave, instrument_type, sample_rate)
+    
+    return wave
+
+def rhythm_pipeline(musical_sequence, sample_rate=44100, dtype=np.float64, oscillator='exact'):
+    """Construye la pipeline: notas seguidas de silencios y normalización."""
+    # Cada evento ocupa la nota más su silencio; el silencio queda a cero en el buffer
+    lengths = [int(sample_rate * duration) + int(silence_duration * sample_rate)
+               for _, duration, silence_duration in musical_sequence]
+    timeline = Timeline(musical_sequence, lengths,
+                        lambda event: generate_piano_wave(event[0], event[1], sample_rate, dtype=dtype,
+                                                          oscillator=oscillator),
+                        dtype=dtype)
+    return Pipeline(timeline, [Normalize()], sample_rate)
+
+def generate_wave_with_rhythm(musical_sequence, sample_rate=44100):
+    """Genera audio con diferentes duraciones y silencios"""
+    audio = rhythm_pipeline(musical_sequence, sample_rate).render()
+    return to_pcm16(audio)
+
+@stage_timings.timed('map')
+def build(html_content, sample_rate=44100, dtype='float64', seed=None, oscillator='exact'):
+    """Construye la pipeline de la variante para el contenido HTML."""
+    frequencies = text_to_frequencies_with_rhythm(html_content)
+    return rhythm_pipeline(frequencies, sample_rate=resolve_sample_rate(sample_rate), dtype=resolve_dtype(dtype),
+                           oscillator=resolve_oscillator(oscillator))
+
+def render(html_content, output_file, stream=False, dtype='float64', sample_rate=44100, encoding='pcm16',
+           seed=None, workers=1, oscillator='exact'):
+    """Sonifica el contenido HTML y lo guarda como WAV."""
+    pipeline = build(html_content, sample_rate, dtype, seed, oscillator)
+    write_wav(output_file, pipeline, stream, encoding=encoding, workers=workers)
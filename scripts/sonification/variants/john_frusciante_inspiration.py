@@ -0,0 +1,76 @@
+import numpy as np
+from sonification.envelopes import envelope_bank
+from sonification.mappers import OCTAVE_4_5
+from sonification.oscillators import sine
+from sonification.pipeline import Normalize, Pipeline, resolve_dtype, resolve_sample_rate, to_pcm16
+from sonification.profiling import stage_timings
+from sonification.randomness import make_rng
+from sonification.reverb import ConvolutionMix
+from sonification.timeline import Timeline
+from sonification.wavetable import resolve_oscillator, wavetable
+from sonification.wavfile import write_wav
+
+def text_to_frequencies(text, rng=None):
+    """Asigna frecuencias y duraciones a los caracteres."""
+    rng = make_rng(None, text) if rng is None else rng
+    notes = list(OCTAVE_4_5.values())
+    durations = [0.15, 0.3, 0.45, 0.6]  # Corcheas, negras, blancas
+    
+    unique_chars = sorted(set(text))
+    chosen_durations = rng.choice(durations, size=len(unique_chars)).tolist()
+    char_to_freq = {char: (notes[i % len(notes)], chosen_durations[i]) 
+                    for i, char in enumerate(unique_chars)}
+    
+    return [char_to_freq[char] for char in text]
+
+def fade_window(samples):
+    """Ventana que sube y baja: producto de una rampa de subida y otra de bajada."""
+    return np.linspace(0, 1, samples) * np.linspace(1, 0, samples)
+
+def note_envelope(samples, sample_rate):
+    """Envolvente de una nota: un solo tramo, la ventana de su duración."""
+    return [(fade_window, samples)]
+
+def wave_pipeline(frequencies, sample_rate=44100, dtype=np.float64, oscillator='exact'):
+    """Construye la pipeline: notas con vibrato, reverb simulada y normalización."""
+    def render_note(note):
+        freq, duration = note
+        t = np.linspace(0, duration, int(sample_rate * duration), endpoint=False, dtype=dtype)
+        # Ligero vibrato; la fase se calcula en el mismo buffer
+        wave = sine(2 * np.pi * 5, t)
+        wave *= 3
+        wave += freq
+        if oscillator == 'wavetable':
+            wave = wavetable('sine')(wave, t)
+        else:
+            wave *= 2 * np.pi
+            wave *= t
+            np.sin(wave, out=wave)
+        envelope_bank.apply(wave, note_envelope, sample_rate)  # Suavizar inicio y final
+        return wave
+    
+    lengths = [int(sample_rate * duration) for _, duration in frequencies]
+    # Media móvil de 500 muestras a 44,1 kHz; misma duración a otras frecuencias
+    smoothing_samples = max(1, sample_rate * 500 // 44100)
+    return Pipeline(Timeline(frequencies, lengths, render_note, dtype=dtype), [
+        ConvolutionMix(np.ones(smoothing_samples) / smoothing_samples, dry=0.6, wet=0.4),  # Reverb simulada
+        Normalize(),
+    ], sample_rate)
+
+def generate_wave(frequencies, sample_rate=44100):
+    """Genera una señal de audio con envolvente suave y vibrato."""
+    audio = wave_pipeline(frequencies, sample_rate).render()
+    return to_pcm16(audio)
+
+@stage_timings.timed('map')
+def build(html_content, sample_rate=44100, dtype='float64', seed=None, oscillator='exact'):
+    """Construye la pipeline de la variante para el contenido HTML."""
+    frequencies = text_to_frequencies(html_content, make_rng(seed, html_content))
+    return wave_pipeline(frequencies, sample_rate=resolve_sample_rate(sample_rate), dtype=resolve_dtype(dtype),
+                         oscillator=resolve_oscillator(oscillator))
+
+def render(html_content, output_file, stream=False, dtype='float64', sample_rate=44100, encoding='pcm16',
+           seed=None, workers=1, oscillator='exact'):
+    """Sonifica el contenido HTML y lo guarda como WAV."""
+    pipeline = build(html_content, sample_rate, dtype, seed, oscillator)
+    write_wav(output_file, pipeline, stream, encoding=encoding, workers=workers)
@@ -0,0 +1,102 @@
+import numpy as np
+from sonification.envelopes import constant, envelope_bank, ramp
+from sonification.mappers import char_notes, musical_frequencies
+from sonification.oscillators import piano_tone
+from sonification.pipeline import Crossfades, Normalize, Pipeline, resolve_dtype, resolve_sample_rate, to_pcm16
+from sonification.profiling import stage_timings
+from sonification.randomness import make_rng
+from sonification.timeline import Timeline
+from sonification.wavetable import resolve_oscillator
+from sonification.wavfile import write_wav
+from sonification.cache import note_cache
+
+# Asignamos duraciones musicales (en proporción a un pulso base)
+RHYTHM_MAP = {
+    "whole": 1.0,    # Redonda
+    "half": 0.5,     # Blanca
+    "quarter": 0.25, # Negra
+    "eighth": 0.125, # Corchea
+    "sixteenth": 0.0625  # Semicorchea
+}
+
+# Caracteres de silencio (con duraciones específicas)
+SILENCE_CHARS = {' ': "eighth", '\n': "quarter", '\t': "quarter", '.': "quarter", ',': "eighth", ';': "eighth", '!': "quarter", '?': "quarter"}
+
+def text_to_frequencies_and_durations(text, rng=None):
+    """Convierte texto en notas musicales con duraciones asignadas."""
+    rng = make_rng(None, text) if rng is None else rng
+    char_to_freq = char_notes(text, list(musical_frequencies().values()))
+    unique_chars = sorted(set(text))
+
+    # Asignamos duraciones según la frecuencia del carácter
+    chosen_durations = rng.choice(
+        ["sixteenth", "eighth", "quarter", "half"],
+        size=len(unique_chars),
+        p=[0.1, 0.3, 0.5, 0.1]  # Priorizamos negras y corcheas
+    ).tolist()
+    durations = dict(zip(unique_chars, chosen_durations))
+
+    sequence = []
+    for char in text:
+        if char in SILENCE_CHARS:
+            sequence.append((0, RHYTHM_MAP[SILENCE_CHARS[char]]))  # Silencio con duración específica
+        else:
+            sequence.append((char_to_freq[char], RHYTHM_MAP[durations[char]]))
+
+    return sequence
+
+def piano_envelope(samples, sample_rate):
+    """Tramos de la envolvente, con sus duraciones como porcentajes del total."""
+    attack_samples = max(1, int(samples * 0.2))    # 20% para attack
+    release_samples = max(1, int(samples * 0.3))   # 30% para release
+    sustain_samples = samples - attack_samples - release_samples  # 50% restante
+
+    # Aseguramos que sustain_samples sea al menos 1
+    sustain_samples = max(1, sustain_samples)
+
+    return [(ramp, 0, 1, attack_samples), (constant, 1.0, sustain_samples), (ramp, 1, 0, release_samples)]
+
+@note_cache.memoize("piano_with_rythm")
+def generate_piano_wave(frequency, duration=0.25, sample_rate=44100, dtype=np.float64, oscillator='exact'):
+    """Genera una onda sinusoidal con envolvente suave."""
+    t = np.linspace(0, duration, int(sample_rate * duration), endpoint=False, dtype=dtype)
+
+    if frequency == 0:
+        return np.zeros_like(t)  # Silencio
+
+    wave = piano_tone(frequency, t, [0.15, 0.1, 0.05, 0.05], oscillator, sample_rate)
+
+    envelope_bank.apply(wave, piano_envelope, sample_rate)
+    wave *= 0.7  # Reducimos la amplitud para evitar saturación
+    return wave
+
+def wave_pipeline(frequencies_and_durations, sample_rate=44100, fade_duration=0.02, dtype=np.float64,
+                  oscillator='exact'):
+    """Construye la pipeline: notas, fundidos entre notas y normalización."""
+    lengths = [int(sample_rate * duration) for _, duration in frequencies_and_durations]
+    timeline = Timeline(frequencies_and_durations, lengths,
+                        lambda note: generate_piano_wave(note[0], note[1], sample_rate, dtype, oscillator), dtype=dtype)
+    return Pipeline(timeline, [
+        # Aplicamos el fundido cruzado en cada frontera entre notas
+        Crossfades(timeline.offsets, timeline.lengths, int(sample_rate * fade_duration)),
+        # Normalizar para evitar distorsión
+        Normalize(),
+    ], sample_rate)
+
+def generate_wave(frequencies_and_durations, sample_rate=44100, fade_duration=0.02):
+    """Genera una señal de audio con transiciones suaves entre notas y ritmo natural."""
+    audio = wave_pipeline(frequencies_and_durations, sample_rate, fade_duration).render()
+    return to_pcm16(audio)
+
+@stage_timings.timed('map')
+def build(html_content, sample_rate=44100, dtype='float64', seed=None, oscillator='exact'):
+    """Construye la pipeline de la variante para el contenido HTML."""
+    frequencies_and_durations = text_to_frequencies_and_durations(html_content, make_rng(seed, html_content))
+    return wave_pipeline(frequencies_and_durations, sample_rate=resolve_sample_rate(sample_rate), dtype=resolve_dtype(dtype),
+                         oscillator=resolve_oscillator(oscillator))
+
+def render(html_content, output_file, stream=False, dtype='float64', sample_rate=44100, encoding='pcm16',
+           seed=None, workers=1, oscillator='exact'):
+    """Sonifica el contenido HTML y lo guarda como WAV."""
+    pipeline = build(html_content, sample_rate, dtype, seed, oscillator)
+    write_wav(output_file, pipeline, stream, encoding=encoding, workers=workers)
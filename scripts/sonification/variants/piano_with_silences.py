@@ -0,0 +1,82 @@
+import numpy as np
+from sonification.envelopes import constant, envelope_bank, ramp
+from sonification.mappers import char_notes, musical_frequencies
+from sonification.oscillators import piano_tone
+from sonification.pipeline import Crossfades, Normalize, Pipeline, resolve_dtype, resolve_sample_rate, to_pcm16
+from sonification.profiling import stage_timings
+from sonification.timeline import Timeline
+from sonification.wavetable import resolve_oscillator
+from sonification.wavfile import write_wav
+from sonification.cache import note_cache
+
+SILENCE_CHARS = {' ': 0.1, '\n': 0.15, '\t': 0.12, '.': 0.08, ',': 0.08, ';': 0.08, '!': 0.1, '?': 0.1}
+
+def text_to_frequencies(text):
+    """Asigna frecuencias musicales a caracteres con distribución en varias octavas."""
+    char_to_freq = char_notes(text, list(musical_frequencies().values()))
+
+    sequence = []
+    for char in text:
+        if char in SILENCE_CHARS:
+            sequence.append(0)  # Silencio más corto
+        else:
+            sequence.append(char_to_freq[char])
+
+    return sequence
+
+def piano_envelope(samples, sample_rate):
+    """Tramos de la envolvente suave, para eliminar cortes bruscos."""
+    attack_time = 0.02
+    release_time = 0.1
+
+    attack_samples = int(sample_rate * attack_time)
+    release_samples = int(sample_rate * release_time)
+    sustain_samples = samples - attack_samples - release_samples
+
+    return [(ramp, 0, 1, attack_samples), (constant, 1.0, sustain_samples), (ramp, 1, 0, release_samples)]
+
+@note_cache.memoize("piano_with_silences")
+def generate_piano_wave(frequency, duration=0.25, sample_rate=44100, dtype=np.float64, oscillator='exact'):
+    """Genera una onda sinusoidal con envolvente suave."""
+    t = np.linspace(0, duration, int(sample_rate * duration), endpoint=False, dtype=dtype)
+
+    if frequency == 0:
+        return np.zeros_like(t)  # Silencio
+
+    wave = piano_tone(frequency, t, [0.15, 0.1, 0.05, 0.05], oscillator, sample_rate)
+
+    # Envolvente más suave para eliminar cortes bruscos
+    envelope_bank.apply(wave, piano_envelope, sample_rate)
+    wave *= 0.7  # Reducimos la amplitud para evitar saturación
+    return wave
+
+def wave_pipeline(frequencies, sample_rate=44100, fade_duration=0.02, dtype=np.float64, oscillator='exact'):
+    """Construye la pipeline: notas, fundidos entre notas y normalización."""
+    durations = [SILENCE_CHARS.get(freq, 0.25) for freq in frequencies]
+    lengths = [int(sample_rate * duration) for duration in durations]
+    timeline = Timeline(list(zip(frequencies, durations)), lengths,
+                        lambda note: generate_piano_wave(note[0], note[1], sample_rate, dtype, oscillator), dtype=dtype)
+    return Pipeline(timeline, [
+        # Aplicamos el fundido cruzado en cada frontera entre notas
+        Crossfades(timeline.offsets, timeline.lengths, int(sample_rate * fade_duration)),
+        # Normalizar para evitar distorsión
+        Normalize(),
+    ], sample_rate)
+
+def generate_wave(frequencies, sample_rate=44100, fade_duration=0.02):
+    """Genera una señal de audio con transiciones suaves entre notas."""
+    audio = wave_pipeline(frequencies, sample_rate, fade_duration).render()
+    return to_pcm16(audio)
+
+@stage_timings.timed('map')
+def build(html_content, sample_rate=44100, dtype='float64', seed=None, oscillator='exact'):
+    """Construye la pipeline de la variante para el contenido HTML."""
+    frequencies = text_to_frequencies(html_content)
+    return wave_pipeline(frequencies, sample_rate=resolve_sample_rate(sample_rate), dtype=resolve_dtype(dtype),
+                         oscillator=resolve_oscillator(oscillator))
+
+def render(html_content, output_file, stream=False, dtype='float64', sample_rate=44100, encoding='pcm16',
+           seed=None, workers=1, oscillator='exact'):
+    """Sonifica el contenido HTML y lo guarda como WAV."""
+    pipeline = build(html_content, sample_rate, dtype, seed, oscillator)
+    write_wav(output_file, pipeline, stream, encoding=encoding, workers=workers)
@@ -0,0 +1,165 @@
+import numpy as np
+
+from sonification.timeline import note_offsets
+
+# Muestras que se sintetizan de una vez: suficiente para amortizar NumPy
+# sin disparar la memoria de los bloques intermedios (notas x muestras)
+BLOCK_SAMPLES = 1 << 21
+
+# Tamaño máximo de la tabla de notas distintas (~64 MB en float64)
+TABLE_SAMPLES = 1 << 23
+
+
+def sine_notes(freqs, t):
+    """Senoidal de cada frecuencia (columna) sobre la fila de tiempos, en el sitio."""
+    phase = 2 * np.pi * freqs * t
+    return np.sin(phase, out=phase)
+
+
+class FixedNotes:
+    """Notas de duración fija sintetizadas como un bloque 2D (notas x muestras).
+
+    `synthesize(freqs, t)` recibe una columna de frecuencias (k, 1) y la fila
+    de tiempos (1, n) y devuelve las k notas de una vez por broadcasting.
+    Como el texto se mapea a pocas frecuencias distintas, cada una se
+    sintetiza una sola vez y el resultado se reparte con un gather.
+    """
+
+    def __init__(self, frequencies, t, synthesize, block_samples=BLOCK_SAMPLES):
+        # Las frecuencias se calculan en la misma precisión que `t`
+        self.frequencies = np.asarray(frequencies, dtype=t.dtype)
+        self.t = t
+        self.synthesize = synthesize
+        self.note_samples = len(t)
+        self.total_samples = len(self.frequencies) * self.note_samples
+        self.block_notes = max(1, block_samples // max(1, self.note_samples))
+        self._table = None
+
+    def _notes_table(self):
+        if self._table is None:
+            unique_freqs, inverse = np.unique(self.frequencies, return_inverse=True)
+            if len(unique_freqs) * self.note_samples > TABLE_SAMPLES:
+                self._table = (None, None)
+            else:
+                self._table = (self.synthesize(unique_freqs[:, None], self.t[None, :]), inverse)
+        return self._table
+
+    def render_block(self, start, stop):
+        """Devuelve las muestras [start, stop) de la secuencia."""
+        if self.note_samples == 0:
+            return np.zeros(0, dtype=self.t.dtype)
+        first = start // self.note_samples
+        last = -(-stop // self.note_samples)
+
+        table, inverse = self._notes_table()
+        notes = np.empty((last - first, self.note_samples), dtype=self.t.dtype)
+        for block_start in range(first, last, self.block_notes):
+            block_stop = min(last, block_start + self.block_notes)
+            out = notes[block_start - first:block_stop - first]
+            if table is None:
+                out[:] = self.synthesize(self.frequencies[block_start:block_stop, None], self.t[None, :])
+            else:
+                np.take(table, inverse[block_start:block_stop], axis=0, out=out)
+
+        offset = first * self.note_samples
+        return notes.reshape(-1)[start - offset:stop - offset]
+
+
+def _segment_index(offsets, lengths, first, last):
+    """Posición de cada muestra del bloque dentro de su nota (repeat/cumsum)."""
+    block_lengths = lengths[first:last]
+    block_start = offsets[first]
+    position = np.arange(block_lengths.sum()) - np.repeat(offsets[first:last] - block_start, block_lengths)
+    return block_start, block_lengths, position
+
+
+def _note_blocks(offsets, lengths, first, last, block_samples):
+    """Agrupa las notas [first, last) en bloques de unas `block_samples` muestras."""
+    if last <= first:
+        return []
+    starts = np.searchsorted(offsets, np.arange(offsets[first], offsets[last - 1] + lengths[last - 1], block_samples),
+                             side='right') - 1
+    starts = np.unique(np.clip(starts, first, last - 1))
+    starts[0] = first
+    return zip(starts, np.append(starts[1:], last))
+
+
+class VariableNotes:
+    """Notas de duración variable sintetizadas sin bucle por nota.
+
+    Las notas se agrupan en bloques de unas `block_samples` muestras. Dentro
+    de cada bloque se calcula, por repeat/cumsum, a qué nota pertenece cada
+    muestra y su posición dentro de ella; `synthesize(notes, position)`
+    devuelve el bloque completo a partir de esos dos arrays de índices.
+
+    Si se pasan `keys` (una fila por nota, p. ej. frecuencia y duración), las
+    notas iguales se sintetizan una sola vez y se copian con un gather.
+    """
+
+    def __init__(self, lengths, synthesize, keys=None, block_samples=BLOCK_SAMPLES, dtype=np.float64):
+        self.dtype = dtype
+        self.lengths = np.asarray(lengths, dtype=np.int64)
+        self.offsets, self.total_samples = note_offsets(self.lengths)
+        self.synthesize = synthesize
+        self.keys = keys
+        self.block_samples = block_samples
+        self._table = None
+
+    def _synthesize_notes(self, note_ids, lengths, offsets, first, last):
+        audio = np.empty(lengths[first:last].sum(), dtype=self.dtype)
+        base = offsets[first] if last > first else 0
+        for block_first, block_last in _note_blocks(offsets, lengths, first, last, self.block_samples):
+            block_start, block_lengths, position = _segment_index(offsets, lengths, block_first, block_last)
+            notes = np.repeat(note_ids[block_first:block_last], block_lengths)
+            audio[block_start - base:block_start - base + len(position)] = self.synthesize(notes, position)
+        return audio
+
+    def _notes_table(self):
+        if self._table is None:
+            self._table = (None, None, None)
+            if self.keys is not None and len(self.lengths):
+                _, representatives, inverse = np.unique(
+                    np.asarray(self.keys).reshape(len(self.lengths), -1),
+                    axis=0, return_index=True, return_inverse=True
+                )
+                table_lengths = self.lengths[representatives]
+                if table_lengths.sum() <= TABLE_SAMPLES:
+                    table_offsets, _ = note_offsets(table_lengths)
+                    table = self._synthesize_notes(representatives, table_lengths, table_offsets,
+                                                   0, len(representatives))
+                    self._table = (table, table_offsets, inverse.reshape(-1))
+        return self._table
+
+    def render_block(self, start, stop):
+        """Devuelve las muestras [start, stop) de la secuencia."""
+        first = max(0, np.searchsorted(self.offsets, start, side='right') - 1)
+        last = np.searchsorted(self.offsets, stop, side='left')
+        if last <= first:
+            return np.zeros(stop - start, dtype=self.dtype)
+
+        table, table_offsets, inverse = self._notes_table()
+        if table is None:
+            audio = self._synthesize_notes(np.arange(len(self.lengths)), self.lengths, self.offsets, first, last)
+        else:
+            audio = np.empty(self.lengths[first:last].sum(), dtype=self.dtype)
+            for block_first, block_last in _note_blocks(self.offsets, self.lengths, first, last, self.block_samples):
+                block_start, block_lengths, position = _segment_index(self.offsets, self.lengths,
+                                                                      block_first, block_last)
+                source = np.repeat(table_offsets[inverse[block_first:block_last]], block_lengths) + position
+                block_start -= self.offsets[first]
+                np.take(table, source, out=audio[block_start:block_start + len(source)])
+
+        offset = self.offsets[first]
+        return audio[start - offset:stop - offset]
+
+
+def render_fixed(frequencies, t, synthesize, block_samples=BLOCK_SAMPLES):
+    """Sintetiza de una vez todas las notas de duración fija."""
+    notes = FixedNotes(frequencies, t, synthesize, block_samples)
+    return notes.render_block(0, notes.total_samples)
+
+
+def render_variable(lengths, synthesize, keys=None, block_samples=BLOCK_SAMPLES, dtype=np.float64):
+    """Sintetiza de una vez todas las notas de duración variable."""
+    notes = VariableNotes(lengths, synthesize, keys, block_samples, dtype)
+    return notes.render_block(0, notes.total_samples)
@@ -0,0 +1,131 @@
+import functools
+
+import numpy as np
+
+OSCILLATORS = ('exact', 'wavetable')
+
+# Muestras por ciclo de cada tabla (potencia de dos: la fase se envuelve con una máscara)
+TABLE_SIZE = 2048
+
+# Muestras de la tabla de ruido (unos 3 s a 44,1 kHz; cada nota empieza en un punto distinto)
+NOISE_TABLE_SIZE = 1 << 17
+
+# Formas de onda básicas con su serie de Fourier
+WAVEFORMS = ('sine', 'square', 'sawtooth', 'triangle')
+
+
+def resolve_oscillator(oscillator):
+    """Valida el oscilador: 'exact' (la fórmula de cada muestra) o 'wavetable' (tablas de un ciclo)."""
+    if oscillator not in OSCILLATORS:
+        raise ValueError(f"Unsupported oscillator: {oscillator}")
+    return oscillator
+
+
+class Wavetable:
+    """Forma de onda de un ciclo, limitada en banda, leída con interpolación lineal.
+
+    `sines[k - 1]` y `cosines[k - 1]` son las amplitudes del armónico k. Se
+    guarda un nivel por cada potencia de dos de armónicos (el nivel `i`
+    llega hasta el armónico 2**i); cada nota lee el más alto que queda por
+    debajo de Nyquist, así que las formas ricas en armónicos no producen
+    aliasing. Leer una muestra es un acceso a la tabla en lugar de una
+    llamada a `np.sin` por armónico.
+    """
+
+    def __init__(self, sines=(), cosines=()):
+        harmonics = max(len(sines), len(cosines))
+        if not 1 <= harmonics <= TABLE_SIZE // 2:
+            raise ValueError(f"Unsupported number of harmonics: {harmonics}")
+
+        # Espectro de `np.fft.irfft`: el bin k da cos(k x) con su parte real y -sin(k x) con la imaginaria
+        spectrum = np.zeros(TABLE_SIZE // 2 + 1, dtype=np.complex128)
+        spectrum[1:len(cosines) + 1] += cosines
+        spectrum[1:len(sines) + 1] -= 1j * np.asarray(sines, dtype=np.float64)
+        spectrum *= TABLE_SIZE / 2
+
+        levels = (harmonics - 1).bit_length() + 1
+        # Una muestra de guarda al final para interpolar sin envolver el índice siguiente
+        self.tables = np.empty((levels, TABLE_SIZE + 1))
+        for level in range(levels):
+            limited = spectrum.copy()
+            limited[2 ** level + 1:] = 0
+            self.tables[level, :-1] = np.fft.irfft(limited, TABLE_SIZE)
+        self.tables[:, -1] = self.tables[:, 0]
+        self._flat = {}
+
+    def _flat_tables(self, dtype):
+        if dtype not in self._flat:
+            self._flat[dtype] = self.tables.astype(dtype).reshape(-1)
+        return self._flat[dtype]
+
+    def __call__(self, frequency, t, sample_rate=None):
+        """Muestras de la onda a `frequency` Hz en los instantes `t` (con broadcasting, como `np.sin`).
+
+        Sin `sample_rate` se usan todos los armónicos de la tabla.
+        """
+        dtype = np.result_type(t, np.float32)
+        # Fase en muestras de la tabla: parte entera para el índice, fracción para interpolar
+        phase = np.multiply(frequency, t, dtype=dtype)
+        phase *= TABLE_SIZE
+        index = phase.astype(np.intp)
+        phase -= index
+        index &= TABLE_SIZE - 1
+
+        if len(self.tables) > 1:
+            level = len(self.tables) - 1
+            if sample_rate is not None:
+                # Nivel cuyo armónico más alto no pasa de Nyquist
+                with np.errstate(divide='ignore'):
+                    level = np.log2(sample_rate / 2 / np.asarray(frequency, dtype=np.float64))
+                level = np.clip(np.floor(level), 0, len(self.tables) - 1).astype(np.intp)
+            index += level * (TABLE_SIZE + 1)
+
+        tables = self._flat_tables(dtype)
+        wave = np.take(tables, index + 1)
+        low = np.take(tables, index)
+        wave -= low
+        wave *= phase
+        wave += low
+        return wave
+
+
+@functools.lru_cache(maxsize=None)
+def wavetable(waveform):
+    """Tabla de una forma de onda básica, en fase con su fórmula exacta (ver `WAVEFORMS`)."""
+    harmonics = np.arange(1, TABLE_SIZE // 2 + 1)
+    odd = harmonics % 2 == 1
+    if waveform == 'sine':
+        return Wavetable(sines=[1.0])
+    if waveform == 'square':
+        # sign(sin(x))
+        return Wavetable(sines=np.where(odd, 4 / (np.pi * harmonics), 0.0))
+    if waveform == 'sawtooth':
+        # 2 * (x - floor(0.5 + x)), con x en ciclos
+        return Wavetable(sines=np.where(odd, 1.0, -1.0) * 2 / (np.pi * harmonics))
+    if waveform == 'triangle':
+        # 2 * |sawtooth| - 1
+        return Wavetable(cosines=np.where(odd, -8 / (np.pi * harmonics) ** 2, 0.0))
+    raise ValueError(f"Unknown waveform: {waveform}")
+
+
+@functools.lru_cache(maxsize=None)
+def harmonic_wavetable(partials):
+    """Tabla de un timbre de armónicos enteros: `partials` son pares (armónico, amplitud) en seno."""
+    sines = np.zeros(max(harmonic for harmonic, _ in partials))
+    for harmonic, amplitude in partials:
+        sines[harmonic - 1] += amplitude
+    return Wavetable(sines=sines)
+
+
+@functools.lru_cache(maxsize=None)
+def noise_table(dtype=np.float64):
+    """Ruido blanco uniforme en [-1, 1) generado una sola vez (con semilla fija)."""
+    table = np.random.default_rng(0).uniform(-1, 1, NOISE_TABLE_SIZE).astype(dtype)
+    table.setflags(write=False)
+    return table
+
+
+def noise(samples, rng, dtype=np.float64):
+    """`samples` muestras de ruido leídas de la tabla desde un punto elegido con `rng`."""
+    start = int(rng.integers(NOISE_TABLE_SIZE))
+    return np.take(noise_table(np.dtype(dtype).type), np.arange(start, start + samples), mode='wrap')
@@ -0,0 +1,205 @@
+import os
+import sys
+import struct
+
+import numpy as np
+
+from sonification.encodings import make_encoder
+from sonification.pipeline import STREAM_BLOCK_SAMPLES, resolve_workers
+from sonification.profiling import stage_timings
+
+# Tamaño desconocido: valor habitual en WAV servidos en streaming
+UNKNOWN_SIZE = 0xFFFFFFFF
+
+
+def wav_header(encoder, sample_rate, data_bytes, samples):
+    """Cabecera RIFF/WAVE (chunks `fmt `, `fact` si hace falta y cabecera de `data`)."""
+    fmt_chunk = struct.pack(
+        '<HHIIHH', encoder.format_tag, 1, sample_rate,
+        encoder.bytes_per_second, encoder.block_align, encoder.bits_per_sample
+    )
+    if encoder.extra is not None:
+        fmt_chunk += struct.pack('<H', len(encoder.extra)) + encoder.extra
+    chunks = [b'fmt ', struct.pack('<I', len(fmt_chunk)), fmt_chunk]
+    if encoder.has_fact:
+        chunks += [b'fact', struct.pack('<II', 4, samples)]
+
+    # Los chunks ocupan un número par de bytes
+    riff_bytes = 4 + len(b''.join(chunks)) + 8 + data_bytes + data_bytes % 2
+    if data_bytes == UNKNOWN_SIZE:
+        riff_bytes = UNKNOWN_SIZE
+    return b''.join([
+        b'RIFF', struct.pack('<I', riff_bytes), b'WAVE',
+        *chunks,
+        b'data', struct.pack('<I', data_bytes),
+    ])
+
+
+class WavWriter:
+    """Escritor de WAV incremental: cabecera primero, datos por bloques.
+
+    Recibe muestras en [-1, 1] y las codifica con `encoding` (ver
+    `sonification.encodings`). Al cerrar se parchean los tamaños de la
+    cabecera RIFF; en PCM de 16 bits la salida es idéntica byte a byte a la
+    de `scipy.io.wavfile.write`. Si el destino no admite `seek` (stdout, una
+    tubería) la cabecera lleva tamaños desconocidos y cada bloque se vuelca
+    en cuanto se escribe.
+    """
+
+    def __init__(self, file, sample_rate, encoding='pcm16'):
+        self.encoder = make_encoder(encoding, sample_rate)
+        if file == '-':
+            self.file = sys.stdout.buffer
+            self._owns_file = False
+        elif hasattr(file, 'write'):
+            self.file = file
+            self._owns_file = False
+        else:
+            self.file = open(file, 'wb')
+            self._owns_file = True
+        self.sample_rate = sample_rate
+        self.data_bytes = 0
+        self.seekable = self._is_seekable()
+        self._write_header()
+
+    def _is_seekable(self):
+        try:
+            return self.file.seekable()
+        except (AttributeError, ValueError):
+            return False
+
+    def _header(self, data_bytes, samples):
+        return wav_header(self.encoder, self.sample_rate, data_bytes, samples)
+
+    def _write_header(self):
+        if self.seekable:
+            self.file.write(self._header(0, 0))
+        else:
+            self.file.write(self._header(UNKNOWN_SIZE, UNKNOWN_SIZE))
+
+    def _write_data(self, data):
+        if hasattr(data, 'dtype'):
+            data = data.astype(data.dtype.newbyteorder('<'), copy=False).tobytes()
+        if not data:
+            return
+        with stage_timings.measure('write'):
+            self.file.write(data)
+            if not self.seekable:
+                self.file.flush()
+        self.data_bytes += len(data)
+
+    def write(self, samples):
+        """Codifica y añade un bloque de muestras en [-1, 1] (puede modificarlo)."""
+        with stage_timings.measure('encode'):
+            data = self.encoder.encode(samples)
+        self._write_data(data)
+
+    def close(self):
+        """Parchea los tamaños de la cabecera y cierra el fichero."""
+        with stage_timings.measure('encode'):
+            data = self.encoder.flush()
+        self._write_data(data)
+        if self.data_bytes % 2:
+            self.file.write(b'\x00')
+        if self.seekable:
+            self.file.seek(0)
+            self.file.write(self._header(self.data_bytes, self.encoder.samples))
+            self.file.seek(0, 2)
+        if self._owns_file:
+            self.file.close()
+        else:
+            self.file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class MappedSamples:
+    """Muestras int16 del chunk `data` de un fichero ya dimensionado.
+
+    Cada tramo (`samples[start:stop]`) se mapea en memoria solo mientras se
+    escribe: las páginas quedan en la caché del sistema y no en la memoria
+    del proceso, sea cual sea la duración del audio.
+    """
+
+    def __init__(self, path, offset, samples):
+        self.path = path
+        self.offset = offset
+        self.samples = samples
+
+    def __len__(self):
+        return self.samples
+
+    def __getitem__(self, index):
+        start, stop, _ = index.indices(self.samples)
+        return np.memmap(self.path, dtype='<i2', mode='r+', offset=self.offset + 2 * start,
+                         shape=(max(0, stop - start),))
+
+
+def write_wav_memmap(output_file, pipeline, block_samples=STREAM_BLOCK_SAMPLES, workers=1):
+    """Escribe un WAV PCM de 16 bits renderizando directamente en el fichero mapeado en memoria.
+
+    La duración se conoce antes de sintetizar, así que el fichero se crea
+    con su tamaño final y cada bloque se cuantiza en su sitio del chunk
+    `data` (ver `MappedSamples`): no hay copia intermedia en bytes ni
+    `write` por bloque, y en paralelo cada proceso escribe sus segmentos
+    sin devolverlos. La salida es idéntica a la de `WavWriter`.
+    """
+    encoder = make_encoder('pcm16', pipeline.sample_rate)
+    samples = pipeline.total_samples
+    data_bytes = samples * encoder.block_align
+    header = wav_header(encoder, pipeline.sample_rate, data_bytes, samples)
+    with stage_timings.measure('write'), open(output_file, 'wb') as file:
+        file.write(header)
+        file.truncate(len(header) + data_bytes)
+    if samples:
+        pipeline.render_into(MappedSamples(output_file, len(header), samples), workers, block_samples)
+
+
+def write_wav(output_file, pipeline, stream=False, block_samples=STREAM_BLOCK_SAMPLES, encoding='pcm16',
+              workers=1):
+    """Renderiza la pipeline y la guarda como WAV (PCM de 16 bits por defecto).
+
+    Con `stream=True` se renderiza y escribe por bloques, de modo que la
+    memoria máxima no depende de la duración del audio; en PCM de 16 bits a
+    un fichero los bloques van directamente a un mapeo del fichero (ver
+    `write_wav_memmap`). Con `output_file='-'` el WAV se escribe en stdout,
+    siempre por bloques. Con `workers > 1` los bloques se renderizan en
+    paralelo en varios procesos.
+    """
+    workers = resolve_workers(workers)
+    if stream and encoding == 'pcm16' and isinstance(output_file, (str, os.PathLike)) and output_file != '-':
+        write_wav_memmap(output_file, pipeline, block_samples, workers)
+        return
+
+    with WavWriter(output_file, pipeline.sample_rate, encoding) as writer:
+        if workers > 1:
+            for block in pipeline.parallel_blocks(workers, block_samples):
+                writer.write(block)
+        elif stream or not writer.seekable:
+            for block in pipeline.blocks(block_samples):
+                writer.write(block)
+        else:
+            writer.write(pipeline.render())
+
+
+def write_wav_pipelines(output_file, pipelines, block_samples=STREAM_BLOCK_SAMPLES, encoding='pcm16'):
+    """Escribe en un solo WAV, una tras otra, las pipelines que va entregando `pipelines`.
+
+    El fichero se abre con la primera (que fija la frecuencia de muestreo)
+    y cada una se renderiza por bloques antes de pedir la siguiente, así
+    que la duración total no tiene por qué conocerse de antemano.
+    """
+    writer = None
+    try:
+        for pipeline in pipelines:
+            if writer is None:
+                writer = WavWriter(output_file, pipeline.sample_rate, encoding)
+            for block in pipeline.blocks(block_samples):
+                writer.write(block)
+    finally:
+        if writer is not None:
+            writer.close()
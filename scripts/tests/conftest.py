@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Los scripts importan el paquete como `sonification.*`, igual que al ejecutarlos desde scripts/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from sonification import cost
+from sonification.cost import JobTooLarge, MAX_WAV_BYTES, RunningBudget, output_bytes, plan_job
+from sonification.incremental import render_incremental
+from sonification.variants import get_variant
+
+
+def page(chars):
+    rng = np.random.default_rng(0)
+    return ''.join(rng.choice(list('abcdefghijklmnopqrstuvwxyz <>/.,0123456789'), chars))
+
+
+def test_output_bytes_follow_the_encoding():
+    assert output_bytes(44100, 44100) - output_bytes(0, 44100) == 88200
+    assert output_bytes(44100, 44100, 'mulaw') - output_bytes(0, 44100, 'mulaw') == 44100
+    assert output_bytes(44100, 44100, 'ima_adpcm') < output_bytes(44100, 44100, 'mulaw')
+
+
+def test_output_over_the_riff_limit_lowers_the_sample_rate():
+    options, estimate = plan_job(get_variant('html_to_sound_space'), page(100_000), output_file='-')
+    assert options['sample_rate'] < 44100
+    assert estimate['output_bytes'] <= MAX_WAV_BYTES
+
+
+def test_output_over_free_disk_is_rejected(monkeypatch, tmp_path):
+    monkeypatch.setattr(cost, 'free_disk_bytes', lambda output_file: 1024)
+    with pytest.raises(JobTooLarge, match='free disk space'):
+        plan_job(get_variant('html_to_sound'), page(100), output_file=str(tmp_path / 'out.wav'))
+
+
+def test_incremental_budget_stops_once_the_running_estimate_is_too_long():
+    variant = get_variant('html_to_sound')
+    budget = RunningBudget(variant, max_seconds=1e-3, output_file='-')
+    chunks = iter([page(1000), page(1000)])
+    with pytest.raises(JobTooLarge, match='render time'):
+        render_incremental(variant, chunks, '/dev/null', budget=budget)
+    assert budget.estimate['samples'] > 0
+
+
+def test_reverb_option_has_its_own_cost_model():
+    assert cost.cost_model('html_to_sound_piano_style', options={'reverb': 'schroeder'}) \
+        is cost.COST_MODELS['html_to_sound_piano_style[schroeder]']
+    assert cost.cost_model('html_to_sound_piano_style', options={'reverb': 'echo'}) \
+        is cost.COST_MODELS['html_to_sound_piano_style']
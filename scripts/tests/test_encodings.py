@@ -0,0 +1,49 @@
+import io
+import struct
+
+import numpy as np
+import pytest
+
+from sonification.wavfile import WavWriter
+
+
+def chunks(wav):
+    """{id: contenido} de los chunks de un WAV."""
+    assert wav[:4] == b'RIFF' and wav[8:12] == b'WAVE'
+    assert struct.unpack('<I', wav[4:8])[0] == len(wav) - 8
+    found, position = {}, 12
+    while position < len(wav):
+        name, size = wav[position:position + 4], struct.unpack('<I', wav[position + 4:position + 8])[0]
+        found[name] = wav[position + 8:position + 8 + size]
+        position += 8 + size + size % 2
+    return found
+
+
+# encoding: (formato, bits, block_align, bytes de `fmt `, cbSize)
+HEADERS = {
+    'pcm16': (0x0001, 16, 2, 16, None),
+    'pcm8': (0x0001, 8, 1, 16, None),
+    'mulaw': (0x0007, 8, 1, 18, 0),
+    'ima_adpcm': (0x0011, 4, 1024, 20, 2),
+}
+
+
+@pytest.mark.parametrize('encoding', HEADERS)
+def test_fmt_chunk_follows_the_encoding(encoding):
+    format_tag, bits, block_align, fmt_bytes, cb_size = HEADERS[encoding]
+    file = io.BytesIO()
+    with WavWriter(file, 44100, encoding) as writer:
+        writer.write(np.sin(np.linspace(0, 100, 3000)))
+    found = chunks(file.getvalue())
+
+    fmt = found[b'fmt ']
+    assert len(fmt) == fmt_bytes
+    assert struct.unpack('<HHIIHH', fmt[:16]) == (
+        format_tag, 1, 44100, 44100 * block_align // writer.encoder.samples_per_block, block_align, bits)
+    if cb_size is None:
+        assert b'fact' not in found
+    else:
+        assert struct.unpack('<H', fmt[16:18])[0] == cb_size == len(fmt) - 18
+        assert struct.unpack('<I', found[b'fact'])[0] == 3000
+    if encoding == 'ima_adpcm':
+        assert struct.unpack('<H', fmt[18:20])[0] == writer.encoder.samples_per_block
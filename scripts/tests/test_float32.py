@@ -0,0 +1,21 @@
+import pytest
+
+from benchmarks.variants import FLOAT32_TOLERANCE_LSB, float32_error, parse_size, synthetic_html, variant_jobs
+from sonification.variants import VARIANTS
+
+# El mismo texto sintético que el benchmark: el error de fase crece con la duración del audio
+TEXT = synthetic_html(parse_size('1k'))
+
+# Cada variante con cada preset, incluidos los bajos de onda cuadrada y las atmósferas
+# en diente de sierra de los trigramas `polyphony` y `orchestra`
+JOBS = [
+    {'variant': name, 'args': args, 'options': options, 'oscillator': oscillator}
+    for name, args, options in variant_jobs(VARIANTS)
+    for oscillator in ('exact', 'wavetable')
+]
+
+
+@pytest.mark.parametrize('job', JOBS, ids=lambda job: '-'.join([job['variant'], *job['args'], *job['options'].values(),
+                                                                 job['oscillator']]))
+def test_float32_stays_within_tolerance_of_float64(job):
+    assert float32_error(job, TEXT) <= FLOAT32_TOLERANCE_LSB
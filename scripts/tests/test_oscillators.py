@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from sonification.oscillators import PIANO_RATIOS, additive_tone, harmonic_numbers, harmonic_tone, piano_tone
+from sonification.variants import didgeridoo
+
+
+def per_partial(frequency, t, ratios, amplitudes):
+    """Referencia: un `np.sin` por parcial."""
+    return sum(amplitude * np.sin(2 * np.pi * (frequency * ratio) * t) for ratio, amplitude in zip(ratios, amplitudes))
+
+
+def grid(samples, sample_rate=44100, dtype=np.float64):
+    return np.linspace(0, samples / sample_rate, samples, endpoint=False, dtype=dtype)
+
+
+@pytest.mark.parametrize('samples', [1, 2, 127, 128, 129, 13230, 44100])
+@pytest.mark.parametrize('frequency', [27.5, 440.0, 4186.0])
+def test_piano_matches_per_partial_sines(frequency, samples):
+    t = grid(samples)
+    amplitudes = (0.15, 0.1, 0.05, 0.05)
+    expected = per_partial(frequency, t, (1, *PIANO_RATIOS), (1.0, *amplitudes))
+    np.testing.assert_allclose(piano_tone(frequency, t, amplitudes), expected, rtol=0, atol=1e-10)
+
+
+def test_harmonic_tone_matches_per_partial_sines():
+    t = grid(22050)
+    expected = per_partial(440.0, t, (1, 2, 3, 4), (1.0, 0.5, 0.25, 0.125))
+    np.testing.assert_allclose(harmonic_tone(440.0, t, [0.5, 0.25, 0.125]), expected, rtol=0, atol=1e-10)
+
+
+def test_note_batches_broadcast_like_np_sin():
+    frequencies = np.linspace(50, 150, 7)[:, None]
+    t = grid(13230)[None, :]
+    wave = harmonic_tone(frequencies, t, [0.5, 0.25])
+    assert wave.shape == (7, 13230)
+    np.testing.assert_allclose(wave, per_partial(frequencies, t, (1, 2, 3), (1.0, 0.5, 0.25)), rtol=0, atol=1e-10)
+
+
+def test_inharmonic_partials_use_batched_sines():
+    ratios, amplitudes = (1, 2 ** 0.5, np.pi), (1.0, 0.3, 0.2)
+    assert harmonic_numbers(ratios) is None
+    t = grid(4410)
+    np.testing.assert_allclose(additive_tone(440.0, t, ratios, amplitudes), per_partial(440.0, t, ratios, amplitudes),
+                               rtol=0, atol=1e-10)
+
+
+def test_float32_stays_close_to_float64():
+    t = grid(44100)
+    wave = piano_tone(np.float32(440.0), t.astype(np.float32), (0.15, 0.1, 0.05, 0.05))
+    assert wave.dtype == np.float32
+    np.testing.assert_allclose(wave, piano_tone(440.0, t, (0.15, 0.1, 0.05, 0.05)), rtol=0, atol=1e-3)
+
+
+@pytest.mark.parametrize('frequency, t, shape', [
+    (440.0, grid(0), (0,)),
+    (np.zeros((0, 1)), grid(13230)[None, :], (0, 13230)),
+    (np.linspace(50, 150, 3)[:, None], grid(0)[None, :], (3, 0)),
+])
+def test_empty_input(frequency, t, shape):
+    assert harmonic_tone(frequency, t, [0.5, 0.25]).shape == shape
+
+
+def test_empty_text_renders_an_empty_track():
+    assert didgeridoo.build('').render().size == 0
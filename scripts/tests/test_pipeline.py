@@ -0,0 +1,81 @@
+import io
+
+import pytest
+
+from sonification.variants import VARIANTS, get_variant
+from sonification.wavfile import write_wav
+
+PAGE = '<p>Hola, mundo. ¿Qué tal?</p>\n<a href="/x">más</a>'
+
+# Bloques de cada variante, más cortos que el contexto de sus etapas (fundidos de 20 ms, ecos
+# de hasta 70 ms, convolución de 500 muestras a ambos lados): muchas fronteras entre bloques
+BLOCK_SAMPLES = {
+    'piano_with_rythm': 700,
+    'html_to_sound_piano_style': 700,
+    'john_frusciante_inspiration': 4000,
+}
+BOUNDARY_VARIANTS = tuple(BLOCK_SAMPLES)
+
+
+def whole_track(variant):
+    """WAV del render de la pista completa en memoria, en serie."""
+    file = io.BytesIO()
+    write_wav(file, get_variant(variant).build(PAGE))
+    return file.getvalue()
+
+
+def to_file(tmp_path, variant, **options):
+    output = tmp_path / f'{variant}.wav'
+    write_wav(str(output), get_variant(variant).build(PAGE), block_samples=BLOCK_SAMPLES[variant], **options)
+    return output.read_bytes()
+
+
+def to_buffer(variant, **options):
+    file = io.BytesIO()
+    write_wav(file, get_variant(variant).build(PAGE), block_samples=BLOCK_SAMPLES[variant], **options)
+    return file.getvalue()
+
+
+@pytest.mark.parametrize('variant', BOUNDARY_VARIANTS)
+def test_parallel_segments_equal_the_serial_render(tmp_path, variant):
+    expected = whole_track(variant)
+    assert len(expected) > 20 * 2 * BLOCK_SAMPLES[variant]
+    # Segmentos escritos por cada proceso en el fichero mapeado (`render_into`)
+    assert to_file(tmp_path, variant, stream=True, workers=1) == expected
+    assert to_file(tmp_path, variant, stream=True, workers=2) == expected
+    # Segmentos devueltos al proceso principal (`parallel_blocks`)
+    assert to_buffer(variant, workers=3) == expected
+
+
+
+class Pipe:
+    """Destino sin `seek`, como stdout: la cabecera lleva tamaños desconocidos."""
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def write(self, data):
+        self.data += data
+
+    def flush(self):
+        pass
+
+
+@pytest.mark.parametrize('variant', VARIANTS)
+def test_streamed_blocks_equal_the_whole_track(tmp_path, variant):
+    expected = whole_track(variant)
+    block_samples = BLOCK_SAMPLES.get(variant, 1000)
+    pipeline = lambda: get_variant(variant).build(PAGE)
+
+    streamed = io.BytesIO()
+    write_wav(streamed, pipeline(), stream=True, block_samples=block_samples)
+    assert streamed.getvalue() == expected
+
+    # Fichero: bloques cuantizados en el mapeo del chunk `data`
+    write_wav(str(tmp_path / 'out.wav'), pipeline(), stream=True, block_samples=block_samples)
+    assert (tmp_path / 'out.wav').read_bytes() == expected
+
+    piped = Pipe()
+    write_wav(piped, pipeline(), stream=True, block_samples=block_samples)
+    assert piped.data[44:] == expected[44:]
+    assert piped.data[4:8] == piped.data[40:44] == b'\xff\xff\xff\xff'
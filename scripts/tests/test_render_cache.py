@@ -0,0 +1,28 @@
+from sonification.render_cache import RenderCache
+
+
+def render_bytes(path, size):
+    return lambda: path.write_bytes(b'\0' * size)
+
+
+def test_processes_sharing_a_directory_evict_against_one_budget(tmp_path):
+    directory = tmp_path / 'cache'
+    first, second = RenderCache(directory, max_bytes=250), RenderCache(directory, max_bytes=250)
+
+    for index, cache in enumerate([first, second, first, second]):
+        output = tmp_path / f'{index}.wav'
+        assert not cache.get(f'key{index}', output, render_bytes(output, 100))
+
+    assert sum(path.stat().st_size for path in directory.glob('*.wav')) <= 250
+    assert sorted(path.stem for path in directory.glob('*.wav')) == ['key2', 'key3']
+    assert first.evictions + second.evictions == 2
+
+
+def test_entries_from_another_process_are_hits(tmp_path):
+    directory = tmp_path / 'cache'
+    first, second = RenderCache(directory), RenderCache(directory)
+    first.get('key', tmp_path / 'a.wav', render_bytes(tmp_path / 'a.wav', 10))
+
+    assert second.get('key', tmp_path / 'b.wav', render_bytes(tmp_path / 'b.wav', 99))
+    assert (tmp_path / 'b.wav').stat().st_size == 10
+    assert second.stats()['bytes'] == 10
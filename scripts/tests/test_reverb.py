@@ -0,0 +1,23 @@
+import numpy as np
+import pytest
+
+from sonification.variants import get_variant
+
+PAGE = '<html><body><p>Hola, mundo. Una página corta para la reverb.</p></body></html>'
+
+
+def test_schroeder_reverb_is_an_option_of_the_piano():
+    piano = get_variant('html_to_sound_piano_style')
+    whole = piano.build(PAGE, reverb='schroeder').render()
+    assert not np.allclose(whole, piano.build(PAGE).render())
+
+    # Con estado entre bloques: en streaming, y sin reparto entre procesos, da lo mismo
+    streamed = np.concatenate(list(piano.build(PAGE, reverb='schroeder').blocks(4096)))
+    parallel = np.concatenate(list(piano.build(PAGE, reverb='schroeder').parallel_blocks(2, 4096)))
+    np.testing.assert_array_equal(streamed, whole)
+    np.testing.assert_array_equal(parallel, whole)
+
+
+def test_unknown_reverb_is_rejected():
+    with pytest.raises(ValueError, match='reverb'):
+        get_variant('html_to_sound_piano_style').build(PAGE, reverb='plate')
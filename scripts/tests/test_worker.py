@@ -0,0 +1,47 @@
+import pytest
+
+import batch
+import worker
+from sonification.cost import JobTooLarge
+from sonification.render_cache import RenderCache
+from sonification.variants import load_variants
+
+
+def test_cached_job_skips_the_cost_pass(monkeypatch, tmp_path):
+    calls = []
+    plan_job = worker.plan_job
+    monkeypatch.setattr(worker, 'plan_job', lambda *args, **kwargs: calls.append(args) or plan_job(*args, **kwargs))
+
+    variants = load_variants()
+    render_cache = RenderCache(tmp_path / 'cache')
+    job = {'variant': 'html_to_sound', 'html': '<p>hola</p>', 'options': {'stream': True}}
+
+    first = worker.run_job(variants, {**job, 'output': str(tmp_path / 'a.wav')}, render_cache)
+    second = worker.run_job(variants, {**job, 'output': str(tmp_path / 'b.wav')}, render_cache)
+
+    assert len(calls) == 1
+    assert not first['render_cache']['hit'] and first['estimate'] is not None
+    assert second['render_cache']['hit'] and second['estimate'] is None
+    assert (tmp_path / 'a.wav').read_bytes() == (tmp_path / 'b.wav').read_bytes()
+
+
+def test_job_is_planned_against_its_share_of_the_memory(tmp_path):
+    job = {'variant': 'html_to_sound', 'html': '<p>hola</p>', 'output': str(tmp_path / 'a.wav')}
+    with pytest.raises(JobTooLarge, match='memory'):
+        worker.run_job(load_variants(), job, budget_mb=1)
+
+
+def test_batch_processes_split_the_memory_budget(monkeypatch, tmp_path):
+    (tmp_path / 'a.html').write_text('<p>hola</p>')
+    job = {'variant': 'html_to_sound', 'input': str(tmp_path / 'a.html'), 'args': [], 'key': None,
+           'options': {'stream': True}}
+    peak_mb = worker.run_job(load_variants(), {**job, 'output': str(tmp_path / 'a.wav')})['estimate']['peak_mb']
+
+    # Cabe en el presupuesto entero, pero no en la mitad que recibe cada uno de dos procesos
+    monkeypatch.setattr(batch, 'MEMORY_BUDGET_MB', int(peak_mb * 1.5))
+    monkeypatch.setenv('RENDER_CACHE', 'false')
+    jobs = [{**job, 'output': str(tmp_path / f'{index}.wav')} for index in range(2)]
+    assert [result['status'] for result in batch.run_batch(jobs[:1], 1)] == ['rendered']
+    results = batch.run_batch(jobs, 2)
+    assert [result['status'] for result in results] == ['failed', 'failed']
+    assert 'JobTooLarge' in results[0]['error']
@@ -0,0 +1,140 @@
+import os
+import sys
+import json
+import time
+
+from sonification.cache import note_cache
+from sonification.cost import MEMORY_BUDGET_MB, plan_job
+from sonification.profiling import stage_timings
+from sonification.render_cache import DEFAULT_CACHE_DIR, RenderCache
+from sonification.variants import load_variants
+
+# Proceso persistente: importa numpy/scipy y todas las variantes del registro una sola vez
+# y atiende trabajos en formato JSON (uno por línea) a través de stdin/stdout.
+#
+# Petición:  {"id": 1, "variant": "html_to_sound", "html": "...", "output": "/ruta.wav",
+#             "args": [], "options": {"stream": true}}
+#            (en lugar de "html" se puede indicar "input" con la ruta del fichero)
+# Respuesta: {"id": 1, "ok": true, "output": "/ruta.wav", "timings": {...}, "stages": {...},
+#             "estimate": {...}}
+#            ("stages": milisegundos y llamadas de cada fase del render, ver sonification.profiling;
+#             "estimate": coste previsto y ajustes aplicados, ver sonification.cost.plan_job;
+#             null si el audio sale de la caché de renders)
+#
+# Un trabajo que no cabe en el presupuesto de memoria/tiempo falla con "JobTooLarge: ...".
+#
+# Los WAV se guardan en una caché por contenido (RENDER_CACHE_DIR, hasta
+# RENDER_CACHE_MB megas); un trabajo repetido se sirve sin volver a sintetizar.
+
+
+def create_render_cache():
+    """Caché de renders configurada por entorno (RENDER_CACHE=false la desactiva)."""
+    if os.environ.get("RENDER_CACHE") == "false":
+        return None
+    return RenderCache(
+        os.environ.get("RENDER_CACHE_DIR", DEFAULT_CACHE_DIR),
+        max_bytes=int(os.environ.get("RENDER_CACHE_MB", 512)) * 1024 * 1024,
+    )
+
+
+def run_job(variants, job, render_cache=None, budget_mb=MEMORY_BUDGET_MB):
+    """Ejecuta un trabajo y devuelve la respuesta con los tiempos de cada fase.
+
+    `budget_mb` es la memoria de este trabajo: si se ejecutan varios a la
+    vez, cada uno recibe su parte de RENDER_MEMORY_MB.
+    """
+    start = time.perf_counter()
+    stage_timings.clear()
+
+    variant = job.get("variant")
+    if variant not in variants:
+        raise ValueError(f"Unknown script variant: {variant}")
+    if job["output"] == "-":
+        # stdout es el canal del protocolo; el streaming va por un proceso propio
+        raise ValueError("The worker cannot write audio to stdout")
+
+    if "html" in job:
+        html_content = job["html"]
+    else:
+        with stage_timings.measure("read"), open(job["input"], "r") as file:
+            html_content = file.read()
+    read_done = time.perf_counter()
+
+    render = variants[variant].render
+    args = job.get("args", [])
+    options = job.get("options", {})
+
+    cache_before = note_cache.stats()
+    estimate = None
+    def render_job():
+        # La pasada previa construye la pipeline: solo se paga si hay que renderizar
+        nonlocal estimate
+        planned, estimate = plan_job(variants[variant], html_content, args, options,
+                                     budget_mb=budget_mb, output_file=job["output"])
+        render(html_content, job["output"], *args, **planned)
+
+    cache_hit = False
+    if render_cache is None:
+        render_job()
+    else:
+        # Clave de la petición (como la de batch.py), no de las opciones ya ajustadas
+        key = render_cache.key(variant, render, html_content, args, options)
+        cache_hit = render_cache.get(key, job["output"], render_job)
+    render_done = time.perf_counter()
+    cache_after = note_cache.stats()
+    profile = stage_timings.report()
+
+    return {
+        "output": job["output"],
+        "timings": {
+            "read_ms": round((read_done - start) * 1000, 3),
+            "render_ms": round((render_done - read_done) * 1000, 3),
+            "total_ms": round((render_done - start) * 1000, 3),
+        },
+        "stages": profile["stages"],
+        "peak_rss_mb": profile["peak_rss_mb"],
+        "estimate": estimate,
+        "note_cache": {
+            "hits": cache_after["hits"] - cache_before["hits"],
+            "misses": cache_after["misses"] - cache_before["misses"],
+            "evictions": cache_after["evictions"] - cache_before["evictions"],
+            "size": cache_after["size"],
+        },
+        "render_cache": {"hit": cache_hit, **render_cache.stats()} if render_cache else None,
+    }
+
+
+def serve(stdin, stdout):
+    """Bucle principal: lee trabajos de stdin y escribe resultados en stdout."""
+    start = time.perf_counter()
+    variants = load_variants()
+    render_cache = create_render_cache()
+    ready = {
+        "ready": True,
+        "variants": sorted(variants),
+        "startup_ms": round((time.perf_counter() - start) * 1000, 3),
+    }
+    stdout.write(json.dumps(ready) + "\n")
+    stdout.flush()
+
+    for line in stdin:
+        if not line.strip():
+            continue
+
+        job_id = None
+        try:
+            job = json.loads(line)
+            job_id = job.get("id")
+            response = {"id": job_id, "ok": True, **run_job(variants, job, render_cache)}
+        except Exception as error:
+            response = {"id": job_id, "ok": False, "error": f"{type(error).__name__}: {error}"}
+
+        stdout.write(json.dumps(response) + "\n")
+        stdout.flush()
+
+
+if __name__ == "__main__":
+    # Los scripts pueden escribir en stdout; reservamos el canal real para el protocolo
+    protocol_out = sys.stdout
+    sys.stdout = sys.stderr
+    serve(sys.stdin, protocol_out)
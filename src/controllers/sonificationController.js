@@ -1,6 +1,9 @@
 const sonificationService = require("../services/sonficationService");
 const { getSlice, assignName } = require("../utils/sonificationUtils");
 
+// Stream the page into the script while it downloads (synthesis starts on the first chunk)
+const INCREMENTAL_INPUT = process.env.INCREMENTAL_INPUT === "true";
+
 async function processSonification(req, res, next) {
   try {
     const startTime = new Date();
@@ -9,18 +12,25 @@ async function processSonification(req, res, next) {
       req.body.url
     );
     const scriptVariant = req.body.scriptVariant;
+    const seed = sonificationService.validateSeed(req.body.seed);
 
     const html = getSlice(response.data);
     const fileName = assignName(req.body.url, startTime);
 
-    await sonificationService.processAudio(html, scriptVariant, fileName);
+    const result = await sonificationService.processAudio(
+      html,
+      scriptVariant,
+      fileName,
+      seed
+    );
 
     const metadata = sonificationService.createMetadata(
       req.body.url,
       response,
       html,
       fileName,
-      startTime
+      startTime,
+      result
     );
 
     res.json(metadata);
@@ -29,6 +39,52 @@ async function processSonification(req, res, next) {
   }
 }
 
+async function streamSonification(req, res, next) {
+  try {
+    const seed = sonificationService.validateSeed(req.body.seed);
+    const response = await sonificationService.validateAndFetchUrl(
+      req.body.url,
+      { stream: INCREMENTAL_INPUT }
+    );
+    const html = INCREMENTAL_INPUT ? response.data : getSlice(response.data);
+
+    // The client may leave while the job waits for a render slot
+    let audio = null;
+    let aborted = false;
+    res.on("close", () => {
+      if (res.writableFinished) return;
+      aborted = true;
+      if (audio) audio.kill();
+    });
+
+    audio = await sonificationService.streamAudio(
+      html,
+      req.body.scriptVariant,
+      seed
+    );
+    if (aborted) audio.kill();
+
+    res.set({
+      "Content-Type": "audio/wav",
+      "Cache-Control": "no-store",
+    });
+
+    // Headers go out with the first rendered block; end only once the script succeeds
+    audio.stdout.pipe(res, { end: false });
+
+    await audio.done;
+    res.end();
+  } catch (error) {
+    if (res.headersSent) {
+      console.error("Error while streaming audio:", error);
+      res.destroy(error);
+      return;
+    }
+    next(error);
+  }
+}
+
 module.exports = {
   processSonification,
+  streamSonification,
 };
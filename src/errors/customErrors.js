@@ -18,8 +18,16 @@ class AudioProcessingError extends SonificationError {
   }
 }
 
+// The job's estimated render time or memory exceeds the server's budget
+class JobTooLargeError extends SonificationError {
+  constructor(message) {
+    super(message, 413);
+  }
+}
+
 module.exports = {
   SonificationError,
   ValidationError,
   AudioProcessingError,
+  JobTooLargeError,
 };
@@ -1,8 +1,12 @@
 const express = require("express");
 const cors = require("cors");
 const errorHandler = require("./middleware/errorHandler");
-const { processSonification } = require("./controllers/sonificationController");
+const {
+  processSonification,
+  streamSonification,
+} = require("./controllers/sonificationController");
 const { getAudioFile } = require("./controllers/audioFileController");
+const { startPythonWorker } = require("./utils/sonificationUtils");
 
 const app = express();
 
@@ -10,10 +14,12 @@ app.use(cors());
 app.use(express.json());
 
 app.post("/api/sonification", processSonification);
+app.post("/api/sonification/stream", streamSonification);
 app.get("/api/audio/:filename", getAudioFile);
 
 app.use(errorHandler);
 
 app.listen(3000, () => {
   console.log("Server is running on port 3000");
+  startPythonWorker();
 });
@@ -2,17 +2,39 @@ const axios = require("axios");
 const {
   ValidationError,
   AudioProcessingError,
+  JobTooLargeError,
 } = require("../errors/customErrors");
-const { generateSoundFromHTML } = require("../utils/sonificationUtils");
+const {
+  generateSoundFromHTML,
+  streamSoundFromHTML,
+  registeredVariants,
+} = require("../utils/sonificationUtils");
+
+// Python rejects jobs over budget with "JobTooLarge: <reason>" (worker) or a traceback ending in it
+const JOB_TOO_LARGE = /JobTooLarge: (.+)/;
+
+function toProcessingError(error) {
+  const tooLarge = JOB_TOO_LARGE.exec(error.message);
+  if (tooLarge) {
+    return new JobTooLargeError(`Page too large to sonify: ${tooLarge[1]}`);
+  }
+  return new AudioProcessingError(
+    `Error when processing the audio: ${error.message}`
+  );
+}
 
 class SonificationService {
-  async validateAndFetchUrl(url) {
+  // With { stream: true } the body is a readable stream that is still downloading
+  async validateAndFetchUrl(url, { stream = false } = {}) {
     if (!url) {
       throw new ValidationError("No URL provided");
     }
 
     try {
-      const response = await axios.get(url);
+      const response = await axios.get(
+        url,
+        stream ? { responseType: "stream" } : {}
+      );
       return response;
     } catch (error) {
       throw new ValidationError(
@@ -21,18 +43,55 @@ class SonificationService {
     }
   }
 
-  async processAudio(html, scriptVariant, fileName) {
+  validateSeed(seed) {
+    if (seed === undefined || seed === null) return undefined;
+    if (!Number.isSafeInteger(seed) || seed < 0) {
+      throw new ValidationError("Seed must be a non-negative integer");
+    }
+    return seed;
+  }
+
+  // Only registered variants: the name becomes a script path
+  async validateVariant(scriptVariant) {
+    let variants;
     try {
-      const result = await generateSoundFromHTML(html, scriptVariant, fileName);
-      return result;
+      variants = await registeredVariants();
     } catch (error) {
-      throw new AudioProcessingError(
-        `Error when processing the audio: ${error.message}`
+      throw toProcessingError(error);
+    }
+    if (!variants.includes(scriptVariant)) {
+      throw new ValidationError(`Invalid script variant: ${scriptVariant}`);
+    }
+    return scriptVariant;
+  }
+
+  async processAudio(html, scriptVariant, fileName, seed) {
+    await this.validateVariant(scriptVariant);
+    try {
+      const result = await generateSoundFromHTML(
+        html,
+        scriptVariant,
+        fileName,
+        seed
       );
+      return result;
+    } catch (error) {
+      throw toProcessingError(error);
     }
   }
 
-  createMetadata(url, response, html, fileName, startTime) {
+  // Resolves once the script has a render slot (see streamSoundFromHTML)
+  async streamAudio(html, scriptVariant, seed) {
+    await this.validateVariant(scriptVariant);
+
+    const audio = await streamSoundFromHTML(html, scriptVariant, seed);
+    audio.done = audio.done.catch((error) => {
+      throw toProcessingError(error);
+    });
+    return audio;
+  }
+
+  createMetadata(url, response, html, fileName, startTime, result = {}) {
     return {
       audioUrl: fileName,
       processingInfo: {
@@ -44,6 +103,11 @@ class SonificationService {
         contentType: response.headers["content-type"],
         statusCode: response.status,
         fileName: fileName,
+        // Per-stage render times ({ ms, calls }) reported by the Python side
+        stageTimings: result.stages || null,
+        peakMemoryMb: result.peak_rss_mb ?? null,
+        // Pre-render cost estimate and any mode changes it forced (streaming, lower sample rate)
+        estimate: result.estimate || null,
       },
     };
   }
@@ -0,0 +1,14 @@
+const assert = require("node:assert");
+const { test } = require("node:test");
+
+process.env.PYTHON_PATH = process.env.PYTHON_PATH || "python3";
+process.env.PYTHON_WORKER = "false";
+const sonificationService = require("./sonficationService");
+const { ValidationError } = require("../errors/customErrors");
+
+test("only registered variants are accepted", async () => {
+  assert.strictEqual(await sonificationService.validateVariant("html_to_sound"), "html_to_sound");
+  for (const name of ["worker", "batch", "../scripts/worker", undefined]) {
+    await assert.rejects(sonificationService.validateVariant(name), ValidationError);
+  }
+});
@@ -0,0 +1,215 @@
+const os = require("os");
+const path = require("path");
+const readline = require("readline");
+const { spawn } = require("child_process");
+
+const WORKER_SCRIPT = path.join(__dirname, "../../scripts/worker.py");
+
+// A job still running after this long is killed together with its worker process.
+// By default: the render-time limit of the cost pre-pass plus a margin for reading and writing
+const JOB_TIMEOUT_MS =
+  Number(process.env.PYTHON_JOB_TIMEOUT_MS) ||
+  (Number(process.env.MAX_RENDER_SECONDS) || 300) * 1000 + 30000;
+
+// Worker processes; each one renders a single job at a time
+const POOL_SIZE = Number(process.env.PYTHON_WORKERS) || os.cpus().length;
+
+// Memory for all the renders of the machine, split evenly between the jobs that
+// can run at once: each render process plans its job against its own share
+const MEMORY_BUDGET_MB = Number(process.env.RENDER_MEMORY_MB) || 1024;
+const JOB_MEMORY_MB = Math.floor(MEMORY_BUDGET_MB / Math.max(1, POOL_SIZE));
+const RENDER_ENV = { ...process.env, RENDER_MEMORY_MB: String(JOB_MEMORY_MB) };
+
+class PythonWorker {
+  constructor() {
+    this.process = null;
+    this.ready = null;
+    this.queue = [];
+    this.current = null;
+    this.nextId = 1;
+  }
+
+  // Jobs waiting or running in this worker
+  get load() {
+    return this.queue.length + (this.current ? 1 : 0);
+  }
+
+  start() {
+    if (this.ready) return this.ready;
+
+    const child = spawn(process.env.PYTHON_PATH, [WORKER_SCRIPT], {
+      env: RENDER_ENV,
+      cwd: path.join(__dirname, "../../"),
+      stdio: ["pipe", "pipe", "pipe"],
+    });
+    this.process = child;
+
+    // Events from a process that has already been replaced are ignored
+    this.ready = new Promise((resolve, reject) => {
+      const lines = readline.createInterface({ input: child.stdout });
+
+      lines.on("line", (line) => {
+        let message;
+        try {
+          message = JSON.parse(line);
+        } catch (err) {
+          console.warn(`Warning: unexpected worker output: ${line}`);
+          return;
+        }
+
+        if (message.ready) {
+          console.log(
+            `Python worker ready in ${message.startup_ms}ms (${message.variants.length} variants)`
+          );
+          resolve(message);
+          return;
+        }
+
+        if (this.process === child) this.finish(message);
+      });
+
+      child.stderr.on("data", (data) => {
+        console.warn(`Warning: ${data}`);
+      });
+
+      child.on("error", (err) => {
+        reject(err);
+        if (this.process === child) this.reset(err);
+      });
+
+      child.on("exit", (code, signal) => {
+        const err = new Error(
+          `Python worker exited with ${signal ? `signal ${signal}` : `code ${code}`}`
+        );
+        reject(err);
+        if (this.process === child) this.reset(err);
+      });
+    });
+
+    return this.ready;
+  }
+
+  reset(err) {
+    this.process = null;
+    this.ready = null;
+
+    // The running job fails with the worker; queued jobs go to the next process
+    if (this.current) {
+      clearTimeout(this.current.timer);
+      this.current.reject(err);
+      this.current = null;
+    }
+    this.dispatch();
+  }
+
+  // Sends the next queued job once the previous one has finished
+  async dispatch() {
+    if (this.current || this.queue.length === 0) return;
+
+    const entry = this.queue.shift();
+    this.current = entry;
+    try {
+      await this.start();
+    } catch (err) {
+      // reset() has already rejected the job and moved on to the next one
+      return;
+    }
+    if (this.current !== entry) return;
+
+    entry.id = this.nextId++;
+    entry.timer = setTimeout(() => this.timeout(entry), JOB_TIMEOUT_MS);
+    this.process.stdin.write(JSON.stringify({ id: entry.id, ...entry.job }) + "\n");
+  }
+
+  finish(message) {
+    const entry = this.current;
+    if (!entry || message.id !== entry.id) return;
+
+    clearTimeout(entry.timer);
+    this.current = null;
+    if (message.ok) {
+      entry.resolve(message);
+    } else {
+      entry.reject(new Error(message.error));
+    }
+    this.dispatch();
+  }
+
+  timeout(entry) {
+    if (this.current !== entry) return;
+
+    // Detached before the kill: jobs sent from now on start a new process
+    // instead of being written to the dying one (whose exit is then ignored)
+    const child = this.process;
+    this.process = null;
+    this.ready = null;
+    this.current = null;
+    clearTimeout(entry.timer);
+    entry.reject(
+      new Error(`Python worker job timed out after ${JOB_TIMEOUT_MS / 1000}s`)
+    );
+    if (child) child.kill("SIGKILL");
+    this.dispatch();
+  }
+
+  run(job) {
+    return new Promise((resolve, reject) => {
+      this.queue.push({ job, resolve, reject });
+      this.dispatch();
+    });
+  }
+}
+
+class PythonWorkerPool {
+  constructor(size) {
+    this.workers = Array.from({ length: Math.max(1, size) }, () => new PythonWorker());
+    // Render slots shared with the processes of the stream endpoint
+    this.free = this.workers.length;
+    this.waiting = [];
+    this.env = RENDER_ENV;
+  }
+
+  start() {
+    return Promise.all(this.workers.map((worker) => worker.start()));
+  }
+
+  // Waits for a free render slot; resolves to the function that releases it
+  acquire() {
+    return new Promise((resolve) => {
+      const grant = () => {
+        let released = false;
+        resolve(() => {
+          if (released) return;
+          released = true;
+          // The slot passes straight to the next waiting job
+          const next = this.waiting.shift();
+          if (next) next();
+          else this.free++;
+        });
+      };
+
+      if (this.free > 0) {
+        this.free--;
+        grant();
+      } else {
+        this.waiting.push(grant);
+      }
+    });
+  }
+
+  // Each job goes to the worker with the fewest jobs waiting or running
+  async run(job) {
+    const release = await this.acquire();
+    try {
+      const worker = this.workers.reduce((best, candidate) =>
+        candidate.load < best.load ? candidate : best
+      );
+      return await worker.run(job);
+    } finally {
+      release();
+    }
+  }
+}
+
+module.exports = new PythonWorkerPool(POOL_SIZE);
+module.exports.PythonWorker = PythonWorker;
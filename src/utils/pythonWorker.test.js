@@ -0,0 +1,34 @@
+const assert = require("node:assert");
+const os = require("os");
+const path = require("path");
+const { test } = require("node:test");
+
+process.env.PYTHON_PATH = process.env.PYTHON_PATH || "python3";
+process.env.RENDER_CACHE = "false";
+const { PythonWorker } = require("./pythonWorker");
+
+function job(name) {
+  return {
+    variant: "html_to_sound",
+    html: "<p>hola</p>",
+    output: path.join(os.tmpdir(), `pythonWorker-${process.pid}-${name}.wav`),
+  };
+}
+
+test("a job sent while a timed-out worker is being killed runs on a new process", async () => {
+  const worker = new PythonWorker();
+  await worker.start();
+  const killed = worker.process;
+
+  const first = worker.run(job("first"));
+  // Let dispatch() write the job to the process
+  await new Promise((resolve) => setImmediate(resolve));
+  worker.timeout(worker.current);
+  const second = worker.run(job("second"));
+
+  await assert.rejects(first, /timed out/);
+  const result = await second;
+  assert.strictEqual(result.ok, true);
+  assert.notStrictEqual(worker.process, killed);
+  worker.process.kill();
+});
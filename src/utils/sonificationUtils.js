@@ -2,13 +2,24 @@ require("dotenv").config();
 const path = require("path");
 const fs = require("fs").promises;
 const fsSync = require("fs");
-const { exec } = require("child_process");
+const { exec, spawn } = require("child_process");
+const { PassThrough } = require("stream");
 const util = require("util");
 const execPromise = util.promisify(exec);
+const pythonWorker = require("./pythonWorker");
 
 const LIMIT = parseInt(process.env.LIMIT, 10);
 const AUDIO_FILES_DIR = path.join(__dirname, "../../audios");
 const MAX_FILE_AGE_MS = 24 * 60 * 60 * 1000; // 24 hours
+const USE_PYTHON_WORKER = process.env.PYTHON_WORKER !== "false";
+const STREAM_AUDIO = process.env.STREAM_AUDIO !== "false";
+// Output format: rendering runs at this sample rate, then the samples are encoded
+const AUDIO_SAMPLE_RATE = parseInt(process.env.AUDIO_SAMPLE_RATE, 10) || 44100;
+const AUDIO_ENCODING = process.env.AUDIO_ENCODING || "pcm16";
+// "exact" evaluates each waveform per sample; "wavetable" reads band-limited single-cycle tables
+const AUDIO_OSCILLATOR = process.env.AUDIO_OSCILLATOR || "exact";
+// Render processes per job: a number, or "auto" for one per CPU
+const AUDIO_WORKERS = process.env.AUDIO_WORKERS || "1";
 let cleanupInProgress = false;
 
 async function cleanOldAudioFiles() {
@@ -23,6 +34,8 @@ async function cleanOldAudioFiles() {
       try {
         const filePath = path.join(AUDIO_FILES_DIR, file);
         const stats = await fs.stat(filePath);
+        // Subdirectories (e.g. the render cache) manage their own size
+        if (!stats.isFile()) return;
         const fileAge = now - stats.mtimeMs;
 
         if (fileAge > MAX_FILE_AGE_MS) {
@@ -49,6 +62,28 @@ function getSlice(string) {
   return string.slice(indexStart, indexStart + LIMIT);
 }
 
+// First LIMIT characters of a page that is still downloading: the centered
+// slice of getSlice() needs the whole page before synthesis can start
+function takeHead(page) {
+  let remaining = Number.isNaN(LIMIT) ? Infinity : LIMIT;
+  const head = new PassThrough();
+
+  page.setEncoding("utf8");
+  page.on("data", (text) => {
+    if (remaining <= 0) return;
+    const piece = text.slice(0, remaining);
+    remaining -= piece.length;
+    head.write(piece);
+    if (remaining <= 0) {
+      head.end();
+      page.destroy();
+    }
+  });
+  page.on("end", () => head.end());
+  page.on("error", (err) => head.destroy(err));
+  return head;
+}
+
 function assignName(url, startTime) {
   if (!url) return null;
 
@@ -60,40 +95,174 @@ function assignName(url, startTime) {
     : `${originUrlName}.wav`;
 }
 
+function audioFormatArgs(seed) {
+  const args = [
+    `--sample-rate=${AUDIO_SAMPLE_RATE}`,
+    `--encoding=${AUDIO_ENCODING}`,
+    `--workers=${AUDIO_WORKERS}`,
+    `--oscillator=${AUDIO_OSCILLATOR}`,
+  ];
+  // Without a seed the scripts derive one from the content
+  if (seed !== undefined) args.push(`--seed=${seed}`);
+  return args;
+}
+
 async function generateSoundFromHTML(
   htmlContent,
   scriptVariant,
-  outputFileName
+  outputFileName,
+  seed
 ) {
-  fsSync.writeFileSync("src/temp.html", htmlContent);
-
-  const scriptPath = path.join(__dirname, `../../scripts/${scriptVariant}.py`);
   const outputPath = path.join(__dirname, "../../audios", outputFileName);
 
   cleanOldAudioFiles().catch((err) =>
     console.error("Background cleanup failed:", err)
   );
 
-  const { stdout, stderr } = await execPromise(
-    `${process.env.PYTHON_PATH} ${scriptPath} ${path.join(
-      __dirname,
-      "../temp.html"
-    )} ${outputPath}`,
-    {
-      env: process.env,
-      cwd: path.join(__dirname, "../../"),
-    }
-  );
+  if (USE_PYTHON_WORKER) {
+    return pythonWorker.run({
+      variant: scriptVariant,
+      html: htmlContent,
+      output: outputPath,
+      options: {
+        stream: STREAM_AUDIO,
+        sample_rate: AUDIO_SAMPLE_RATE,
+        encoding: AUDIO_ENCODING,
+        workers: AUDIO_WORKERS,
+        oscillator: AUDIO_OSCILLATOR,
+        seed,
+      },
+    });
+  }
+
+  const release = await pythonWorker.acquire();
+  let stdout, stderr;
+  try {
+    fsSync.writeFileSync("src/temp.html", htmlContent);
+
+    const scriptPath = path.join(__dirname, `../../scripts/${scriptVariant}.py`);
+
+    ({ stdout, stderr } = await execPromise(
+      `${process.env.PYTHON_PATH} ${scriptPath} ${path.join(
+        __dirname,
+        "../temp.html"
+      )} ${outputPath} ${audioFormatArgs(seed).join(" ")}${
+        STREAM_AUDIO ? " --stream" : ""
+      } --timings`,
+      {
+        env: pythonWorker.env,
+        cwd: path.join(__dirname, "../../"),
+      }
+    ));
+  } finally {
+    release();
+  }
 
   if (stderr) {
     console.warn(`Warning: ${stderr}`);
   }
 
-  return stdout;
+  return parseTimingReport(stdout);
+}
+
+// With --timings the script ends its output with a JSON line: stage times and peak memory
+function parseTimingReport(stdout) {
+  const lastLine = stdout.trim().split("\n").pop();
+  try {
+    return JSON.parse(lastLine);
+  } catch (err) {
+    console.warn("Warning: missing timing report in script output");
+    return {};
+  }
+}
+
+// `html` is either the sliced page or, in incremental mode, the page as it downloads.
+// The script takes one of the worker pool's render slots, so streams and pooled jobs
+// share the same concurrency and memory limits; it resolves once the slot is free
+async function streamSoundFromHTML(html, scriptVariant, seed) {
+  const scriptPath = path.join(__dirname, `../../scripts/${scriptVariant}.py`);
+  const incremental = typeof html !== "string";
+  const args = [scriptPath, "-", "-", ...audioFormatArgs(seed)];
+  // The script synthesizes each chunk of text as soon as it arrives
+  if (incremental) args.push("--incremental");
+
+  const release = await pythonWorker.acquire();
+  // HTML in through stdin, WAV out through stdout as each block is rendered
+  const child = spawn(process.env.PYTHON_PATH, args, {
+    env: pythonWorker.env,
+    cwd: path.join(__dirname, "../../"),
+    stdio: ["pipe", "pipe", "pipe"],
+  });
+  child.on("close", release);
+  child.on("error", release);
+
+  if (incremental) {
+    const head = takeHead(html);
+    // A failed download must not leave the script waiting for more input
+    head.on("error", (err) => {
+      console.error("Error while downloading the page:", err);
+      child.kill();
+    });
+    // The script may exit before reading everything; its exit code tells why
+    child.stdin.on("error", () => {});
+    head.pipe(child.stdin);
+  } else {
+    child.stdin.end(html);
+  }
+
+  let stderr = "";
+  child.stderr.on("data", (data) => {
+    stderr += data;
+  });
+
+  child.done = new Promise((resolve, reject) => {
+    child.on("error", reject);
+    child.on("close", (code) => {
+      if (code === 0) {
+        if (stderr) console.warn(`Warning: ${stderr}`);
+        resolve();
+      } else {
+        reject(new Error(stderr.trim() || `Script exited with code ${code}`));
+      }
+    });
+  });
+
+  return child;
+}
+
+// Names in sonification.variants.VARIANTS: the worker reports them when it starts;
+// without it they are read once from the package
+let variantNames = null;
+
+function registeredVariants() {
+  if (!variantNames) {
+    variantNames = USE_PYTHON_WORKER
+      ? pythonWorker.start().then(([ready]) => ready.variants)
+      : execPromise(
+          `${process.env.PYTHON_PATH} -c "import json; from sonification.variants import VARIANTS; print(json.dumps(VARIANTS))"`,
+          { env: process.env, cwd: path.join(__dirname, "../../scripts") }
+        ).then(({ stdout }) => JSON.parse(stdout));
+    // A failed start is retried on the next request
+    variantNames.catch(() => {
+      variantNames = null;
+    });
+  }
+  return variantNames;
+}
+
+function startPythonWorker() {
+  if (!USE_PYTHON_WORKER) return;
+
+  pythonWorker
+    .start()
+    .catch((err) => console.error("Python worker failed to start:", err));
 }
 
 module.exports = {
   getSlice,
   assignName,
   generateSoundFromHTML,
+  streamSoundFromHTML,
+  registeredVariants,
+  startPythonWorker,
 };